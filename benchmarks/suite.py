@@ -0,0 +1,410 @@
+"""
+Benchmark suite for pySLAMMER.
+
+Times rigid, decoupled (linear and equivalent linear) and coupled analyses on
+every sample ground motion, analyses of synthetic motions from 1e3 to 1e7
+points, ky-sweep batches and ground motion loading. Memory cases record the
+peak and retained bytes per sample of each analysis variant. Each run appends
+one JSON line with the results and the environment to a history file, and
+`compare` flags cases that got slower or used more memory by more than a
+threshold between two runs.
+
+Timings are compared on their fastest repeat, which is the least sensitive to
+background load. Only compare timings of runs made on the same machine.
+
+Usage:
+    python benchmarks/suite.py run [--filter REGEX] [--quick] [--label NAME]
+    python benchmarks/suite.py compare [BASELINE] [CURRENT] [--threshold 0.1]
+    python benchmarks/suite.py list [--filter REGEX] [--quick]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import pyslammer as slam
+from pyslammer._kernels import HAS_NUMBA
+
+# Compared metrics of the case results, with their display unit and scale
+METRICS = {
+    "min_s": ("ms", 1000),
+    "peak_bytes_per_sample": ("B/pt", 1),
+    "retained_bytes_per_sample": ("B/pt", 1),
+}
+
+HISTORY = Path(__file__).parent / "history.jsonl"
+
+FLEXIBLE = {
+    "height": 50.0,
+    "vs_slope": 600.0,
+    "vs_base": 600.0,
+    "damp_ratio": 0.05,
+}
+EQUIVALENT_LINEAR = {
+    **FLEXIBLE,
+    "ref_strain": 0.0005,
+    "soil_model": "equivalent_linear",
+}
+
+# Analysis variants: (name, analysis class, keyword arguments)
+VARIANTS = [
+    ("rigid", slam.RigidAnalysis, {}),
+    ("rigid-exact", slam.RigidAnalysis, {"integration": "exact"}),
+    ("decoupled-linear", slam.Decoupled, FLEXIBLE),
+    ("decoupled-eql", slam.Decoupled, EQUIVALENT_LINEAR),
+    ("coupled-linear", slam.Coupled, FLEXIBLE),
+    ("coupled-eql", slam.Coupled, EQUIVALENT_LINEAR),
+]
+KY = 0.1
+TARGET_PGA = 0.5
+SYNTHETIC_NPTS = [10**3, 10**4, 10**5, 10**6, 10**7]
+SWEEP_KYS = 20
+MEMORY_NPTS = 10**5
+
+
+def synthetic_motion(npts, dt=0.01):
+    """Deterministic windowed sine sweep with a PGA of about 0.5 g."""
+    t = np.arange(npts) * dt
+    duration = max(t[-1], dt)
+    frequency = 0.5 + 9.5 * t / duration
+    envelope = np.sin(np.pi * t / duration) ** 2
+    accel = 0.5 * envelope * np.sin(2 * np.pi * frequency * t)
+    return slam.GroundMotion(accel, dt, f"synthetic-{npts}")
+
+
+def analysis_case(cls, kwargs, motion):
+    return lambda: cls(KY, motion, target_pga=TARGET_PGA, **kwargs)
+
+
+def sweep_case(method, kwargs, motions, key, executor, workers):
+    params = {"target_pga": TARGET_PGA, **kwargs}
+    tasks = [
+        slam.AnalysisTask(method, key, float(ky), params)
+        for ky in np.linspace(0.05, 0.3, SWEEP_KYS)
+    ]
+    return lambda: slam.run_batch(
+        tasks, motions, max_workers=workers, executor=executor
+    )
+
+
+def build_cases(quick=False):
+    """
+    Return the benchmark cases as (name, factory) pairs.
+
+    Factories build their inputs and return the callable to time, so large
+    synthetic motions only exist while their own case runs.
+    """
+    motions = slam.sample_ground_motions()
+    cases = []
+
+    def add(name, factory):
+        cases.append((name, factory))
+
+    for variant, cls, kwargs in VARIANTS:
+        for key, motion in sorted(motions.items()):
+            add(
+                f"sample/{variant}/{key}",
+                lambda c=cls, k=kwargs, m=motion: analysis_case(c, k, m),
+            )
+    sizes = [n for n in SYNTHETIC_NPTS if not quick or n <= 10**5]
+    for variant, cls, kwargs in VARIANTS:
+        for npts in sizes:
+            add(
+                f"synthetic/{variant}/{npts:.0e}",
+                lambda c=cls, k=kwargs, n=npts: analysis_case(
+                    c, k, synthetic_motion(n)
+                ),
+            )
+
+    longest = max(motions, key=lambda k: len(motions[k].accel))
+    sweeps = [("rigid", {}), ("decoupled", FLEXIBLE), ("coupled", FLEXIBLE)]
+    for method, kwargs in sweeps:
+        add(
+            f"batch/ky-sweep-{method}/thread-1",
+            lambda m=method, k=kwargs: sweep_case(
+                m, k, motions, longest, "thread", 1
+            ),
+        )
+    add(
+        "batch/ky-sweep-rigid/process",
+        lambda: sweep_case("rigid", {}, motions, longest, "process", None),
+    )
+
+    sample_dir = Path(slam.__file__).parent / "sample_ground_motions"
+    csv_path = str(sample_dir / f"{longest}.csv")
+    add("load/csv_time_hist", lambda: lambda: slam.csv_time_hist(csv_path))
+    add("load/sample_ground_motions", lambda: slam.sample_ground_motions)
+
+    for variant, cls, kwargs in VARIANTS:
+        add(
+            f"memory/{variant}",
+            lambda c=cls, k=kwargs: analysis_case(
+                c, k, synthetic_motion(MEMORY_NPTS)
+            ),
+        )
+    return cases
+
+
+def time_case(func, repeat, budget):
+    """
+    Time a callable after one warm-up call.
+
+    The warm-up compiles numba kernels and fills caches. The callable is then
+    run `repeat` times, or fewer (but at least 3) if that would exceed
+    `budget` seconds.
+    """
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    repeats = max(3, min(repeat, int(budget / max(warmup, 1e-9))))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeats": repeats,
+    }
+
+
+def measure_memory(func):
+    """
+    Peak and retained bytes per sample of an analysis, after one warm-up call.
+
+    Uses `pyslammer.instrumented` in memory mode (see
+    `SlidingBlockAnalysis.memory_usage`).
+    """
+    func()
+    with slam.instrumented(memory=True):
+        analysis = func()
+    stats = analysis.stats
+    return {
+        "peak_bytes_per_sample": stats["peak_bytes"] / stats["npts"],
+        "retained_bytes_per_sample": stats["retained_bytes"] / stats["npts"],
+        "retained_bytes_by_attribute": stats["retained_bytes_by_attribute"],
+    }
+
+
+def environment():
+    """Describe the code and machine a run was made on."""
+
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).parent,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "pyslammer": slam.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": HAS_NUMBA,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "node": platform.node(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_history(path):
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_run(history, ref):
+    """Find a run by index (negative counts from the end), label or commit."""
+    try:
+        return history[int(ref)]
+    except ValueError:
+        pass
+    except IndexError:
+        sys.exit(f"No run {ref} in history of {len(history)} runs")
+    for entry in reversed(history):
+        if ref in (entry.get("label"), entry["environment"].get("commit")):
+            return entry
+    sys.exit(f"No run labelled or at commit {ref!r} in history")
+
+
+def describe(entry):
+    env = entry["environment"]
+    label = f" [{entry['label']}]" if entry.get("label") else ""
+    return f"{entry['timestamp']} {env['commit']}{'+' if env['dirty'] else ''}{label}"
+
+
+def compare_runs(baseline, current, threshold):
+    """
+    Compare the cases of two runs.
+
+    Returns
+    -------
+    list of tuple
+        (case, metric, baseline value, current value, relative change, flag)
+        for every metric of the cases in both runs, where flag is
+        "REGRESSION", "improved" or "".
+    """
+    rows = []
+    for case, result in current["results"].items():
+        if case not in baseline["results"]:
+            continue
+        for metric in METRICS:
+            if metric not in result or metric not in baseline["results"][case]:
+                continue
+            before = baseline["results"][case][metric]
+            after = result[metric]
+            change = after / before - 1 if before else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "REGRESSION"
+            elif change < -threshold:
+                flag = "improved"
+            rows.append((case, metric, before, after, change, flag))
+    return rows
+
+
+def cmd_list(args):
+    for name, _ in select_cases(args):
+        print(name)
+
+
+def select_cases(args):
+    pattern = re.compile(args.filter) if args.filter else None
+    return [
+        (name, factory)
+        for name, factory in build_cases(args.quick)
+        if pattern is None or pattern.search(name)
+    ]
+
+
+def cmd_run(args):
+    cases = select_cases(args)
+    if not cases:
+        sys.exit("No benchmark cases match the filter")
+    entry = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "environment": environment(),
+        "results": {},
+    }
+    print(f"numba kernels: {HAS_NUMBA}, cpus: {os.cpu_count()}, cases: {len(cases)}")
+    width = max(len(name) for name, _ in cases)
+    for name, factory in cases:
+        if name.startswith("memory/"):
+            result = measure_memory(factory())
+            print(
+                f"{name:<{width}} {result['peak_bytes_per_sample']:>11.1f} B/pt "
+                f"peak ({result['retained_bytes_per_sample']:.1f} B/pt retained)"
+            )
+        else:
+            result = time_case(factory(), args.repeat, args.budget)
+            print(
+                f"{name:<{width}} {result['min_s'] * 1000:>11.3f} ms "
+                f"(median {result['median_s'] * 1000:.3f} ms, n={result['repeats']})"
+            )
+        entry["results"][name] = result
+    with open(args.history, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    print(f"Appended run to {args.history}")
+
+
+def cmd_compare(args):
+    history = load_history(args.history)
+    if len(history) < 2 and (args.baseline is None or args.current is None):
+        sys.exit(f"Need at least two runs in {args.history} to compare")
+    baseline = find_run(history, args.baseline or "-2")
+    current = find_run(history, args.current or "-1")
+    if baseline["environment"]["node"] != current["environment"]["node"]:
+        print("Warning: runs were made on different machines")
+
+    rows = compare_runs(baseline, current, args.threshold)
+    if not rows:
+        sys.exit("The runs have no cases in common")
+    print(f"baseline: {describe(baseline)}")
+    print(f"current:  {describe(current)}")
+    labels = [
+        case if metric == "min_s" else f"{case} ({metric})"
+        for case, metric, *_ in rows
+    ]
+    width = max(map(len, labels))
+    print(f"{'case':<{width}} {'baseline':>14} {'current':>14} {'change':>8}")
+    for label, (case, metric, before, after, change, flag) in zip(labels, rows):
+        if args.only_changed and not flag:
+            continue
+        unit, scale = METRICS[metric]
+        print(
+            f"{label:<{width}} {before * scale:>9.3f} {unit:<4} "
+            f"{after * scale:>9.3f} {unit:<4} {change:>+8.1%} {flag}"
+        )
+    regressions = sum(row[5] == "REGRESSION" for row in rows)
+    print(
+        f"{regressions} of {len(rows)} metrics worse by more than "
+        f"{args.threshold:.0%}"
+    )
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--history", type=Path, default=HISTORY, help="history file (JSON lines)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and append to history")
+    listing = commands.add_parser("list", help="list benchmark cases")
+    for sub in (run, listing):
+        sub.add_argument("--filter", help="only cases whose name matches REGEX")
+        sub.add_argument(
+            "--quick",
+            action="store_true",
+            help="skip synthetic motions over 1e5 points",
+        )
+    run.add_argument("--label", help="label to store with the run")
+    run.add_argument("--repeat", type=int, default=10, help="maximum repeats per case")
+    run.add_argument(
+        "--budget", type=float, default=1.0, help="target seconds per case"
+    )
+
+    compare = commands.add_parser("compare", help="compare two runs in history")
+    compare.add_argument(
+        "baseline", nargs="?", help="index, label or commit (default: -2)"
+    )
+    compare.add_argument(
+        "current", nargs="?", help="index, label or commit (default: -1)"
+    )
+    compare.add_argument(
+        "--threshold", type=float, default=0.1, help="relative slowdown to flag"
+    )
+    compare.add_argument(
+        "--only-changed", action="store_true", help="only print flagged cases"
+    )
+
+    args = parser.parse_args()
+    {"run": cmd_run, "list": cmd_list, "compare": cmd_compare}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
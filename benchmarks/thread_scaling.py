@@ -0,0 +1,77 @@
+"""
+Thread-pool scaling benchmark for batch analyses.
+
+Runs the same batch of rigid, decoupled and coupled analyses with the thread
+executor at increasing worker counts and reports throughput and speedup
+relative to one worker. Near-linear scaling requires numba, which compiles the
+analysis kernels with the GIL released.
+
+Usage:
+    python benchmarks/thread_scaling.py [--tasks 64] [--max-workers N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import pyslammer as slam
+from pyslammer._kernels import HAS_NUMBA
+
+FLEXIBLE = {
+    "height": 50.0,
+    "vs_slope": 600.0,
+    "vs_base": 600.0,
+    "damp_ratio": 0.05,
+    "ref_strain": 0.0005,
+    "soil_model": "equivalent_linear",
+}
+
+
+def make_tasks(method, motions, n_tasks):
+    params = {"target_pga": 0.5}
+    if method != "rigid":
+        params.update(FLEXIBLE)
+    keys = list(motions)
+    kys = np.linspace(0.05, 0.3, n_tasks)
+    return [
+        slam.AnalysisTask(method, keys[i % len(keys)], float(ky), params)
+        for i, ky in enumerate(kys)
+    ]
+
+
+def time_batch(tasks, motions, workers):
+    start = time.perf_counter()
+    slam.run_batch(tasks, motions, max_workers=workers, executor="thread")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=64, help="tasks per method")
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count(), help="largest pool size"
+    )
+    args = parser.parse_args()
+
+    motions = slam.sample_ground_motions()
+    workers = sorted({1, *[2**k for k in range(8) if 2**k <= args.max_workers],
+                      args.max_workers})
+    print(f"numba kernels: {HAS_NUMBA}, cpus: {os.cpu_count()}")
+    print(f"{'method':<10} {'workers':>7} {'time (s)':>9} {'tasks/s':>9} {'speedup':>8}")
+    for method in ("rigid", "decoupled", "coupled"):
+        tasks = make_tasks(method, motions, args.tasks)
+        time_batch(tasks[:2], motions, 1)  # compile kernels before timing
+        baseline = None
+        for n in workers:
+            elapsed = time_batch(tasks, motions, n)
+            baseline = baseline or elapsed
+            print(
+                f"{method:<10} {n:>7} {elapsed:>9.2f} "
+                f"{len(tasks) / elapsed:>9.1f} {baseline / elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
+from .batch import *
+from .batch_io import *
+from .convergence import *
 from .coupled_analysis import *
 from .decoupled_analysis import *
-from .ground_motion import GroundMotion
+from .fragility import *
+from .ground_motion import GroundMotion, GroundMotionSuite
+from .hazard import *
+from .ky_search import *
 from .rigid_analysis import *
+from .screening import *
+from .sharding import *
 from .sliding_block_analysis import *
+from .surrogate import *
+from .uncertainty import *
 from .utilities import *
 
 # Make version available
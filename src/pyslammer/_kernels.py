@@ -0,0 +1,492 @@
+"""
+Time-stepping kernels for the sliding block analyses.
+
+The kernels operate on preallocated NumPy arrays and scalars only, so they can
+be compiled with numba when it is installed. Compiled kernels release the GIL,
+which lets batches of analyses run in parallel threads. Without numba the
+kernels run as plain Python with identical results. `rigid_sliding_exact` is
+the exception: it is vectorized with NumPy and is never compiled.
+
+Attributes
+----------
+HAS_NUMBA : bool
+    Whether the kernels are compiled with numba.
+"""
+
+import math
+
+import numpy as np
+
+from .constants import BETA, GAMMA
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAS_NUMBA = numba is not None
+
+
+def _jit(func):
+    if numba is None:
+        return func
+    return numba.njit(nogil=True, cache=True, error_model="numpy")(func)
+
+
+@_jit
+def rigid_sliding(ground_acc, ky, dt, block_acc, sliding_vel, sliding_disp):
+    """
+    Downslope rigid block sliding response.
+
+    Parameters
+    ----------
+    ground_acc : numpy.ndarray
+        Ground acceleration (m/s^2).
+    ky : float
+        Yield acceleration (m/s^2).
+    dt : float
+        Time step (s).
+    block_acc, sliding_vel, sliding_disp : numpy.ndarray
+        Output arrays, same length as `ground_acc`.
+    """
+    tol = 1e-5
+    # previous step values
+    acc0 = 0.0
+    vel0 = 0.0
+    pos0 = 0.0
+    for i in range(len(ground_acc)):
+        gnd_acc_curr = ground_acc[i]
+        if vel0 < tol:
+            if abs(gnd_acc_curr) > ky:
+                n = gnd_acc_curr / abs(gnd_acc_curr)
+            else:
+                n = gnd_acc_curr / ky
+        else:
+            n = 1.0
+        acc1 = gnd_acc_curr - n * ky
+        vel1 = vel0 + (dt / 2) * (acc1 + acc0)
+        if vel1 > 0:
+            pos1 = pos0 + (dt / 2) * (vel1 + vel0)
+        else:
+            vel1 = 0.0
+            acc1 = 0.0
+            pos1 = pos0
+        pos0 = pos1
+        vel0 = vel1
+        acc0 = acc1
+        sliding_disp[i] = pos1
+        sliding_vel[i] = vel1
+        block_acc[i] = gnd_acc_curr - acc1
+
+
+# Samples integrated at a time while looking for the end of a sliding episode;
+# the window doubles until the end is found.
+_EPISODE_WINDOW = 256
+
+
+def _episode_ends(vel, r, dt):
+    """
+    Whether the sliding velocity returns to zero within each interval.
+
+    `vel` and `r` are the velocity and relative acceleration at consecutive
+    samples, integrated as if the block kept sliding throughout.
+    """
+    ends = vel[1:] <= 0
+    # Where the relative acceleration crosses zero upwards, the quadratic
+    # velocity has its minimum inside the interval and can dip below zero
+    # while staying positive at both samples.
+    r0, r1 = r[:-1], r[1:]
+    dip = (r0 < 0) & (r1 > 0)
+    t_min = np.divide(-r0 * dt, r1 - r0, out=np.zeros_like(r0), where=dip)
+    return ends | (dip & (vel[:-1] + 0.5 * r0 * t_min < 0))
+
+
+def _stop_time(vel, rel_acc0, rel_acc1, dt):
+    """First time in (0, dt] at which the sliding velocity returns to zero."""
+    # vel + rel_acc0 * t + slope / 2 * t**2 = 0, with vel > 0 and a root in (0, dt]
+    a = (rel_acc1 - rel_acc0) / (2 * dt)
+    b = rel_acc0
+    if a == 0:
+        return min(-vel / b, dt)
+    disc = max(b * b - 4 * a * vel, 0.0)
+    q = -0.5 * (b + math.copysign(math.sqrt(disc), b))
+    roots = [root for root in (vel / q if q != 0 else dt, q / a) if 0 < root <= dt]
+    return min(roots) if roots else dt
+
+
+def rigid_sliding_exact(ground_acc, ky, dt, block_acc, sliding_vel, sliding_disp):
+    """
+    Downslope rigid block sliding response, integrated exactly between samples.
+
+    The ground acceleration is taken as linear between samples, so within each
+    interval the sliding velocity is quadratic and the displacement cubic in
+    time. Sliding starts at the exact time the ground acceleration exceeds `ky`
+    and stops at the exact time the velocity returns to zero, which may fall
+    between two samples with positive velocities when the relative
+    acceleration crosses zero upwards in between. Sliding then resumes, within
+    the same interval, where the ground acceleration exceeds `ky` again. Each
+    sliding episode is integrated with cumulative sums over its samples, so
+    the Python loop runs once per episode rather than once per sample.
+
+    Parameters
+    ----------
+    ground_acc : numpy.ndarray
+        Ground acceleration (m/s^2).
+    ky : float
+        Yield acceleration (m/s^2).
+    dt : float
+        Time step (s).
+    block_acc, sliding_vel, sliding_disp : numpy.ndarray
+        Output arrays, same length as `ground_acc`.
+    """
+    npts = len(ground_acc)
+    rel_acc = ground_acc - ky
+    exceeds = np.flatnonzero(rel_acc > 0)
+    block_acc[:] = ground_acc
+    sliding_vel[:] = 0.0
+    sliding_disp[:] = 0.0
+    disp = 0.0
+    start = 0
+    while True:
+        k = np.searchsorted(exceeds, start)
+        if k == len(exceeds):
+            sliding_disp[start:] = disp
+            break
+        k = exceeds[k]
+        sliding_disp[start:k] = disp
+        # Velocity and displacement at sample k, from the start of sliding.
+        if k == 0:
+            vel_k = 0.0
+            disp_k = 0.0
+        else:
+            h = dt * rel_acc[k] / (rel_acc[k] - rel_acc[k - 1])
+            vel_k = 0.5 * h * rel_acc[k]
+            disp_k = rel_acc[k] * h * h / 6
+        window = _EPISODE_WINDOW
+        while True:
+            stop = min(k + window, npts)
+            r = rel_acc[k:stop]
+            vel = vel_k + np.concatenate(
+                ([0.0], np.cumsum(0.5 * dt * (r[:-1] + r[1:])))
+            )
+            ended = np.flatnonzero(_episode_ends(vel, r, dt))
+            if len(ended) or stop == npts:
+                break
+            window *= 2
+        end = k + ended[0] + 1 if len(ended) else npts
+        n = end - k
+        vel = vel[:n]
+        r = rel_acc[k : min(end + 1, npts)]
+        seg = vel[:-1] * dt + dt * dt * (2 * r[: n - 1] + r[1:n]) / 6
+        pos = disp + disp_k + np.concatenate(([0.0], np.cumsum(seg)))
+        sliding_vel[k:end] = vel
+        sliding_disp[k:end] = pos
+        block_acc[k:end] = ky
+        if end == npts:
+            break
+        # The episode stops inside the interval (end - 1, end). If the ground
+        # acceleration exceeds ky again at `end`, the next episode starts from
+        # the upward crossing of ky inside the same interval.
+        v0, r0, r1 = vel[-1], rel_acc[end - 1], rel_acc[end]
+        t = _stop_time(v0, r0, r1, dt)
+        disp = pos[-1] + v0 * t + r0 * t * t / 2 + (r1 - r0) * t**3 / (6 * dt)
+        start = end
+
+
+@_jit
+def linear_response(
+    a_in, dt, g, omega, damp_tot, L1, M1, mass, x_resp, v_resp, a_resp, hea
+):
+    """
+    Newmark-beta response of the first-mode soil column to the input motion.
+
+    Parameters
+    ----------
+    a_in : numpy.ndarray
+        Input acceleration (in g).
+    dt : float
+        Time step (s).
+    g : float
+        Gravitational acceleration.
+    omega : float
+        Fundamental circular frequency of the slope.
+    damp_tot : float
+        Total damping ratio (material plus impedance).
+    L1, M1, mass : float
+        Modal participation factor, modal mass and total mass.
+    x_resp, v_resp, a_resp, hea : numpy.ndarray
+        Response and horizontal equivalent acceleration arrays, updated in place.
+    """
+    beta = BETA
+    gamma = GAMMA
+    k_eff = (
+        omega**2
+        + 2.0 * damp_tot * omega * gamma / (beta * dt)
+        + 1.0 / (beta * dt**2)
+    )
+    a = 1.0 / (beta * dt) + 2.0 * damp_tot * omega * gamma / beta
+    b = 1.0 / (2.0 * beta) + 2.0 * dt * damp_tot * omega * (
+        gamma / (2.0 * beta) - 1.0
+    )
+    for curr in range(len(a_in)):
+        prev = curr - 1 if curr > 0 else 0
+        delta_a_in = a_in[curr] - a_in[prev]
+        delta_force = (
+            -L1 / M1 * delta_a_in * g + a * v_resp[prev] + b * a_resp[prev]
+        )
+        delta_x_resp = delta_force / k_eff
+        delta_v_resp = (
+            gamma / (beta * dt) * delta_x_resp
+            - gamma / beta * v_resp[prev]
+            + dt * (1.0 - gamma / (2.0 * beta)) * a_resp[prev]
+        )
+        delta_a_resp = (
+            1.0 / (beta * (dt * dt)) * delta_x_resp
+            - 1.0 / (beta * dt) * v_resp[prev]
+            - 0.5 / beta * a_resp[prev]
+        )
+        x_resp[curr] = x_resp[prev] + delta_x_resp
+        v_resp[curr] = v_resp[prev] + delta_v_resp
+        a_resp[curr] = a_resp[prev] + delta_a_resp
+        hea[curr] = a_in[curr] * g + L1 / mass * a_resp[curr]
+
+
+@_jit
+def decoupled_sliding(
+    hea, yield_acc, dt, slide, block_acc, block_vel, block_disp, sliding_vel
+):
+    """
+    Decoupled sliding response to a horizontal equivalent acceleration.
+
+    Parameters
+    ----------
+    hea : numpy.ndarray
+        Horizontal equivalent acceleration.
+    yield_acc : float
+        Constant yield acceleration, in the same units as `hea`.
+    dt : float
+        Time step (s).
+    slide : bool
+        Whether the block is sliding at the start of the record.
+    block_acc, block_vel, block_disp, sliding_vel : numpy.ndarray
+        Output arrays, same length as `hea`.
+
+    Returns
+    -------
+    bool
+        Whether the block is sliding at the end of the record.
+    """
+    for curr in range(len(hea)):
+        prev = curr - 1 if curr > 0 else 0
+        excess_acc = yield_acc - hea[prev]
+        delta_hea = hea[curr] - hea[prev]
+        if not slide:
+            block_acc[curr] = hea[curr]
+            block_vel[curr] = 0.0
+            block_disp[curr] = block_disp[prev]
+            if hea[curr] > yield_acc:
+                slide = True
+        else:
+            block_acc[curr] = yield_acc
+            block_vel[curr] = block_vel[prev] + (excess_acc - 0.5 * delta_hea) * dt
+            block_disp[curr] = (
+                block_disp[prev]
+                - block_vel[prev] * dt
+                - 0.5 * (excess_acc + delta_hea / 6.0) * dt**2
+            )
+            if block_vel[curr] >= 0.0:
+                slide = False
+        sliding_vel[curr] = -block_vel[prev]
+    return slide
+
+
+@_jit
+def _coupled_solvu(
+    first, slide, u1, udot1, udotdot1, acc11, acc22, dt, omega, damp_tot, L1, M1,
+    mass, beta, gamma,
+):
+    if slide:
+        d1 = 1.0 - (L1**2) / (M1 * mass)
+    else:
+        d1 = 1.0
+    khat = (
+        (omega**2)
+        + 2.0 * damp_tot * omega * gamma / (beta * dt)
+        + d1 / (beta * (dt**2))
+    )
+    a = d1 / (beta * dt) + 2.0 * damp_tot * omega * gamma / beta
+    b = d1 / (2.0 * beta) + dt * 2.0 * damp_tot * omega * (gamma / (2.0 * beta) - 1.0)
+    if first:
+        deltp = -L1 / M1 * (acc22 - acc11)
+        deltu = deltp / khat
+        deltudot = gamma / (beta * dt) * deltu
+        u2 = deltu
+        udot2 = deltudot
+    else:
+        deltp = -L1 / M1 * (acc22 - acc11) + a * udot1 + b * udotdot1
+        deltu = deltp / khat
+        deltudot = (
+            gamma / (beta * dt) * deltu
+            - gamma / beta * udot1
+            + dt * (1.0 - gamma / (2.0 * beta)) * udotdot1
+        )
+        u2 = u1 + deltu
+        udot2 = udot1 + deltudot
+    udotdot2 = (
+        -(L1 / M1) * acc22 - 2.0 * damp_tot * omega * udot2 - (omega**2) * u2
+    ) / d1
+    return u2, udot2, udotdot2
+
+
+@_jit
+def coupled_sliding(
+    a_in, ky, dt, g, angle, omega, damp_tot, L1, M1, mass, beta, gamma,
+    s, u, udotdot, hea, block_acc, sliding_vel,
+):
+    """
+    Coupled sliding response with a constant yield acceleration.
+
+    Parameters
+    ----------
+    a_in : numpy.ndarray
+        Input acceleration (in g), sign-reversed to match decoupled sliding.
+    ky : float
+        Yield acceleration (in g).
+    dt : float
+        Time step (s).
+    g : float
+        Gravitational acceleration.
+    angle : float
+        Slope angle (degrees).
+    omega : float
+        Fundamental circular frequency of the slope.
+    damp_tot : float
+        Total damping ratio (material plus impedance).
+    L1, M1, mass : float
+        Modal participation factor, modal mass and total mass.
+    beta, gamma : float
+        Newmark integration parameters.
+    s, u, udotdot, hea, block_acc, sliding_vel : numpy.ndarray
+        Output arrays, same length as `a_in`.
+
+    Returns
+    -------
+    bool
+        Whether the block is sliding at the end of the record.
+    """
+    COS = math.cos(angle * math.pi / 180.0)
+    SIN = math.sin(angle * math.pi / 180.0)
+    gCOS = g * COS
+    gSIN = g * SIN
+
+    slide = False
+    u2 = udot2 = udotdot2 = 0.0
+    s2 = sdot2 = sdotdot2 = 0.0
+    normalf2 = 0.0
+    for i in range(1, len(a_in) + 1):
+        # set up state from previous time step
+        if i == 1:
+            u1 = udot1 = udotdot1 = s1 = sdot1 = sdotdot1 = normalf1 = 0.0
+        else:
+            u1 = u2
+            udot1 = udot2
+            udotdot1 = udotdot2
+            s1 = s2
+            sdot1 = sdot2
+            sdotdot1 = sdotdot2
+            normalf1 = normalf2
+
+        normalf2 = mass * gCOS + mass * a_in[i - 1] * gSIN
+        if i == 1:
+            acc11 = 0.0
+            acc22 = a_in[i - 1] * gCOS
+        elif not slide:
+            acc11 = a_in[i - 2] * gCOS
+            acc22 = a_in[i - 1] * gCOS
+        else:
+            acc11 = gSIN - ky * normalf1 / mass
+            acc22 = gSIN - ky * normalf2 / mass
+
+        # solve for response at this time step
+        u2, udot2, udotdot2 = _coupled_solvu(
+            i == 1, slide, u1, udot1, udotdot1, acc11, acc22, dt, omega,
+            damp_tot, L1, M1, mass, beta, gamma,
+        )
+        u[i - 1] = u2
+        udotdot[i - 1] = udotdot2
+
+        # update sliding acceleration based on calc'd response
+        if slide:
+            sdotdot2 = (
+                -a_in[i - 1] * gCOS
+                - ky * normalf2 / mass
+                - L1 * udotdot2 / mass
+                + gSIN
+            )
+        basef = -mass * a_in[i - 1] * gCOS - L1 * udotdot2 + mass * gSIN
+        if slide:
+            sdot2 = sdot1 + 0.5 * dt * (sdotdot2 + sdotdot1)
+            s2 = s1 + 0.5 * dt * (sdot2 + sdot1)
+
+        # check if sliding has started or stopped
+        if not slide:
+            if basef > ky * normalf2:
+                slide = True
+        elif sdot2 <= 0.0:
+            # Time of end of sliding is taken as where block_vel=0
+            dd = -sdot1 / (sdot2 - sdot1)
+            if dd != 0:
+                ddt = dd * dt
+                acc1b = a_in[i - 2] * g + dd * (a_in[i - 1] - a_in[i - 2]) * g
+                acc22b = gSIN - ky * (gCOS + acc1b * SIN)
+
+                u2, udot2, udotdot2 = _coupled_solvu(
+                    i == 1, slide, u1, udot1, udotdot1, acc11, acc22, dt,
+                    omega, damp_tot, L1, M1, mass, beta, gamma,
+                )
+                u[i - 1] = u2
+                u1 = u2
+                udot1 = udot2
+                udotdot1 = udotdot2
+                normalf2 = mass * gCOS + mass * acc1b * SIN
+                sdotdot2 = (
+                    -acc1b * COS
+                    - ky * normalf2 / mass
+                    - L1 * udotdot2 / mass
+                    + gSIN
+                )
+                sdot2 = sdot1 + 0.5 * ddt * (sdotdot2 + sdotdot1)
+                s2 = s1 + 0.5 * ddt * (sdot1 + sdot2)
+
+                # Solve for non sliding response during remaining part of dt
+                ddt = (1.0 - dd) * dt
+                acc11b = acc22b
+                acc22b = a_in[i - 1] * gCOS
+                khat = (
+                    1.0
+                    + 2.0 * damp_tot * omega * gamma * ddt
+                    + (omega**2) * beta * (ddt**2)
+                )
+                a = (
+                    (1.0 - (L1**2) / (mass * M1))
+                    + 2.0 * damp_tot * omega * ddt * (gamma - 1.0)
+                    + (omega**2) * (ddt**2) * (beta - 0.5)
+                )
+                b = (omega**2) * ddt
+                deltp = -L1 / M1 * (acc22b - acc11b) + a * udotdot1 - b * udot1
+                udotdot2 = deltp / khat
+                udot2 = udot1 + (1.0 - gamma) * ddt * udotdot1 + gamma * ddt * udotdot2
+                u2 = (
+                    u1
+                    + udot1 * ddt
+                    + (0.5 - beta) * (ddt**2) * udotdot1
+                    + beta * (ddt**2) * udotdot2
+                )
+            slide = False
+            sdot2 = 0.0
+            sdotdot2 = 0.0
+        sliding_vel[i - 1] = sdot2
+        hea[i - 1] = basef / mass  # Horizontal equivalent acceleration
+        block_acc[i - 1] = hea[i - 1] - sdotdot1
+        s[i - 1] = s2
+    return slide
@@ -1,13 +1,20 @@
 """
 analytical_sliding_block.py
 
-This module contains the implementation of the analytical model for a sliding block.
-It defines the necessary symbols and parameters for the model, and sets up the global variables.
+This module contains the implementation of the analytical model for a rigid block
+sliding on a horizontal base excited by one cycle of a sine wave.
 
-The module imports the necessary libraries, including numpy, sympy, pandas, and matplotlib.
+The closed-form solution is evaluated with NumPy by `harmonic_sliding_times` and
+`harmonic_displacement`, which accept arrays of frequencies and yield accelerations
+and broadcast them, so a whole (frequency x ky) grid is solved in one call. The
+symbolic derivation with sympy is kept as an optional cross-check; sympy and pandas
+are imported only when needed.
 
 Functions:
-    set_globals(): Sets the global variables for the model.
+    harmonic_sliding_times(freq, ky): Start and end times of sliding (NumPy, vectorized).
+    harmonic_displacement(freq, ky, grav=9.81): Sliding displacement (NumPy, vectorized).
+    harmonic_grid(frequencies, yield_accelerations, grav=9.81): Displacements on a grid.
+    set_globals(): Sets the global variables for the symbolic model.
     show_solution_approach(): Displays the definitions of the input acceleration, velocity, and displacement.
     create_harmonic_input_files(freq, resolution, cycles=10): Creates input files for a harmonic motion with a given frequency, resolution, and number of cycles.
     find_harmonic_solution(freq_val, ky_val, grav = 9.81, plot=True): Finds the solution for a harmonic motion with a given frequency and stiffness, optionally plots the solution.
@@ -15,25 +22,26 @@ Functions:
     find_t2(v_in, vb, vals, freq_val): Finds the time at which the input velocity equals the block velocity.
     find_displacement(v_in, vb, t1, t2, vals): Finds the displacement of the block.
     apply_find_harmonic_solution(row, plot = False): Applies the find_harmonic_solution function to a row of data.
-    harmonic_solutions(harmonic_combinations, save=False, plot=False): Finds the solutions for a set of harmonic combinations, optionally saves the solutions to a file.
+    harmonic_solutions(harmonic_combinations, save=False, plot=False, method="numpy"): Finds the solutions for a set of harmonic combinations, optionally saves the solutions to a file.
     harmonic_solution_plot(a_in, v_in, vb, displacement,time,t1_def_val,t2_val, ky, vals, save=False): Plots the solution for a harmonic motion.
 
 Global variables:
-    time, freq, g, ky: Symbols for the analytical solution.
-    a_in, v_inmax, v_in, x_in: Function expressions for the model.
+    time, freq, g, ky: Symbols for the analytical solution (when sympy is installed).
+    a_in, v_inmax, v_in, x_in: Function expressions for the model (when sympy is installed).
 
 Usage:
     Import this module to use the analytical model for a sliding block.
-    Call set_globals() to set the global variables.
+    The symbolic functions require sympy; `harmonic_solutions` requires pandas.
 """
 
 # import pickle as pkl
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import sympy as sym
 
-sym.init_printing()
+try:
+    import sympy as sym
+except ImportError:
+    sym = None
 
 # for analytical model
 frequencies = np.array([0.5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
@@ -43,6 +51,135 @@ combinations = np.array(np.meshgrid(frequencies, yield_accelerations)).T.reshape
 # for numerical models
 sample_resolution = np.array([50, 100, 200, 250, 500, 750, 1000])  # samples per second
 
+# Bisection steps for the end of sliding; the bracket is at most 2*pi wide, so
+# 60 halvings reach double precision.
+_BISECTION_STEPS = 60
+
+
+def harmonic_sliding_times(freq, ky):
+    """
+    Start and end times of sliding for one cycle of a harmonic input.
+
+    The input acceleration is ``sin(2*pi*freq*t)`` (in g) with the ground initially at
+    rest. The block starts sliding when the input acceleration reaches `ky`, at phase
+    ``theta1 = arcsin(ky)``, and stops when the relative velocity returns to zero, at
+    the root ``theta2`` of ``cos(theta1) - cos(theta) - ky * (theta - theta1)`` in
+    ``[pi - theta1, 2*pi]``. The root is found by bisection on all inputs at once.
+
+    Parameters
+    ----------
+    freq : float or array_like
+        Frequency of the input in Hz.
+    ky : float or array_like
+        Yield acceleration in g. Broadcast against `freq`.
+
+    Returns
+    -------
+    t1, t2 : numpy.ndarray
+        Start and end times of sliding in seconds. Both equal ``1 / (4 * freq)`` when
+        ``ky >= 1``, i.e. when the block does not slide.
+
+    Raises
+    ------
+    ValueError
+        If any frequency or yield acceleration is not positive.
+    """
+    freq, ky = np.broadcast_arrays(
+        np.asarray(freq, dtype=float), np.asarray(ky, dtype=float)
+    )
+    if np.any(freq <= 0) or np.any(ky <= 0):
+        raise ValueError("Frequencies and yield accelerations must be positive.")
+    ky = np.minimum(ky, 1.0)
+    theta1 = np.arcsin(ky)
+    cos_theta1 = np.cos(theta1)
+
+    # The relative velocity is positive at lo and not positive at hi.
+    lo = np.pi - theta1
+    hi = np.full_like(lo, 2 * np.pi)
+    for _ in range(_BISECTION_STEPS):
+        mid = 0.5 * (lo + hi)
+        positive = cos_theta1 - np.cos(mid) - ky * (mid - theta1) > 0
+        lo = np.where(positive, mid, lo)
+        hi = np.where(positive, hi, mid)
+    theta2 = np.where(ky < 1.0, lo, theta1)
+
+    omega = 2 * np.pi * freq
+    return theta1 / omega, theta2 / omega
+
+
+def harmonic_displacement(freq, ky, grav=9.81):
+    """
+    Sliding displacement of a rigid block for one cycle of a harmonic input.
+
+    Closed-form counterpart of `find_harmonic_solution`: the relative velocity
+    ``g / omega * (cos(theta1) - cos(theta)) - g * ky * (theta - theta1) / omega`` is
+    integrated from the start to the end of sliding (see `harmonic_sliding_times`).
+
+    Parameters
+    ----------
+    freq : float or array_like
+        Frequency of the input in Hz.
+    ky : float or array_like
+        Yield acceleration in g. Broadcast against `freq`.
+    grav : float, optional
+        Gravitational acceleration. Defaults to 9.81.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sliding displacement, in the length unit of `grav`.
+    """
+    t1, t2 = harmonic_sliding_times(freq, ky)
+    omega = 2 * np.pi * np.asarray(freq, dtype=float)
+    ky = np.minimum(np.asarray(ky, dtype=float), 1.0)
+    theta1 = omega * t1
+    theta2 = omega * t2
+    dtheta = theta2 - theta1
+    return (
+        grav
+        / omega**2
+        * (
+            dtheta * np.cos(theta1)
+            - (np.sin(theta2) - np.sin(theta1))
+            - 0.5 * ky * dtheta**2
+        )
+    )
+
+
+def harmonic_grid(
+    frequencies=frequencies, yield_accelerations=yield_accelerations, grav=9.81
+):
+    """
+    Sliding displacements for every combination of frequency and yield acceleration.
+
+    Parameters
+    ----------
+    frequencies : array_like, optional
+        Frequencies in Hz. Defaults to the module's `frequencies`.
+    yield_accelerations : array_like, optional
+        Yield accelerations in g. Defaults to the module's `yield_accelerations`.
+    grav : float, optional
+        Gravitational acceleration. Defaults to 9.81.
+
+    Returns
+    -------
+    numpy.ndarray
+        Displacements with shape ``(len(frequencies), len(yield_accelerations))``.
+    """
+    return harmonic_displacement(
+        np.asarray(frequencies, dtype=float)[:, np.newaxis],
+        np.asarray(yield_accelerations, dtype=float)[np.newaxis, :],
+        grav,
+    )
+
+
+def _require_sympy():
+    if sym is None:
+        raise ImportError(
+            "The symbolic harmonic solution requires sympy. "
+            "Use harmonic_displacement for the NumPy solution."
+        )
+
 
 def set_globals():
     """
@@ -58,6 +195,7 @@ def set_globals():
     Returns:
         None
     """
+    _require_sympy()
     global time, freq, g, ky, a_in, v_inmax, v_in, x_in
     # Define symbols for analytical solution
     # Define parameters
@@ -72,7 +210,8 @@ def set_globals():
     x_in = sym.integrate(v_in, time)
 
 
-set_globals()
+if sym is not None:
+    set_globals()
 
 
 def show_solution_approach():
@@ -85,10 +224,11 @@ def show_solution_approach():
     Returns:
         None
     """
+    _require_sympy()
     print("The input acceleration (in units of g) is defined by:")
-    print(sym.Eq(sym.symbols("\ddot{x_resp}_{in}(t)/g"), a_in))
+    print(sym.Eq(sym.symbols(r"\ddot{x_resp}_{in}(t)/g"), a_in))
     print("The input velocity (in m/block_disp) is defined by:")
-    print(sym.Eq(sym.symbols("\dot{x_resp}_{in}(t)"), v_in))
+    print(sym.Eq(sym.symbols(r"\dot{x_resp}_{in}(t)"), v_in))
     print("The input displacement (in m) is defined by:")
     print(sym.Eq(sym.symbols("u_{in}(t)"), x_in))
     return None
@@ -132,6 +272,7 @@ def find_harmonic_solution(freq_val, ky_val, grav=9.81, plot=True):
     Returns:
         float: The total displacement of the block.
     """
+    _require_sympy()
     vals = [(g, grav), (ky, ky_val), (freq, freq_val)]
 
     t1 = find_t1(a_in, ky, vals)
@@ -223,24 +364,44 @@ def apply_find_harmonic_solution(row, plot=False):
     return find_harmonic_solution(row["Frequency (Hz)"], row["ky (g)"], plot=plot)
 
 
-def harmonic_solutions(harmonic_combinations, save=False, plot=False):
+def harmonic_solutions(
+    harmonic_combinations, save=False, plot=False, method="numpy"
+):
     """
     Calculate the harmonic solutions for given combinations of frequency and ky values.
 
+    Requires pandas.
+
     Args:
         harmonic_combinations (list): A list of tuples containing the frequency (Hz) and ky (g) values.
         save (bool, optional): Whether to save the harmonic solutions to a CSV file. Defaults to False.
-        plot (bool, optional): Whether to plot the harmonic solutions. Defaults to False.
+        plot (bool, optional): Whether to plot the harmonic solutions. Only used by the
+            sympy method. Defaults to False.
+        method (str, optional): "numpy" for the vectorized closed-form solution or "sympy"
+            for the symbolic solution of each row, as a cross-check. Defaults to "numpy".
 
     Returns:
         pandas.DataFrame: A DataFrame containing the harmonic solutions with columns for frequency, ky, and displacement.
+
+    Raises:
+        ValueError: If the method is not recognized.
     """
+    import pandas as pd
+
     harmonic_solutions = pd.DataFrame(
         harmonic_combinations, columns=["Frequency (Hz)", "ky (g)"]
     )
-    harmonic_solutions["Displacement (m)"] = harmonic_solutions.apply(
-        lambda row: apply_find_harmonic_solution(row, plot=plot), axis=1
-    )
+    if method == "numpy":
+        harmonic_solutions["Displacement (m)"] = harmonic_displacement(
+            harmonic_solutions["Frequency (Hz)"].to_numpy(),
+            harmonic_solutions["ky (g)"].to_numpy(),
+        )
+    elif method == "sympy":
+        harmonic_solutions["Displacement (m)"] = harmonic_solutions.apply(
+            lambda row: apply_find_harmonic_solution(row, plot=plot), axis=1
+        )
+    else:
+        raise ValueError(f"method must be 'numpy' or 'sympy', got {method!r}")
     if save:
         harmonic_solutions.to_csv("common/harmonic_solutions.csv", index=False)
     return harmonic_solutions
@@ -288,7 +449,7 @@ def harmonic_solution_plot(
     axs[0].plot(time_vals, abplot(time_vals))
     axs[0].legend(["$k_y$", "Input", "Block"])
     axs[0].set_title("Acceleration, g")
-    axs[0].set_ylabel("$\ddot x$")
+    axs[0].set_ylabel(r"$\ddot x$")
 
     axs[1].plot(time_vals, vplot(time_vals))
     axs[1].plot(time_vals[0:t1_index], vplot(time_vals)[0:t1_index], "tab:orange")
@@ -304,7 +465,7 @@ def harmonic_solution_plot(
         alpha=0.5,
     )
     axs[1].set_title("Velocity, m/s")
-    axs[1].set_ylabel("$\dot x$")
+    axs[1].set_ylabel(r"$\dot x$")
 
     tmax = max(time_vals)
     dmax = displacementplot(tmax)
@@ -320,7 +481,7 @@ def harmonic_solution_plot(
     # )
     axs[2].set_title("Relative displacement, m")
     axs[2].set_xlabel("Time, s")
-    axs[2].set_ylabel("$\Delta x$")
+    axs[2].set_ylabel(r"$\Delta x$")
 
     # Set x-axis extents for all axes to 0 to 1
     axs[0].set_xlim(0, 1)
@@ -0,0 +1,543 @@
+"""
+Batch execution of sliding block analyses.
+
+Batches run either in a process pool or in a thread pool. In a process pool,
+ground motions are published once into shared memory and worker processes
+receive lightweight `SharedGroundMotion` handles instead of pickled copies of
+the acceleration arrays. In a thread pool, workers share the motions directly;
+this scales across cores when the analysis kernels are compiled with numba,
+since the compiled kernels release the GIL.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+import numpy as np
+
+from .coupled_analysis import Coupled
+from .batch_io import ResultWriter, open_result_writer
+from .decoupled_analysis import Decoupled, hea_sliding_displacement
+from .ground_motion import GroundMotion
+from .rigid_analysis import RigidAnalysis
+
+__all__ = [
+    "ANALYSIS_METHODS",
+    "AnalysisTask",
+    "DisplacementFunction",
+    "SharedGroundMotion",
+    "SharedMotionExecutor",
+    "run_batch",
+]
+
+ANALYSIS_METHODS = {
+    "rigid": RigidAnalysis,
+    "decoupled": Decoupled,
+    "coupled": Coupled,
+}
+
+# Largest multiple of the PGA tried as upper bound of ky for flexible methods,
+# whose response can be amplified above the PGA.
+_MAX_KY_OVER_PGA = 8.0
+
+
+# Shared memory segments attached (or created) by the current process, by name.
+_SEGMENTS: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach_segment(shm_name: str) -> shared_memory.SharedMemory:
+    segment = _SEGMENTS.get(shm_name)
+    if segment is None:
+        try:
+            # Only the creating process may unlink the segment.
+            segment = shared_memory.SharedMemory(name=shm_name, track=False)
+        except TypeError:  # Python < 3.13 has no `track` argument
+            segment = shared_memory.SharedMemory(name=shm_name)
+        _SEGMENTS[shm_name] = segment
+    return segment
+
+
+@dataclass(frozen=True)
+class AnalysisTask:
+    """
+    A single sliding block analysis to be run as part of a batch.
+
+    Parameters
+    ----------
+    method : str
+        Analysis method: "rigid", "decoupled" or "coupled".
+    motion : str
+        Key of the ground motion in the `motions` mapping passed to `run_batch`.
+    ky : float
+        Yield acceleration (in g).
+    params : dict, optional
+        Additional keyword arguments for the analysis class, e.g. `target_pga`,
+        `inverse`, `height`, `vs_slope`, `vs_base`, `damp_ratio`.
+    """
+
+    method: str
+    motion: str
+    ky: float
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.method not in ANALYSIS_METHODS:
+            raise ValueError(
+                f"Unknown analysis method '{self.method}'. "
+                f"Must be one of {list(ANALYSIS_METHODS)}."
+            )
+
+    @property
+    def task_id(self) -> str:
+        """
+        Stable identifier of the task, derived from its inputs.
+
+        Tasks with the same method, motion key, ky and parameters have the same
+        ID across processes and sessions.
+        """
+        key = json.dumps(
+            [self.method, self.motion, float(self.ky), self.params],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def scale(self, ground_motion: GroundMotion) -> float:
+        """
+        Absolute scale factor applied to the ground motion by the task.
+
+        Parameters
+        ----------
+        ground_motion : GroundMotion
+            Ground motion referenced by `motion`.
+
+        Returns
+        -------
+        float
+            ``target_pga`` over the PGA of the motion if given, otherwise the
+            absolute ``scale_factor`` (1 by default).
+        """
+        if self.params.get("target_pga") is not None:
+            return float(self.params["target_pga"]) / ground_motion.pga
+        return abs(float(self.params.get("scale_factor", 1.0)))
+
+    def run(self, ground_motion: GroundMotion):
+        """
+        Run the analysis on the given ground motion.
+
+        Parameters
+        ----------
+        ground_motion : GroundMotion
+            Ground motion referenced by `motion`.
+
+        Returns
+        -------
+        SlidingBlockAnalysis
+            The completed analysis object.
+        """
+        method_class = ANALYSIS_METHODS[self.method]
+        return method_class(ky=self.ky, ground_motion=ground_motion, **self.params)
+
+    def record(self, analysis) -> Dict[str, Any]:
+        """
+        Summarize a completed analysis of this task as a flat record.
+
+        Parameters
+        ----------
+        analysis : SlidingBlockAnalysis
+            Analysis returned by `run`.
+
+        Returns
+        -------
+        dict
+            Task inputs and scalar results.
+        """
+        return {
+            "task_id": self.task_id,
+            "method": self.method,
+            "motion": self.motion,
+            "ky": self.ky,
+            "scale_factor": float(analysis.scale_factor),
+            "max_sliding_disp": float(analysis.max_sliding_disp),
+        }
+
+
+class SharedGroundMotion:
+    """
+    Picklable handle to a ground motion stored in shared memory.
+
+    Handles are created with `SharedMotionExecutor.share` and are cheap to send
+    to worker processes. `to_ground_motion` rebuilds a `GroundMotion` whose
+    acceleration array is a read-only view of the shared buffer.
+
+    Attributes
+    ----------
+    shm_name : str
+        Name of the shared memory segment holding the acceleration array.
+    npts : int
+        Number of points in the record.
+    dt : float
+        Time step of the record (s).
+    name : str
+        Name of the record.
+    pga : float
+        Peak ground acceleration in g.
+    mean_period : float
+        Mean period of the ground motion.
+    """
+
+    def __init__(self, shm_name, npts, dt, name, pga, mean_period):
+        self.shm_name = shm_name
+        self.npts = npts
+        self.dt = dt
+        self.name = name
+        self.pga = pga
+        self.mean_period = mean_period
+
+    def __repr__(self):
+        return (
+            f"SharedGroundMotion(name={self.name!r}, npts={self.npts}, "
+            f"shm_name={self.shm_name!r})"
+        )
+
+    def to_ground_motion(self) -> GroundMotion:
+        """
+        Reconstruct the ground motion without copying the acceleration data.
+
+        Returns
+        -------
+        GroundMotion
+            Ground motion backed by the shared memory segment.
+        """
+        segment = _attach_segment(self.shm_name)
+        accel = np.ndarray((self.npts,), dtype=np.float64, buffer=segment.buf)
+        accel.flags.writeable = False
+        return GroundMotion._from_view(
+            accel, self.dt, self.name, self.pga, self.mean_period
+        )
+
+
+class SharedMotionExecutor(ProcessPoolExecutor):
+    """
+    Process pool that can publish ground motions into shared memory.
+
+    Motions passed to `share` are copied once into shared memory segments that
+    live as long as the executor. The segments are released when the executor
+    is shut down, including on exit from a ``with`` block.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of worker processes. Defaults to the number of CPUs.
+    **kwargs
+        Additional keyword arguments for `ProcessPoolExecutor`.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, **kwargs):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self._shared: Dict[int, SharedGroundMotion] = {}
+
+    def share(self, ground_motion: GroundMotion) -> SharedGroundMotion:
+        """
+        Publish a ground motion into shared memory.
+
+        Sharing the same `GroundMotion` object more than once returns the
+        existing handle.
+
+        Parameters
+        ----------
+        ground_motion : GroundMotion
+            Ground motion to publish.
+
+        Returns
+        -------
+        SharedGroundMotion
+            Handle that can be sent to worker processes.
+        """
+        handle = self._shared.get(id(ground_motion))
+        if handle is not None:
+            return handle
+        accel = np.ascontiguousarray(ground_motion.accel, dtype=np.float64)
+        segment = shared_memory.SharedMemory(create=True, size=max(accel.nbytes, 1))
+        np.ndarray(accel.shape, dtype=np.float64, buffer=segment.buf)[:] = accel
+        _SEGMENTS[segment.name] = segment
+        handle = SharedGroundMotion(
+            segment.name,
+            len(accel),
+            ground_motion.dt,
+            ground_motion.name,
+            ground_motion.pga,
+            ground_motion.mean_period,
+        )
+        self._shared[id(ground_motion)] = handle
+        return handle
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        for handle in self._shared.values():
+            segment = _SEGMENTS.pop(handle.shm_name, None)
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._shared.clear()
+
+
+def _run_task(task: AnalysisTask, ground_motion: GroundMotion) -> Dict[str, Any]:
+    return task.record(task.run(ground_motion))
+
+
+def _run_shared_task(task: AnalysisTask, handle: SharedGroundMotion) -> Dict[str, Any]:
+    return _run_task(task, handle.to_ground_motion())
+
+
+def _chunks(tasks: Iterable[AnalysisTask], size: int) -> Iterator[List[AnalysisTask]]:
+    iterator = iter(tasks)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_batch(
+    tasks: Iterable[AnalysisTask],
+    motions: Mapping[str, GroundMotion],
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+    executor: str = "process",
+    output: Optional[Union[str, Path, ResultWriter]] = None,
+    output_chunk_size: int = 1000,
+    resume: bool = False,
+    prefilter: Optional[Callable[..., List[Optional[Dict[str, Any]]]]] = None,
+) -> Union[List[Dict[str, Any]], Path]:
+    """
+    Run a batch of analyses in a pool of workers.
+
+    With the process executor, each motion referenced by the tasks is published
+    once into shared memory and workers only receive the task and a small handle
+    to the motion. With the thread executor, no data is serialized at all.
+
+    Tasks are consumed lazily in chunks of `output_chunk_size`. When `output` is
+    given, the records of each chunk are written to disk as soon as the chunk
+    finishes and are not kept in memory, so memory use does not grow with the
+    number of tasks. Records of completed chunks remain readable with
+    `read_results` if the batch is interrupted. With ``resume=True``, tasks
+    whose IDs are already in the manifest of `output` are skipped, so rerunning
+    an interrupted batch only runs the remaining tasks.
+
+    A `prefilter` (e.g. `DisplacementScreen`) sees each chunk of tasks before
+    it runs and may answer some of them without running the analysis.
+
+    Parameters
+    ----------
+    tasks : iterable of AnalysisTask
+        Analyses to run. May be a generator.
+    motions : mapping of str to GroundMotion
+        Ground motions referenced by `AnalysisTask.motion`.
+    max_workers : int, optional
+        Maximum number of worker processes. Defaults to the number of CPUs.
+    chunksize : int, optional
+        Number of tasks sent to a worker process at a time. Default is 1.
+        Ignored by the thread executor.
+    executor : str, optional
+        "process" (default) or "thread". Threads only run in parallel when
+        numba is installed (see `pyslammer._kernels.HAS_NUMBA`).
+    output : str, Path or ResultWriter, optional
+        Directory or writer to stream records to. A directory is opened with
+        `open_result_writer`, i.e. as Parquet when pyarrow is installed and as
+        ``.npz`` otherwise. By default, records are returned in a list.
+    output_chunk_size : int, optional
+        Number of tasks run between writes to `output`. Default is 1000.
+    resume : bool, optional
+        Skip tasks already completed in `output` (see
+        `ResultWriter.completed_task_ids`). Default is False.
+    prefilter : callable, optional
+        Called with each chunk of tasks and `motions`; returns, for each task,
+        either a record to use instead of running the task or None to run it.
+        Records of run tasks then get ``"screened": False``.
+
+    Returns
+    -------
+    list of dict or Path
+        One record per task (see `AnalysisTask.record`), in task order. If
+        `output` is given, the path of the output directory instead.
+
+    Raises
+    ------
+    KeyError
+        If a task references a motion that is not in `motions`. With `output`,
+        chunks before the offending one have already been written.
+    ValueError
+        If `executor` is not "process" or "thread", or `output_chunk_size` is
+        not positive.
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"executor must be 'process' or 'thread', got {executor!r}"
+        )
+    if output_chunk_size < 1:
+        raise ValueError(
+            f"output_chunk_size must be positive, got {output_chunk_size}"
+        )
+    if resume and output is None:
+        raise ValueError("resume requires an output directory or writer")
+    if output is None:
+        # Validate everything up front when nothing is written to disk.
+        tasks = list(tasks)
+        output_chunk_size = max(len(tasks), 1)
+        writer = None
+    elif isinstance(output, ResultWriter):
+        writer = output
+    else:
+        writer = open_result_writer(output)
+    if resume:
+        completed = writer.completed_task_ids()
+        tasks = (task for task in tasks if task.task_id not in completed)
+
+    records: List[Dict[str, Any]] = []
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        pool = SharedMotionExecutor(max_workers=max_workers)
+    with pool:
+        for chunk in _chunks(tasks, output_chunk_size):
+            missing = {task.motion for task in chunk} - set(motions)
+            if missing:
+                raise KeyError(f"Tasks reference unknown motions: {sorted(missing)}")
+            if prefilter is not None:
+                screened = prefilter(chunk, motions)
+                pending = [
+                    task for task, record in zip(chunk, screened) if record is None
+                ]
+            else:
+                pending = chunk
+            if executor == "thread":
+                results = pool.map(
+                    _run_task, pending, [motions[task.motion] for task in pending]
+                )
+            else:
+                results = pool.map(
+                    _run_shared_task,
+                    pending,
+                    [pool.share(motions[task.motion]) for task in pending],
+                    chunksize=chunksize,
+                )
+            if prefilter is not None:
+                results = iter(results)
+                results = [
+                    {**next(results), "screened": False} if record is None else record
+                    for record in screened
+                ]
+            if writer is None:
+                records.extend(results)
+            else:
+                writer.write(list(results))
+
+    if writer is None:
+        return records
+    if writer is not output:
+        writer.close()
+    return writer.path
+
+
+class DisplacementFunction:
+    """
+    Maximum sliding displacement of a ground motion as a function of ky.
+
+    Evaluations are cached by ky. For the decoupled method, the dynamic
+    response of the slope does not depend on ky and is reused between
+    evaluations (see `hea_sliding_displacement`).
+
+    Parameters
+    ----------
+    method : str
+        Analysis method: "rigid", "decoupled" or "coupled".
+    ground_motion : GroundMotion
+        Ground motion to analyse.
+    params : mapping of str to Any
+        Additional keyword arguments for the analysis class.
+
+    Attributes
+    ----------
+    values : dict of float to float
+        Displacement (m) at each evaluated ky.
+    analyses : int
+        Number of distinct kys evaluated.
+    full_analyses : int
+        Number of evaluations that ran a full analysis.
+    """
+
+    def __init__(
+        self, method: str, ground_motion: GroundMotion, params: Mapping[str, Any]
+    ):
+        if method not in ANALYSIS_METHODS:
+            raise ValueError(
+                f"Unknown analysis method '{method}'. "
+                f"Must be one of {list(ANALYSIS_METHODS)}."
+            )
+        self.method = method
+        self.ground_motion = ground_motion
+        self.params = dict(params)
+        self.values: Dict[float, float] = {}
+        self.analyses = 0
+        self.full_analyses = 0
+        self._response = None
+
+    @property
+    def pga(self) -> float:
+        """PGA of the scaled input in g."""
+        if self.params.get("target_pga") is not None:
+            return float(self.params["target_pga"])
+        return float(self.ground_motion.pga * abs(self.params.get("scale_factor", 1)))
+
+    def __call__(self, ky: float) -> float:
+        """Maximum sliding displacement (m) at yield acceleration `ky` (g)."""
+        ky = float(ky)
+        if ky not in self.values:
+            if self._response is not None:
+                response = self._response
+                self.values[ky] = hea_sliding_displacement(
+                    response.HEA, ky, response.dt, response.g
+                )
+            else:
+                analysis = ANALYSIS_METHODS[self.method](
+                    ky=ky, ground_motion=self.ground_motion, **self.params
+                )
+                self.values[ky] = float(analysis.max_sliding_disp)
+                self.full_analyses += 1
+                if self.method == "decoupled":
+                    self._response = analysis
+            self.analyses += 1
+        return self.values[ky]
+
+    def upper_bound(self, min_displacement: float) -> float:
+        """
+        Yield acceleration above which the block (almost) does not slide.
+
+        The PGA of the input for the rigid method. For the flexible methods,
+        the PGA doubled until the displacement is below `min_displacement`, up
+        to `_MAX_KY_OVER_PGA` times the PGA.
+        """
+        ky_max = self.pga
+        if self.method != "rigid":
+            limit = _MAX_KY_OVER_PGA * self.pga
+            while self(ky_max) >= min_displacement and ky_max < limit:
+                ky_max *= 2
+        return ky_max
+
+    def curve(self):
+        """Evaluated kys and displacements, by increasing ky."""
+        kys = np.array(sorted(self.values))
+        return kys, np.array([self.values[ky] for ky in kys])
@@ -0,0 +1,299 @@
+"""
+Streaming storage for batch analysis results.
+
+Results are written as a directory of columnar part files, one per chunk of
+records. Each part is written to a temporary file and renamed into place, so
+the directory is readable at any time, even if the writing job is interrupted.
+Parts are Parquet files when pyarrow is installed and ``.npz`` files otherwise.
+
+When records carry a ``task_id`` field, the IDs in each part are also appended
+to a manifest file, which lets an interrupted batch resume without rerunning
+completed tasks.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+__all__ = [
+    "ResultWriter",
+    "ParquetResultWriter",
+    "NpzResultWriter",
+    "open_result_writer",
+    "read_results",
+]
+
+_PART_PREFIX = "part-"
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def _records_to_columns(records: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    keys = list(records[0])
+    for record in records:
+        if list(record) != keys:
+            raise ValueError(
+                f"All records must have the same fields, got {list(record)} and {keys}"
+            )
+    return {key: np.asarray([record[key] for record in records]) for key in keys}
+
+
+class ResultWriter:
+    """
+    Base class for streaming writers of batch results.
+
+    Each call to `write` stores one part file in the output directory. Part
+    numbering continues after any parts already present, so a writer can append
+    to the output of an earlier run. If the records have a ``task_id`` field,
+    the part name and its task IDs are then appended as one line to
+    ``manifest.jsonl`` (see `completed_task_ids`).
+
+    Parameters
+    ----------
+    path : str or Path
+        Output directory. Created if it does not exist.
+
+    Attributes
+    ----------
+    path : Path
+        Output directory.
+    manifest_path : Path
+        Path of the manifest of completed task IDs.
+    suffix : str
+        File extension of the part files (defined by subclasses).
+    """
+
+    suffix = ""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        existing = [
+            int(p.name[len(_PART_PREFIX) : -len(self.suffix)])
+            for p in self.path.glob(f"{_PART_PREFIX}*{self.suffix}")
+        ]
+        self._next_part = max(existing, default=-1) + 1
+        self.manifest_path = self.path / MANIFEST_NAME
+        self._repair_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, records: Sequence[Dict[str, Any]]) -> Optional[Path]:
+        """
+        Write a chunk of records as a new part file.
+
+        Parameters
+        ----------
+        records : sequence of dict
+            Flat records with identical fields, e.g. from `AnalysisTask.record`.
+
+        Returns
+        -------
+        Path or None
+            Path of the part file, or None if `records` is empty.
+        """
+        if not records:
+            return None
+        return self.write_columns(_records_to_columns(records))
+
+    def write_columns(self, columns: Dict[str, np.ndarray]) -> Path:
+        """
+        Write a chunk of columnar data as a new part file.
+
+        Parameters
+        ----------
+        columns : dict of str to numpy.ndarray
+            Equal-length arrays, one per field.
+
+        Returns
+        -------
+        Path
+            Path of the part file.
+        """
+        part = self.path / f"{_PART_PREFIX}{self._next_part:05d}{self.suffix}"
+        tmp = part.with_name(f".{part.name}.tmp")
+        self._write_part(columns, tmp)
+        os.replace(tmp, part)
+        self._next_part += 1
+        if "task_id" in columns:
+            self._append_manifest(part.name, columns["task_id"].tolist())
+        return part
+
+    def completed_task_ids(self) -> Set[str]:
+        """
+        Return the IDs of all tasks whose records have been written.
+
+        The manifest is the primary source. Parts that were written but not
+        recorded in the manifest (if the run stopped between the two steps) are
+        read directly and added to the manifest.
+
+        Returns
+        -------
+        set of str
+            Task IDs of completed tasks.
+        """
+        completed: Set[str] = set()
+        listed = set()
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    listed.add(entry["part"])
+                    completed.update(entry["task_ids"])
+        for part in _list_parts(self.path):
+            if part.name not in listed:
+                columns = _read_part(part)
+                if "task_id" in columns:
+                    task_ids = columns["task_id"].tolist()
+                    self._append_manifest(part.name, task_ids)
+                    completed.update(task_ids)
+        return completed
+
+    def _append_manifest(self, part_name: str, task_ids: List[str]) -> None:
+        with open(self.manifest_path, "a") as f:
+            f.write(json.dumps({"part": part_name, "task_ids": task_ids}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _repair_manifest(self) -> None:
+        # Drop a trailing line left incomplete by an interrupted append.
+        if not self.manifest_path.exists():
+            return
+        content = self.manifest_path.read_bytes()
+        if content and not content.endswith(b"\n"):
+            with open(self.manifest_path, "r+b") as f:
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def close(self) -> None:
+        """Finish writing. Parts are complete once written, so this is a no-op."""
+        pass
+
+    def _write_part(self, columns: Dict[str, np.ndarray], path: Path) -> None:
+        raise NotImplementedError
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Write batch results as Parquet part files. Requires pyarrow.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output directory. Created if it does not exist.
+    """
+
+    suffix = ".parquet"
+
+    def __init__(self, path: Union[str, Path]):
+        if pa is None:
+            raise ImportError("ParquetResultWriter requires pyarrow.")
+        super().__init__(path)
+
+    def _write_part(self, columns, path):
+        pq.write_table(pa.table(columns), path)
+
+
+class NpzResultWriter(ResultWriter):
+    """
+    Write batch results as ``.npz`` part files.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output directory. Created if it does not exist.
+    """
+
+    suffix = ".npz"
+
+    def _write_part(self, columns, path):
+        with open(path, "wb") as f:
+            np.savez(f, **columns)
+
+
+def open_result_writer(path: Union[str, Path], format: str = "auto") -> ResultWriter:
+    """
+    Create a result writer for an output directory.
+
+    Parameters
+    ----------
+    path : str or Path
+        Output directory.
+    format : str, optional
+        "parquet", "npz", or "auto" (default), which uses Parquet when pyarrow
+        is installed and ``.npz`` otherwise.
+
+    Returns
+    -------
+    ResultWriter
+        Writer for the requested format.
+
+    Raises
+    ------
+    ValueError
+        If `format` is not recognized.
+    """
+    if format == "auto":
+        format = "parquet" if pa is not None else "npz"
+    if format == "parquet":
+        return ParquetResultWriter(path)
+    if format == "npz":
+        return NpzResultWriter(path)
+    raise ValueError(f"format must be 'auto', 'parquet' or 'npz', got {format!r}")
+
+
+def _read_part(path: Path) -> Dict[str, np.ndarray]:
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+    if pq is None:
+        raise ImportError(f"Reading {path.name} requires pyarrow.")
+    table = pq.read_table(path)
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            columns[name] = np.asarray(column.to_pylist())
+        else:
+            columns[name] = column.to_numpy()
+    return columns
+
+
+def _list_parts(path: Path) -> List[Path]:
+    return sorted(
+        p
+        for p in Path(path).glob(f"{_PART_PREFIX}*")
+        if p.suffix in (".parquet", ".npz")
+    )
+
+
+def read_results(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """
+    Read all complete part files in a results directory.
+
+    Parameters
+    ----------
+    path : str or Path
+        Results directory written by a `ResultWriter`.
+
+    Returns
+    -------
+    dict of str to numpy.ndarray
+        One array per field, concatenated across parts in write order. Empty if
+        the directory contains no parts.
+    """
+    chunks = [_read_part(p) for p in _list_parts(path)]
+    if not chunks:
+        return {}
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
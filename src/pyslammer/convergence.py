@@ -0,0 +1,648 @@
+"""
+Numerical convergence studies on harmonic benchmarks.
+
+A convergence study runs sliding block analyses of one cycle of a sine wave at
+several sample rates and compares the displacements against a reference: the
+closed-form solution of `pyslammer.analytical_sliding_block` for the rigid
+method, and an analysis at a finer sample rate for the flexible methods, which
+have no closed-form solution. The harmonic inputs are generated in memory and
+the analyses of each method and sample rate run together as one batch with
+`run_batch`, so the study also measures the cost of an analysis at each sample
+rate. The resulting error-versus-cost curves show the coarsest time step that
+meets an accuracy target.
+
+`resampling_guidance` applies the same idea to a single record: it estimates
+the displacement error introduced by resampling the record to a coarser time
+step with `GroundMotion.resample`.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .analytical_sliding_block import (
+    frequencies as HARMONIC_FREQUENCIES,
+    harmonic_displacement,
+    sample_resolution as SAMPLE_RESOLUTIONS,
+    yield_accelerations as HARMONIC_YIELD_ACCELERATIONS,
+)
+from .batch import ANALYSIS_METHODS, AnalysisTask, run_batch
+from .constants import G_EARTH
+from .ground_motion import GroundMotion
+from .rigid_analysis import RigidAnalysis
+
+__all__ = [
+    "DEFAULT_SITE",
+    "ConvergencePoint",
+    "ConvergenceStudy",
+    "ResamplingGuidance",
+    "coarsest_resampling_dt",
+    "convergence_study",
+    "harmonic_ground_motion",
+    "resampling_guidance",
+]
+
+# Site used for the flexible methods unless another one is given.
+DEFAULT_SITE = {
+    "height": 50.0,
+    "vs_slope": 600.0,
+    "vs_base": 600.0,
+    "damp_ratio": 0.05,
+}
+
+# Sample rate of the flexible reference analyses, relative to the finest
+# sample rate of the study.
+_REFERENCE_REFINEMENT = 4
+
+# Frequencies, relative to the mean frequency of a record, at which the
+# harmonic resampling error is evaluated.
+_HARMONIC_BAND = np.geomspace(1 / 1.5, 1.5, 7)
+
+# Resampling factors tried by `coarsest_resampling_dt` by default.
+_RESAMPLING_FACTORS = (2, 4, 5, 8, 10)
+
+
+def harmonic_ground_motion(
+    freq: float, resolution: float, padding: float = 2.0
+) -> GroundMotion:
+    """
+    One cycle of a sine wave with a 1 g amplitude, followed by zeros.
+
+    This is the input of the closed-form solution in
+    `pyslammer.analytical_sliding_block`, sampled in memory.
+
+    Parameters
+    ----------
+    freq : float
+        Frequency of the sine wave in Hz.
+    resolution : float
+        Sample rate in samples per second.
+    padding : float, optional
+        Duration of the zeros after the sine cycle in seconds, which lets the
+        response of flexible slopes decay. Default is 2.0.
+
+    Returns
+    -------
+    GroundMotion
+        Acceleration in g, named ``sine_<freq>_Hz_<resolution>_sps``.
+    """
+    if freq <= 0 or resolution <= 0:
+        raise ValueError("freq and resolution must be positive")
+    dt = 1 / resolution
+    period = 1 / freq
+    t = np.arange(int(round((period + padding) * resolution)) + 1) * dt
+    accel = np.where(t < period, np.sin(2 * np.pi * freq * t), 0.0)
+    return GroundMotion(accel, dt, name=f"sine_{freq:g}_Hz_{resolution:g}_sps")
+
+
+@dataclass
+class ConvergencePoint:
+    """
+    Error and cost of one analysis method at one sample rate.
+
+    Attributes
+    ----------
+    method : str
+        Analysis method.
+    resolution : float
+        Sample rate in samples per second.
+    dt : float
+        Time step in seconds.
+    analyses : int
+        Number of analyses (frequency and ky combinations) at this sample rate.
+    samples : int
+        Total number of ground motion samples analysed.
+    wall_time_s : float
+        Wall-clock time of the batch of analyses in seconds.
+    max_abs_error_m : float
+        Largest absolute displacement error in meters.
+    max_rel_error : float
+        Largest error relative to the reference displacement, over the
+        analyses whose reference is at least the study's `min_displacement`.
+        NaN if there are no such analyses.
+    rms_rel_error : float
+        Root mean square of the same relative errors.
+    """
+
+    method: str
+    resolution: float
+    dt: float
+    analyses: int
+    samples: int
+    wall_time_s: float
+    max_abs_error_m: float
+    max_rel_error: float
+    rms_rel_error: float
+
+    @property
+    def time_per_analysis_s(self) -> float:
+        """Mean wall-clock time of one analysis in seconds."""
+        return self.wall_time_s / self.analyses
+
+
+@dataclass
+class ConvergenceStudy:
+    """
+    Results of `convergence_study`.
+
+    Attributes
+    ----------
+    records : list of dict
+        One record per analysis with the method, frequency (Hz), ky (g),
+        resolution (samples per second), dt (s), npts, displacement (m),
+        reference displacement (m), absolute error (m) and relative error.
+    points : list of ConvergencePoint
+        Error and cost per method and sample rate, ordered by method and
+        increasing sample rate.
+    references : dict
+        How the reference displacements were obtained for each method:
+        ``"closed-form"`` or ``"<resolution> sps"``.
+    """
+
+    records: List[Dict[str, Any]]
+    points: List[ConvergencePoint]
+    references: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def methods(self) -> List[str]:
+        """Analysis methods in the study."""
+        return list(dict.fromkeys(point.method for point in self.points))
+
+    def curve(self, method: str) -> Dict[str, np.ndarray]:
+        """
+        Error-versus-cost curve of an analysis method.
+
+        Parameters
+        ----------
+        method : str
+            Analysis method.
+
+        Returns
+        -------
+        dict of str to numpy.ndarray
+            ``resolution``, ``dt``, ``time_per_analysis_s``, ``max_abs_error_m``,
+            ``max_rel_error`` and ``rms_rel_error``, by increasing sample rate.
+        """
+        points = [point for point in self.points if point.method == method]
+        if not points:
+            raise KeyError(f"No results for method '{method}'")
+        names = (
+            "resolution",
+            "dt",
+            "time_per_analysis_s",
+            "max_abs_error_m",
+            "max_rel_error",
+            "rms_rel_error",
+        )
+        return {
+            name: np.array([getattr(point, name) for point in points])
+            for name in names
+        }
+
+    def coarsest_dt(
+        self, method: str, tolerance: float, metric: str = "max_rel_error"
+    ) -> Optional[float]:
+        """
+        Largest time step that meets an accuracy target.
+
+        A sample rate qualifies if its error and the errors of all finer sample
+        rates in the study are within the tolerance, so an error that happens
+        to be small at one coarse rate is not mistaken for convergence.
+
+        Parameters
+        ----------
+        method : str
+            Analysis method.
+        tolerance : float
+            Largest acceptable error, in the units of `metric`.
+        metric : str, optional
+            "max_rel_error" (default), "rms_rel_error" or "max_abs_error_m".
+
+        Returns
+        -------
+        float or None
+            Time step in seconds, or None if even the finest sample rate does
+            not meet the tolerance.
+        """
+        if metric not in ("max_rel_error", "rms_rel_error", "max_abs_error_m"):
+            raise ValueError(f"Unknown error metric '{metric}'")
+        curve = self.curve(method)
+        # NaN errors (no displacement to compare) do not disqualify a rate.
+        meets = ~(curve[metric] > tolerance)
+        dt = None
+        for index in range(len(meets) - 1, -1, -1):
+            if not meets[index]:
+                break
+            dt = float(curve["dt"][index])
+        return dt
+
+    def summary(self) -> str:
+        """
+        Plain text table of the error-versus-cost curves.
+
+        Returns
+        -------
+        str
+            One line per method and sample rate.
+        """
+        lines = [
+            f"{'method':<10} {'sps':>6} {'dt (s)':>8} {'ms/analysis':>12} "
+            f"{'max abs (m)':>12} {'max rel':>10} {'rms rel':>10}"
+        ]
+        for point in self.points:
+            lines.append(
+                f"{point.method:<10} {point.resolution:>6g} {point.dt:>8.4f} "
+                f"{point.time_per_analysis_s * 1000:>12.3f} "
+                f"{point.max_abs_error_m:>12.3e} {point.max_rel_error:>10.3e} "
+                f"{point.rms_rel_error:>10.3e}"
+            )
+        return "\n".join(lines)
+
+
+def _tasks(
+    method: str,
+    combinations: Sequence[tuple],
+    resolution: float,
+    params: Mapping[str, Any],
+) -> List[AnalysisTask]:
+    return [
+        AnalysisTask(
+            method,
+            f"sine_{freq:g}_Hz_{resolution:g}_sps",
+            float(ky),
+            dict(params),
+        )
+        for freq, ky in combinations
+    ]
+
+
+def _timed_batch(tasks, motions, executor, max_workers):
+    start = time.perf_counter()
+    records = run_batch(
+        tasks, motions, max_workers=max_workers, executor=executor
+    )
+    return records, time.perf_counter() - start
+
+
+def convergence_study(
+    methods: Iterable[str] = ("rigid", "decoupled", "coupled"),
+    frequencies: Optional[Sequence[float]] = None,
+    yield_accelerations: Optional[Sequence[float]] = None,
+    resolutions: Optional[Sequence[float]] = None,
+    site: Optional[Mapping[str, Any]] = None,
+    reference_resolution: Optional[float] = None,
+    padding: float = 2.0,
+    min_displacement: float = 1e-4,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+) -> ConvergenceStudy:
+    """
+    Run a convergence study of sliding block analyses on harmonic inputs.
+
+    Every combination of frequency and yield acceleration is analysed with each
+    method at each sample rate, on one cycle of a 1 g sine wave (see
+    `harmonic_ground_motion`). The errors are measured against the closed-form
+    solution for the rigid method and against analyses at
+    `reference_resolution` for the decoupled and coupled methods. The analyses
+    of each method and sample rate run as one batch and the batch is timed;
+    each method is run once beforehand so that compilation of the kernels is
+    not counted.
+
+    Parameters
+    ----------
+    methods : iterable of str, optional
+        Analysis methods to study. Default is all three.
+    frequencies : sequence of float, optional
+        Input frequencies in Hz. Defaults to
+        `pyslammer.analytical_sliding_block.frequencies`.
+    yield_accelerations : sequence of float, optional
+        Yield accelerations in g. Defaults to
+        `pyslammer.analytical_sliding_block.yield_accelerations`.
+    resolutions : sequence of float, optional
+        Sample rates in samples per second. Defaults to
+        `pyslammer.analytical_sliding_block.sample_resolution`.
+    site : mapping, optional
+        Keyword arguments of the flexible methods (`height`, `vs_slope`,
+        `vs_base`, `damp_ratio` and optionally `ref_strain` and `soil_model`).
+        Defaults to `DEFAULT_SITE`.
+    reference_resolution : float, optional
+        Sample rate of the reference analyses of the flexible methods. Defaults
+        to four times the finest sample rate.
+    padding : float, optional
+        Duration of the zeros after the sine cycle in seconds. Default is 2.0.
+    min_displacement : float, optional
+        Smallest reference displacement (m) for which a relative error is
+        computed. Default is 1e-4.
+    executor : str, optional
+        Executor of `run_batch`. Default is "thread".
+    max_workers : int, optional
+        Maximum number of workers of `run_batch`.
+
+    Returns
+    -------
+    ConvergenceStudy
+        Per-analysis records and error-versus-cost curves.
+
+    Raises
+    ------
+    ValueError
+        If a method is unknown or the reference resolution is not finer than
+        the sample rates of the study.
+    """
+    methods = list(methods)
+    unknown = set(methods) - set(ANALYSIS_METHODS)
+    if unknown:
+        raise ValueError(
+            f"Unknown analysis methods {sorted(unknown)}. "
+            f"Must be among {list(ANALYSIS_METHODS)}."
+        )
+    frequencies = np.atleast_1d(
+        HARMONIC_FREQUENCIES if frequencies is None else frequencies
+    ).astype(float)
+    yield_accelerations = np.atleast_1d(
+        HARMONIC_YIELD_ACCELERATIONS
+        if yield_accelerations is None
+        else yield_accelerations
+    ).astype(float)
+    resolutions = np.sort(
+        np.atleast_1d(SAMPLE_RESOLUTIONS if resolutions is None else resolutions)
+    ).astype(float)
+    site = dict(DEFAULT_SITE if site is None else site)
+    if reference_resolution is None:
+        reference_resolution = _REFERENCE_REFINEMENT * resolutions[-1]
+    flexible = [method for method in methods if method != "rigid"]
+    if flexible and reference_resolution <= resolutions[-1]:
+        raise ValueError(
+            "reference_resolution must be finer than the sample rates of the study"
+        )
+
+    combinations = [(freq, ky) for freq in frequencies for ky in yield_accelerations]
+    sampled = list(resolutions) + ([reference_resolution] if flexible else [])
+    motions = {}
+    for resolution in sampled:
+        for freq in frequencies:
+            motion = harmonic_ground_motion(freq, resolution, padding)
+            motions[motion.name] = motion
+
+    references = {}
+    reference_values = {}
+    if "rigid" in methods:
+        references["rigid"] = "closed-form"
+        reference_values["rigid"] = [
+            float(harmonic_displacement(freq, ky, grav=G_EARTH))
+            for freq, ky in combinations
+        ]
+    for method in flexible:
+        references[method] = f"{reference_resolution:g} sps"
+        tasks = _tasks(method, combinations, reference_resolution, site)
+        results, _ = _timed_batch(tasks, motions, executor, max_workers)
+        reference_values[method] = [record["max_sliding_disp"] for record in results]
+
+    records = []
+    points = []
+    for method in methods:
+        params = {} if method == "rigid" else site
+        # Warm up, so that compiling the kernels is not part of the cost.
+        _timed_batch(
+            _tasks(method, combinations[:1], resolutions[0], params),
+            motions,
+            executor,
+            max_workers,
+        )
+        for resolution in resolutions:
+            tasks = _tasks(method, combinations, resolution, params)
+            results, wall_time = _timed_batch(tasks, motions, executor, max_workers)
+            abs_errors = []
+            rel_errors = []
+            samples = 0
+            for (freq, ky), task, result, reference in zip(
+                combinations, tasks, results, reference_values[method]
+            ):
+                npts = motions[task.motion]._npts
+                samples += npts
+                abs_error = abs(result["max_sliding_disp"] - reference)
+                rel_error = (
+                    abs_error / abs(reference)
+                    if abs(reference) >= min_displacement
+                    else np.nan
+                )
+                abs_errors.append(abs_error)
+                rel_errors.append(rel_error)
+                records.append(
+                    {
+                        "method": method,
+                        "frequency": float(freq),
+                        "ky": float(ky),
+                        "resolution": float(resolution),
+                        "dt": 1 / resolution,
+                        "npts": npts,
+                        "displacement_m": result["max_sliding_disp"],
+                        "reference_m": reference,
+                        "abs_error_m": abs_error,
+                        "rel_error": rel_error,
+                    }
+                )
+            rel_errors = np.array(rel_errors)
+            rel_errors = rel_errors[~np.isnan(rel_errors)]
+            points.append(
+                ConvergencePoint(
+                    method=method,
+                    resolution=float(resolution),
+                    dt=1 / resolution,
+                    analyses=len(tasks),
+                    samples=samples,
+                    wall_time_s=wall_time,
+                    max_abs_error_m=float(np.max(abs_errors)),
+                    max_rel_error=(
+                        float(np.max(rel_errors)) if rel_errors.size else np.nan
+                    ),
+                    rms_rel_error=(
+                        float(np.sqrt(np.mean(rel_errors**2)))
+                        if rel_errors.size
+                        else np.nan
+                    ),
+                )
+            )
+    return ConvergenceStudy(records, points, references)
+
+
+@dataclass
+class ResamplingGuidance:
+    """
+    Estimated displacement error of resampling a ground motion.
+
+    Attributes
+    ----------
+    ky : float
+        Yield acceleration (in g).
+    original_dt : float
+        Time step of the original record (s).
+    dt : float
+        Time step of the resampled record (s).
+    speedup : float
+        Ratio of the number of points of the original and resampled records,
+        i.e. the expected speedup of an analysis.
+    rel_error : float
+        Estimated displacement error relative to an analysis of the original
+        record.
+    method : str
+        How the error was estimated: "rigid" or "harmonic".
+    original_disp_m : float
+        Rigid sliding displacement of the original record (m). NaN for the
+        harmonic estimate.
+    resampled_disp_m : float
+        Rigid sliding displacement of the resampled record (m). NaN for the
+        harmonic estimate.
+    """
+
+    ky: float
+    original_dt: float
+    dt: float
+    speedup: float
+    rel_error: float
+    method: str
+    original_disp_m: float = np.nan
+    resampled_disp_m: float = np.nan
+
+
+def _harmonic_error(freq: float, ky: float, dt: float) -> float:
+    """Relative error of a rigid analysis of one sine cycle with time step dt."""
+    expected = harmonic_displacement(freq, ky, grav=G_EARTH)
+    if expected == 0:
+        return 0.0
+    motion = harmonic_ground_motion(freq, 1 / dt, padding=0.0)
+    return abs(RigidAnalysis(ky, motion).max_sliding_disp - expected) / expected
+
+
+def resampling_guidance(
+    ground_motion: GroundMotion,
+    ky: float,
+    dt: float,
+    method: str = "rigid",
+    min_displacement: float = 1e-4,
+) -> ResamplingGuidance:
+    """
+    Estimate the displacement error of resampling a ground motion.
+
+    With ``method="rigid"``, the record is resampled and a rigid analysis of
+    both the original and the resampled record is run. This is cheap (the rigid
+    method is by far the fastest) and measures the error for the rigid method
+    exactly, including the effect of the anti-alias filter on the peaks of the
+    record. For the flexible methods, it is an indication of the error.
+
+    With ``method="harmonic"``, no analysis of the record is run. The record is
+    represented by one cycle of a sine wave at frequencies around its mean
+    frequency (``1 / mean_period``) with the same ratio of ky to PGA, and the
+    error is the sum of the errors of rigid analyses of the sine wave at the
+    original and at the new time step against the closed-form solution, taking
+    the largest over the frequencies. This reflects the discretization error
+    only, not the loss of high-frequency content, and underestimates the error
+    when ky is close to the PGA.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Record to resample.
+    ky : float
+        Yield acceleration (in g).
+    dt : float
+        Time step of the resampled record (s).
+    method : str, optional
+        "rigid" (default) or "harmonic".
+    min_displacement : float, optional
+        Smallest displacement (m) used as denominator of the relative error of
+        the "rigid" estimate, so that records that barely slide do not report
+        huge relative errors. Default is 1e-4.
+
+    Returns
+    -------
+    ResamplingGuidance
+        Estimated error and speedup.
+
+    Raises
+    ------
+    ValueError
+        If `method` is not "rigid" or "harmonic".
+    """
+    if method not in ("rigid", "harmonic"):
+        raise ValueError(f"method must be 'rigid' or 'harmonic', got {method!r}")
+    resampled = ground_motion.resample(dt)
+    speedup = ground_motion._npts / resampled._npts
+    if method == "rigid":
+        original_disp = RigidAnalysis(ky, ground_motion).max_sliding_disp
+        resampled_disp = RigidAnalysis(ky, resampled).max_sliding_disp
+        rel_error = abs(resampled_disp - original_disp) / max(
+            abs(original_disp), min_displacement
+        )
+        return ResamplingGuidance(
+            ky,
+            ground_motion.dt,
+            resampled.dt,
+            speedup,
+            float(rel_error),
+            method,
+            float(original_disp),
+            float(resampled_disp),
+        )
+    ky_ratio = ky / ground_motion.pga
+    rel_error = 0.0
+    if ky_ratio < 1:
+        rel_error = max(
+            _harmonic_error(freq, ky_ratio, ground_motion.dt)
+            + _harmonic_error(freq, ky_ratio, resampled.dt)
+            for freq in _HARMONIC_BAND / ground_motion.mean_period
+        )
+    return ResamplingGuidance(
+        ky, ground_motion.dt, resampled.dt, speedup, float(rel_error), method
+    )
+
+
+def coarsest_resampling_dt(
+    ground_motion: GroundMotion,
+    ky: float,
+    tolerance: float,
+    candidates: Optional[Sequence[float]] = None,
+    method: str = "rigid",
+) -> ResamplingGuidance:
+    """
+    Coarsest time step at which a record can be analysed within a tolerance.
+
+    Candidate time steps are tried from the finest to the coarsest, and the
+    search stops at the first one whose estimated error exceeds the tolerance.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Record to resample.
+    ky : float
+        Yield acceleration (in g).
+    tolerance : float
+        Largest acceptable relative displacement error.
+    candidates : sequence of float, optional
+        Candidate time steps (s). Defaults to 2, 4, 5, 8 and 10 times the time
+        step of the record.
+    method : str, optional
+        Error estimate, see `resampling_guidance`. Default is "rigid".
+
+    Returns
+    -------
+    ResamplingGuidance
+        Guidance for the coarsest acceptable time step. If no candidate meets
+        the tolerance, guidance for the original time step (with no error and
+        no speedup).
+    """
+    if candidates is None:
+        candidates = [factor * ground_motion.dt for factor in _RESAMPLING_FACTORS]
+    best = ResamplingGuidance(
+        ky, ground_motion.dt, ground_motion.dt, 1.0, 0.0, method
+    )
+    for dt in sorted(candidates):
+        if dt <= ground_motion.dt:
+            continue
+        guidance = resampling_guidance(ground_motion, ky, dt, method=method)
+        if guidance.rel_error > tolerance:
+            break
+        best = guidance
+    return best
@@ -3,6 +3,7 @@ from typing import Optional
 
 import numpy as np
 
+from ._kernels import coupled_sliding
 from .decoupled_analysis import Decoupled
 from .ground_motion import GroundMotion
 from .utilities import sample_ground_motions
@@ -145,18 +146,43 @@ class Coupled(Decoupled):
 
     def run_sliding_analysis(self):  # TODO: add ca to inputs
         if self.soil_model == "equivalent_linear":
-            self.equivalent_linear()
+            with self._phase("equivalent_linear"):
+                self.equivalent_linear()
 
-        for i in range(1, self.npts + 1):
-            self.dynamic_response(i)
+        with self._phase("dynamic_response"):
+            self._dynamic_response_sweep()
 
         # calculate coupled displacements
-        for i in range(1, self.npts + 1):
-            self.coupled_sliding(i)
+        with self._phase("sliding"):
+            if self._constant_ky is not None:
+                self._slide = coupled_sliding(
+                    self.a_in,
+                    self._constant_ky,
+                    self.dt,
+                    self.g,
+                    self.angle,
+                    self._omega,
+                    self._damp_tot,
+                    self.L1,
+                    self.M1,
+                    self.mass,
+                    self.beta,
+                    self.gamma,
+                    self.s,
+                    self.u,
+                    self.udotdot,
+                    self.HEA,
+                    self._block_acc_,
+                    self.sliding_vel,
+                )
+            else:
+                for i in range(1, self.npts + 1):
+                    self.coupled_sliding(i)
 
         # return self.max_sliding_disp
         self.block_disp = self.s
         self.max_sliding_disp = self.block_disp[-1]
+        self._finish_instrumentation(self.block_disp)
 
     def coupled_sliding(self, i):
         self.coupled_setupstate(i)
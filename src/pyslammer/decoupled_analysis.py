@@ -3,11 +3,13 @@
 # TODO: add inherited variable values
 # TODO: add "testing" features?
 import math
+import numbers
 from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from ._kernels import decoupled_sliding, linear_response
 from .constants import G_EARTH, KNM3_TO_LBFT3, M_TO_FT
 from .ground_motion import GroundMotion
 from .sliding_block_analysis import SlidingBlockAnalysis
@@ -74,8 +76,8 @@ def interpolated_k_y(k_y):
 
 
 def assign_k_y(k_y):
-    if isinstance(k_y, float):
-        return constant_k_y(k_y)
+    if isinstance(k_y, numbers.Real):
+        return constant_k_y(float(k_y))
     elif isinstance(k_y, tuple) and len(k_y) == 2:
         return interpolated_k_y(k_y)
     elif callable(k_y):
@@ -89,6 +91,52 @@ def assign_k_y(k_y):
 
 
 # FIXME: inconsistent use of a_in with/without scale_factor
+def hea_sliding_displacement(
+    hea: np.ndarray, ky: float, dt: float, g: float = G_EARTH
+) -> float:
+    """
+    Maximum sliding displacement of a block driven by a given HEA.
+
+    This is the sliding part of a decoupled analysis, for a constant yield
+    acceleration. The dynamic response (HEA) of a decoupled analysis does not
+    depend on ky, so ``hea_sliding_displacement(analysis.HEA, ky, analysis.dt,
+    analysis.g)`` matches a new `Decoupled` analysis at `ky` without rerunning
+    the dynamic response. The HEA of a `Coupled` analysis depends on its ky and
+    cannot be reused this way.
+
+    Parameters
+    ----------
+    hea : numpy.ndarray
+        Horizontal equivalent acceleration (in units of `g`).
+    ky : float
+        Yield acceleration (in g).
+    dt : float
+        Time step (s).
+    g : float, optional
+        Gravitational acceleration. Default is `G_EARTH` (m/s^2).
+
+    Returns
+    -------
+    float
+        Maximum sliding displacement, in the length unit of `g`.
+    """
+    if ky <= 0:
+        raise ValueError(f"Yield acceleration ky must be positive, got {ky}")
+    npts = len(hea)
+    block_disp = np.zeros(npts)
+    decoupled_sliding(
+        hea,
+        ky * g,
+        dt,
+        False,
+        np.zeros(npts),
+        np.zeros(npts),
+        block_disp,
+        np.zeros(npts),
+    )
+    return float(block_disp[-1])
+
+
 class Decoupled(SlidingBlockAnalysis):
     """
     Decoupled analysis for sliding block and ground motion interaction.
@@ -200,6 +248,8 @@ class Decoupled(SlidingBlockAnalysis):
         super().__init__(ky, ground_motion, scale_factor, target_pga, inverse)
         self._npts = len(self.a_in)
         self.k_y = assign_k_y(ky)
+        # constant yield accelerations use the compiled sliding kernels
+        self._constant_ky = float(ky) if isinstance(ky, numbers.Real) else None
         self.dt = ground_motion.dt
         self.height = height
         self.vs_slope = vs_slope
@@ -216,6 +266,8 @@ class Decoupled(SlidingBlockAnalysis):
             )
 
         self.ref_strain = ref_strain
+        if self.stats is not None:
+            self.stats["equivalent_linear_iterations"] = 0
 
         self.npts = len(self.a_in)
         self.g = G_EARTH * (si_units + (not si_units) * M_TO_FT)
@@ -245,9 +297,9 @@ class Decoupled(SlidingBlockAnalysis):
         self._damp_imp = impedance_damping(vs_base, vs_slope)
         self._damp_tot = damp_ratio + self._damp_imp
 
+        self._ground_acc_ = self.a_in * self.g
         if type(self) is Decoupled:
             self.run_sliding_analysis()
-        self._ground_acc_ = self.a_in * self.g
 
     def __str__(self):
         return (
@@ -265,16 +317,31 @@ class Decoupled(SlidingBlockAnalysis):
 
     def run_sliding_analysis(self):  # TODO: add ca to inputs
         if self.soil_model == "equivalent_linear":
-            self.equivalent_linear()
+            with self._phase("equivalent_linear"):
+                self.equivalent_linear()
 
-        for i in range(1, self.npts + 1):
-            self.dynamic_response(i)
+        with self._phase("dynamic_response"):
+            self._dynamic_response_sweep()
 
         # calculate decoupled displacements
-        for i in range(1, self.npts + 1):
-            self.sliding(i)
+        with self._phase("sliding"):
+            if self._constant_ky is not None:
+                self._slide = decoupled_sliding(
+                    self.HEA,
+                    self._constant_ky * self.g,
+                    self.dt,
+                    self._slide,
+                    self._block_acc_,
+                    self.block_vel,
+                    self.block_disp,
+                    self.sliding_vel,
+                )
+            else:
+                for i in range(1, self.npts + 1):
+                    self.sliding(i)
 
         self.max_sliding_disp = self.block_disp[-1]
+        self._finish_instrumentation(self.block_disp)
         return self.max_sliding_disp
 
     def sliding(self, i):  # TODO: refactor
@@ -315,6 +382,24 @@ class Decoupled(SlidingBlockAnalysis):
                 self._slide = False
         self.sliding_vel[curr] = -self.block_vel[prev]
 
+    def _dynamic_response_sweep(self):
+        # Equivalent to calling dynamic_response(i) for every time step.
+        self._omega = math.pi * self._vs_slope / (2.0 * self.height)
+        linear_response(
+            self.a_in,
+            self.dt,
+            self.g,
+            self._omega,
+            self._damp_tot,
+            self.L1,
+            self.M1,
+            self.mass,
+            self.x_resp,
+            self.v_resp,
+            self.a_resp,
+            self.HEA,
+        )
+
     def dynamic_response(self, i):
         prev = i - 2 + (i == 1)
         curr = i - 1
@@ -373,8 +458,7 @@ class Decoupled(SlidingBlockAnalysis):
         while (
             rel_delta_damp > tol or rel_delta_mod > tol
         ):  # TODO: confirm whether number of iterations and order of operations matches SLAMMER
-            for i in range(1, self.npts + 1):
-                self.dynamic_response(i)
+            self._dynamic_response_sweep()
             peak_disp = max(abs(self.x_resp))
             effective_strain = (
                 0.65 * 1.57 * peak_disp / self.height
@@ -402,6 +486,8 @@ class Decoupled(SlidingBlockAnalysis):
             shear_mod = new_mod
 
             count += 1
+            if self.stats is not None:
+                self.stats["equivalent_linear_iterations"] = count
             if count > max_iterations:
                 print(
                     "Warning: Maximum iterations reached. Equivalent linear procedure did not converge."
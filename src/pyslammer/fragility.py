@@ -0,0 +1,349 @@
+"""
+Seismic fragility curves of a slope from scaled ground motion suites.
+
+`fragility_curves` scales every motion of a suite to a set of PGA levels,
+computes the sliding displacements, and fits a lognormal fragility curve
+
+    P(D > limit | PGA = x) = Phi(ln(x / median) / beta)
+
+to the fraction of motions exceeding each displacement limit state, by maximum
+likelihood on the binomial exceedance counts.
+
+Scaling is linear for the rigid method and for the linear elastic decoupled
+method: scaling the input by ``s`` scales the (horizontal equivalent)
+acceleration by ``s``, and a block with yield acceleration ``ky`` under the
+scaled input slides ``s`` times as far as a block with yield acceleration
+``ky / s`` under the unscaled input, i.e. ``D(s, ky) = s * D(1, ky / s)``. In
+those cases the response of each motion is computed once at unit scale and only
+the sliding is rerun for each level. Other cases are analysed at each level.
+
+Confidence bands come from a bootstrap over the motions of the suite. The
+maximum likelihood fits of all bootstrap samples are computed together by
+iteratively reweighted least squares vectorized over the samples.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.stats import norm
+
+from .batch import ANALYSIS_METHODS, DisplacementFunction
+from .ground_motion import GroundMotion, GroundMotionSuite
+from .ky_search import DEFAULT_THRESHOLDS
+
+__all__ = [
+    "FragilityCurves",
+    "fit_lognormal_fragility",
+    "fragility_curves",
+]
+
+# Bounds of the dispersion of fitted curves. Fits of perfectly separated data
+# (no overlap between exceeding and non-exceeding levels) would otherwise
+# diverge to a step function.
+_MIN_BETA = 0.01
+_MAX_BETA = 10.0
+_IRLS_ITERATIONS = 100
+
+
+def fit_lognormal_fragility(
+    im: np.ndarray, exceedances: np.ndarray, trials: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maximum likelihood lognormal fragility parameters from exceedance counts.
+
+    Fits ``P(exceedance | im) = Phi((ln(im) - ln(median)) / beta)`` to binomial
+    counts, as a probit regression on ``ln(im)`` solved by iteratively
+    reweighted least squares. Leading dimensions of `exceedances` are fitted
+    independently and all at once.
+
+    Parameters
+    ----------
+    im : numpy.ndarray
+        Intensity measure levels, shape (L,).
+    exceedances : numpy.ndarray
+        Number of exceedances at each level, shape (..., L).
+    trials : numpy.ndarray
+        Number of trials at each level, broadcast against `exceedances`.
+
+    Returns
+    -------
+    median, beta : numpy.ndarray
+        Fitted parameters, with the leading shape of `exceedances`. NaN where
+        there are no exceedances or only exceedances.
+    """
+    x = np.log(np.asarray(im, dtype=float))
+    y = np.asarray(exceedances, dtype=float)
+    n = np.broadcast_to(np.asarray(trials, dtype=float), y.shape)
+    shape = y.shape[:-1]
+    fraction = y / n
+    # Start from a curve through the mean of the levels with a moderate slope.
+    slope = np.full(shape, 1 / 0.5)
+    intercept = -slope * x.mean()
+    for _ in range(_IRLS_ITERATIONS):
+        eta = np.clip(intercept[..., None] + slope[..., None] * x, -8.0, 8.0)
+        p = np.clip(norm.cdf(eta), 1e-12, 1 - 1e-12)
+        density = np.maximum(norm.pdf(eta), 1e-300)
+        weight = n * density**2 / (p * (1 - p))
+        response = eta + (fraction - p) / density
+        s0 = weight.sum(-1)
+        s1 = (weight * x).sum(-1)
+        s2 = (weight * x * x).sum(-1)
+        t0 = (weight * response).sum(-1)
+        t1 = (weight * response * x).sum(-1)
+        det = s0 * s2 - s1 * s1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_slope = np.clip(
+                (s0 * t1 - s1 * t0) / det, 1 / _MAX_BETA, 1 / _MIN_BETA
+            )
+            new_intercept = (t0 - new_slope * s1) / s0
+        new_slope = np.where(np.isfinite(new_slope), new_slope, slope)
+        new_intercept = np.where(np.isfinite(new_intercept), new_intercept, intercept)
+        done = np.all(np.abs(new_slope - slope) <= 1e-10 * np.abs(slope)) and np.all(
+            np.abs(new_intercept - intercept) <= 1e-10 * (1 + np.abs(intercept))
+        )
+        slope, intercept = new_slope, new_intercept
+        if done:
+            break
+    total = y.sum(-1)
+    degenerate = (total == 0) | (total == n.sum(-1))
+    with np.errstate(over="ignore"):
+        median = np.where(degenerate, np.nan, np.exp(-intercept / slope))
+    beta = np.where(degenerate, np.nan, 1 / slope)
+    return median, beta
+
+
+@dataclass
+class FragilityCurves:
+    """
+    Lognormal fragility curves of a slope for displacement limit states.
+
+    Attributes
+    ----------
+    ky : float
+        Yield acceleration (g).
+    method : str
+        Analysis method.
+    im : numpy.ndarray
+        PGA levels (g) the motions were scaled to.
+    limit_states : numpy.ndarray
+        Displacement limit states (m).
+    displacement : numpy.ndarray
+        Maximum sliding displacement (m) of each motion (rows) at each PGA
+        level (columns).
+    exceedance_fraction : numpy.ndarray
+        Fraction of motions exceeding each limit state (rows) at each PGA level
+        (columns).
+    median, beta : numpy.ndarray
+        Fitted median PGA (g) and lognormal standard deviation of each limit
+        state. NaN if no motion, or every motion, exceeds the limit state.
+    bootstrap_median, bootstrap_beta : numpy.ndarray
+        Fitted parameters of each bootstrap sample, shape (limit states,
+        samples).
+    confidence : float
+        Confidence level of the bands.
+    linear_scaling : bool
+        Whether the displacements were computed from unit-scale responses.
+    analyses : int
+        Number of displacements computed.
+    full_analyses : int
+        Number of complete analyses run.
+    """
+
+    ky: float
+    method: str
+    im: np.ndarray
+    limit_states: np.ndarray
+    displacement: np.ndarray
+    exceedance_fraction: np.ndarray
+    median: np.ndarray
+    beta: np.ndarray
+    bootstrap_median: np.ndarray
+    bootstrap_beta: np.ndarray
+    confidence: float
+    linear_scaling: bool
+    analyses: int
+    full_analyses: int
+
+    def probability(self, im) -> np.ndarray:
+        """
+        Fitted probability of exceeding each limit state.
+
+        Parameters
+        ----------
+        im : float or array_like
+            PGA (g).
+
+        Returns
+        -------
+        numpy.ndarray
+            Probabilities, shape (limit states, len(im)).
+        """
+        im = np.atleast_1d(np.asarray(im, dtype=float))
+        return norm.cdf(np.log(im / self.median[:, None]) / self.beta[:, None])
+
+    def band(self, im) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bootstrap confidence band of the fragility curves.
+
+        Parameters
+        ----------
+        im : float or array_like
+            PGA (g).
+
+        Returns
+        -------
+        lower, upper : numpy.ndarray
+            Pointwise lower and upper bounds of the exceedance probability,
+            shape (limit states, len(im)). Bootstrap samples without a fit are
+            left out.
+        """
+        im = np.atleast_1d(np.asarray(im, dtype=float))
+        curves = norm.cdf(
+            np.log(im / self.bootstrap_median[..., None])
+            / self.bootstrap_beta[..., None]
+        )
+        alpha = (1 - self.confidence) / 2
+        with np.errstate(all="ignore"):
+            lower = np.nanquantile(curves, alpha, axis=1)
+            upper = np.nanquantile(curves, 1 - alpha, axis=1)
+        return lower, upper
+
+
+def _scaled_displacements(
+    ground_motion: GroundMotion,
+    ky: float,
+    im: np.ndarray,
+    method: str,
+    linear: bool,
+    params,
+) -> Tuple[np.ndarray, int, int]:
+    """Displacements of a motion scaled to each PGA level."""
+    if linear:
+        displacement = DisplacementFunction(method, ground_motion, params)
+        scales = im / ground_motion.pga
+        disps = np.array([s * displacement(ky / s) for s in scales])
+        return disps, displacement.analyses, displacement.full_analyses
+    disps = []
+    for level in im:
+        displacement = DisplacementFunction(
+            method, ground_motion, {**params, "target_pga": float(level)}
+        )
+        disps.append(displacement(ky))
+    return np.array(disps), len(im), len(im)
+
+
+def fragility_curves(
+    motions: Union[GroundMotionSuite, Mapping[str, GroundMotion]],
+    ky: float,
+    im: Sequence[float],
+    limit_states: Sequence[float] = DEFAULT_THRESHOLDS,
+    method: str = "rigid",
+    n_bootstrap: int = 1000,
+    confidence: float = 0.9,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    **params,
+) -> FragilityCurves:
+    """
+    Fit lognormal fragility curves from a suite scaled to PGA levels.
+
+    Parameters
+    ----------
+    motions : GroundMotionSuite or mapping of str to GroundMotion
+        Ground motions. The weights of a suite are not used: every motion
+        counts as one trial at each level.
+    ky : float
+        Yield acceleration of the slope (g).
+    im : sequence of float
+        PGA levels (g) to scale the motions to.
+    limit_states : sequence of float, optional
+        Displacement limit states (m). Default is 5, 15 and 100 cm.
+    method : str, optional
+        Analysis method: "rigid" (default), "decoupled" or "coupled".
+    n_bootstrap : int, optional
+        Number of bootstrap samples of the motions. Default is 1000.
+    confidence : float, optional
+        Confidence level of the bands. Default is 0.9.
+    seed : int, optional
+        Seed of the bootstrap.
+    max_workers : int, optional
+        Maximum number of threads analysing motions in parallel.
+    **params
+        Keyword arguments of the analysis class, e.g. `inverse`, `height`,
+        `vs_slope`, `vs_base`, `damp_ratio`, `soil_model` and `ref_strain`.
+        `scale_factor` and `target_pga` are set by the PGA levels.
+
+    Returns
+    -------
+    FragilityCurves
+        Displacements, exceedance fractions, fitted parameters and bootstrap
+        samples.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, a scaling parameter is given, or a PGA level
+        is not positive.
+    """
+    if method not in ANALYSIS_METHODS:
+        raise ValueError(
+            f"Unknown analysis method '{method}'. "
+            f"Must be one of {list(ANALYSIS_METHODS)}."
+        )
+    if {"scale_factor", "target_pga"} & set(params):
+        raise ValueError(
+            "Motions are scaled by `im`; do not pass scale_factor or target_pga"
+        )
+    im = np.sort(np.atleast_1d(np.asarray(im, dtype=float)))
+    if np.any(im <= 0):
+        raise ValueError("PGA levels must be positive")
+    limit_states = np.atleast_1d(np.asarray(limit_states, dtype=float))
+    if isinstance(motions, GroundMotionSuite):
+        motions = motions.motions
+    linear = method == "rigid" or (
+        method == "decoupled"
+        and params.get("soil_model", "linear_elastic") == "linear_elastic"
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(
+            pool.map(
+                lambda motion: _scaled_displacements(
+                    motion, ky, im, method, linear, params
+                ),
+                motions.values(),
+            )
+        )
+    displacement = np.array([result[0] for result in results])
+
+    # exceeded[m, k, l]: motion m exceeds limit state k at level l
+    exceeded = displacement[:, None, :] > limit_states[None, :, None]
+    n_motions = len(displacement)
+    median, beta = fit_lognormal_fragility(im, exceeded.sum(0), n_motions)
+
+    rng = np.random.default_rng(seed)
+    resamples = rng.integers(0, n_motions, size=(n_bootstrap, n_motions))
+    # counts[b, k, l]: exceedances of limit state k at level l in sample b
+    counts = exceeded[resamples].sum(1)
+    bootstrap_median, bootstrap_beta = fit_lognormal_fragility(
+        im, counts.transpose(1, 0, 2), n_motions
+    )
+
+    return FragilityCurves(
+        ky=ky,
+        method=method,
+        im=im,
+        limit_states=limit_states,
+        displacement=displacement,
+        exceedance_fraction=exceeded.mean(0),
+        median=median,
+        beta=beta,
+        bootstrap_median=bootstrap_median,
+        bootstrap_beta=bootstrap_beta,
+        confidence=confidence,
+        linear_scaling=linear,
+        analyses=sum(result[1] for result in results),
+        full_analyses=sum(result[2] for result in results),
+    )
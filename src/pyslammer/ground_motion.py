@@ -1,8 +1,15 @@
 import warnings
+from fractions import Fraction
+from functools import cached_property
+from typing import Iterator, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from numpy.typing import ArrayLike
 from scipy.fft import rfft, rfftfreq
+from scipy.integrate import cumulative_trapezoid
+from scipy.signal import cont2discrete, lfilter, resample_poly
+
+from .constants import G_EARTH
 
 # TODO: bring this into utilities.py
 
@@ -32,6 +39,10 @@ class GroundMotion:
         Peak ground acceleration in g.
     mean_period : float
         Mean period of the ground motion.
+    pgv : float
+        Peak ground velocity in m/s.
+    arias_intensity : float
+        Arias intensity in m/s.
     """
 
     def __init__(self, accel: ArrayLike, dt: float, name: str = "None"):
@@ -77,6 +88,142 @@ class GroundMotion:
 
             self.mean_period = sum(c**2 / freqs) / sum(c**2)
 
+    @classmethod
+    def _from_view(
+        cls, accel: np.ndarray, dt: float, name: str, pga: float, mean_period: float
+    ) -> "GroundMotion":
+        """
+        Build a GroundMotion around an existing array without copying it.
+
+        The input is assumed to come from an already validated `GroundMotion`,
+        so validation and the FFT for the mean period are skipped. The caller is
+        responsible for keeping the underlying buffer alive.
+
+        Parameters
+        ----------
+        accel : np.ndarray
+            Acceleration record in g (used as-is, not copied).
+        dt : float
+            Time step of the record (s).
+        name : str
+            Name of the record.
+        pga : float
+            Peak ground acceleration in g.
+        mean_period : float
+            Mean period of the ground motion.
+
+        Returns
+        -------
+        GroundMotion
+            Ground motion whose `accel` attribute is `accel`.
+        """
+        gm = cls.__new__(cls)
+        gm.accel = accel
+        gm.dt = dt
+        gm.name = name
+        gm._npts = len(accel)
+        gm.pga = pga
+        gm.mean_period = mean_period
+        return gm
+
+    def resample(self, dt: float, max_denominator: int = 100) -> "GroundMotion":
+        """
+        Resample the record to a different time step.
+
+        The record is resampled by a rational factor with a polyphase FIR
+        filter (`scipy.signal.resample_poly`). When the time step increases,
+        the filter removes the content above the new Nyquist frequency before
+        decimating, so it is not aliased into the resampled record. The
+        filter is zero-phase, so peaks stay aligned in time, but it does lower
+        the PGA of records with strong high-frequency content.
+
+        Cost of every analysis method is proportional to the number of
+        points, so decimating an oversampled record speeds up analyses
+        proportionally. See `pyslammer.resampling_guidance` for an estimate
+        of the displacement error this introduces.
+
+        Parameters
+        ----------
+        dt : float
+            Target time step (s).
+        max_denominator : int, optional
+            Largest denominator of the resampling factor. The factor
+            ``dt / self.dt`` is approximated by a fraction with at most this
+            denominator, so the time step of the result may differ slightly
+            from `dt` when the factor is irrational. Default is 100.
+
+        Returns
+        -------
+        GroundMotion
+            Resampled record with the same name.
+
+        Raises
+        ------
+        ValueError
+            If `dt` is not positive.
+        """
+        if dt <= 0:
+            raise ValueError(f"Time step dt must be positive, got {dt}")
+        ratio = Fraction(dt / self.dt).limit_denominator(max_denominator)
+        down, up = ratio.numerator, ratio.denominator
+        if down == 0:
+            raise ValueError(
+                f"Time step dt={dt} is too small to resample a record with "
+                f"dt={self.dt} (max_denominator={max_denominator})"
+            )
+        if down == up:
+            return GroundMotion(self.accel, self.dt, self.name)
+        accel = resample_poly(self.accel, up, down)
+        return GroundMotion(accel, self.dt * down / up, self.name)
+
+    @cached_property
+    def pgv(self) -> float:
+        """Peak ground velocity in m/s, from the trapezoidal velocity record."""
+        velocity = cumulative_trapezoid(self.accel * G_EARTH, dx=self.dt)
+        return float(np.max(np.abs(velocity), initial=0.0))
+
+    @cached_property
+    def arias_intensity(self) -> float:
+        """Arias intensity in m/s."""
+        accel = self.accel * G_EARTH
+        return float(np.pi / (2 * G_EARTH) * np.trapezoid(accel**2, dx=self.dt))
+
+    def spectral_acceleration(self, period, damping: float = 0.05) -> np.ndarray:
+        """
+        Pseudo-spectral acceleration of the record.
+
+        The response of each linear oscillator is computed exactly for the
+        piecewise linear record, with a first-order-hold discretization of
+        the equation of motion applied as a recursive filter.
+
+        Parameters
+        ----------
+        period : float or array_like
+            Natural periods of the oscillators (s). A period of zero returns
+            the PGA.
+        damping : float, optional
+            Damping ratio. Default is 0.05.
+
+        Returns
+        -------
+        numpy.ndarray
+            Pseudo-spectral accelerations in g, with the shape of `period`.
+        """
+        period = np.asarray(period, dtype=float)
+        sa = np.empty(period.shape)
+        for i, t in np.ndenumerate(period):
+            if t <= 0:
+                sa[i] = self.pga
+                continue
+            omega = 2 * np.pi / t
+            # Relative displacement of the oscillator per unit ground acceleration
+            num, den, _ = cont2discrete(
+                ([-1.0], [1.0, 2 * damping * omega, omega**2]), self.dt, method="foh"
+            )
+            disp = lfilter(np.ravel(num), den, self.accel)
+            sa[i] = omega**2 * np.max(np.abs(disp))
+        return sa
+
     def __str__(self):
         """
         String representation of the GroundMotion object.
@@ -104,3 +251,65 @@ class GroundMotion:
             and self.dt == other.dt
             and self.name == other.name
         )
+
+
+class GroundMotionSuite:
+    """
+    Suite of ground motions with weights.
+
+    The weights are typically hazard weights of the motions, e.g. rates of
+    occurrence or probabilities from a hazard deaggregation. They are used as
+    given, without normalization.
+
+    Parameters
+    ----------
+    motions : mapping of str to GroundMotion
+        Ground motions by name.
+    weights : mapping of str to float or sequence of float, optional
+        Weight of each motion, by name or in the order of `motions`. Defaults
+        to equal weights that sum to one.
+
+    Attributes
+    ----------
+    motions : dict of str to GroundMotion
+        Ground motions by name.
+    weights : numpy.ndarray
+        Weight of each motion, in the order of `motions`.
+    """
+
+    def __init__(
+        self,
+        motions: Mapping[str, GroundMotion],
+        weights: Optional[Union[Mapping[str, float], Sequence[float]]] = None,
+    ):
+        self.motions = dict(motions)
+        if not self.motions:
+            raise ValueError("A ground motion suite needs at least one motion")
+        if weights is None:
+            weights = np.full(len(self.motions), 1 / len(self.motions))
+        elif isinstance(weights, Mapping):
+            missing = set(self.motions) - set(weights)
+            if missing:
+                raise ValueError(f"Missing weights for motions: {sorted(missing)}")
+            weights = [weights[name] for name in self.motions]
+        self.weights = np.asarray(weights, dtype=float)
+        if self.weights.shape != (len(self.motions),):
+            raise ValueError(
+                f"Expected {len(self.motions)} weights, got {self.weights.size}"
+            )
+        if np.any(self.weights < 0) or not np.all(np.isfinite(self.weights)):
+            raise ValueError("Weights must be finite and non-negative")
+
+    def __len__(self) -> int:
+        return len(self.motions)
+
+    def __iter__(self) -> Iterator[Tuple[str, GroundMotion, float]]:
+        """Iterate over (name, motion, weight) tuples."""
+        for (name, motion), weight in zip(self.motions.items(), self.weights):
+            yield name, motion, float(weight)
+
+    def __repr__(self):
+        return (
+            f"GroundMotionSuite({len(self)} motions, "
+            f"total weight {self.weights.sum():g})"
+        )
@@ -0,0 +1,308 @@
+"""
+Probabilistic sliding displacement hazard.
+
+`displacement_hazard` combines a weighted `GroundMotionSuite`, a distribution of
+the yield acceleration and a set of scale levels into a displacement hazard
+curve: the weighted rate (or probability) of exceeding each of a set of
+displacement levels,
+
+    lambda(D > d) = sum_i sum_s sum_j w_i * w_s * p_j * [D(i, s, ky_j) > d],
+
+where ``w_i`` are the motion weights, ``w_s`` the scale weights and ``p_j`` the
+probabilities of the ky values. The unit of work is one motion at one scale
+level, for which the displacements at all ky values are computed together (for
+the decoupled method, with a single dynamic response; see
+`hea_sliding_displacement`). Units run in a pool of workers in chunks,
+and the displacements of each chunk are folded into weighted histograms over
+the displacement levels and discarded, so memory does not grow with the size of
+the suite.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import (
+    ANALYSIS_METHODS,
+    DisplacementFunction,
+    SharedGroundMotion,
+    SharedMotionExecutor,
+)
+from .ground_motion import GroundMotionSuite
+
+__all__ = [
+    "DisplacementHazard",
+    "discretize_ky",
+    "displacement_hazard",
+]
+
+# Displacement levels of the hazard curve unless others are given: 0.1 mm to
+# 10 m, 20 per decade.
+_DEFAULT_LEVELS = np.geomspace(1e-4, 10.0, 101)
+
+
+def discretize_ky(distribution, points: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Discretize a yield acceleration distribution into equally likely values.
+
+    Parameters
+    ----------
+    distribution : scipy.stats frozen distribution
+        Distribution of ky (g), e.g. ``scipy.stats.lognorm(0.3, scale=0.15)``.
+        Any object with a `ppf` method works.
+    points : int, optional
+        Number of values. Default is 20.
+
+    Returns
+    -------
+    ky, weights : numpy.ndarray
+        Quantiles at the probabilities ``(k + 0.5) / points`` and their equal
+        probabilities.
+    """
+    if points < 1:
+        raise ValueError(f"points must be positive, got {points}")
+    ky = np.asarray(distribution.ppf((np.arange(points) + 0.5) / points), dtype=float)
+    return ky, np.full(points, 1 / points)
+
+
+@dataclass
+class DisplacementHazard:
+    """
+    Displacement hazard curve of a ground motion suite.
+
+    Attributes
+    ----------
+    displacement : numpy.ndarray
+        Displacement levels (m), in increasing order.
+    exceedance : numpy.ndarray
+        Weighted rate or probability of exceeding each displacement level.
+    exceedance_by_ky : numpy.ndarray
+        Exceedance for each ky value (rows) and displacement level (columns),
+        i.e. the hazard curve conditional on ky.
+    ky : numpy.ndarray
+        Yield acceleration values (g).
+    ky_weights : numpy.ndarray
+        Probabilities of the ky values.
+    scale_levels : numpy.ndarray
+        Scale factors or target PGAs of the motions.
+    scale_weights : numpy.ndarray
+        Weights of the scale levels.
+    total_weight : float
+        Sum of the weights of all combinations of motion and scale level, i.e.
+        the exceedance of a displacement of zero by a sliding block.
+    analyses : int
+        Number of displacements computed.
+    full_analyses : int
+        Number of complete analyses run.
+    """
+
+    displacement: np.ndarray
+    exceedance: np.ndarray
+    exceedance_by_ky: np.ndarray
+    ky: np.ndarray
+    ky_weights: np.ndarray
+    scale_levels: np.ndarray
+    scale_weights: np.ndarray
+    total_weight: float
+    analyses: int
+    full_analyses: int
+
+    def exceedance_at(self, displacement) -> np.ndarray:
+        """
+        Interpolate the exceedance at the given displacements.
+
+        Parameters
+        ----------
+        displacement : float or array_like
+            Displacements (m) within the range of the displacement levels.
+
+        Returns
+        -------
+        numpy.ndarray
+            Exceedance, interpolated linearly in log(displacement).
+        """
+        return np.interp(
+            np.log(displacement), np.log(self.displacement), self.exceedance
+        )
+
+
+def _unit_displacements(
+    motion, method: str, kys: np.ndarray, params: Dict[str, Any]
+) -> Tuple[np.ndarray, int]:
+    """Displacements of one motion at one scale level, for every ky."""
+    if isinstance(motion, SharedGroundMotion):
+        motion = motion.to_ground_motion()
+    displacement = DisplacementFunction(method, motion, params)
+    disps = np.array([displacement(ky) for ky in kys])
+    return disps, displacement.full_analyses
+
+
+def _chunks(iterator: Iterator, size: int) -> Iterator[list]:
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def displacement_hazard(
+    suite: GroundMotionSuite,
+    ky,
+    scale_levels: Sequence[float] = (1.0,),
+    method: str = "rigid",
+    ky_weights: Optional[Sequence[float]] = None,
+    ky_points: int = 20,
+    scale_weights: Optional[Sequence[float]] = None,
+    scale_type: str = "scale_factor",
+    displacements: Optional[Sequence[float]] = None,
+    chunk_size: int = 64,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    **params,
+) -> DisplacementHazard:
+    """
+    Compute the displacement hazard curve of a weighted ground motion suite.
+
+    Parameters
+    ----------
+    suite : GroundMotionSuite
+        Ground motions and their hazard weights.
+    ky : float, array_like or scipy.stats frozen distribution
+        Yield acceleration values (g), or a distribution that is discretized
+        into `ky_points` equally likely values with `discretize_ky`.
+    scale_levels : sequence of float, optional
+        Scale levels applied to every motion. Default is the unscaled motions.
+    method : str, optional
+        Analysis method: "rigid" (default), "decoupled" or "coupled".
+    ky_weights : sequence of float, optional
+        Weights of the ky values, normalized to probabilities. Defaults to equal
+        probabilities. Ignored for a distribution.
+    ky_points : int, optional
+        Number of values a ky distribution is discretized into. Default is 20.
+    scale_weights : sequence of float, optional
+        Weights of the scale levels, used as given (e.g. probabilities or
+        rates of the levels). Defaults to equal weights that sum to one.
+    scale_type : str, optional
+        Whether the scale levels are "scale_factor" (default) or "target_pga"
+        values.
+    displacements : sequence of float, optional
+        Displacement levels (m) of the hazard curve. Defaults to 101 levels
+        from 0.1 mm to 10 m.
+    chunk_size : int, optional
+        Number of (motion, scale level) units run between accumulations.
+        Default is 64.
+    executor : str, optional
+        "thread" (default) or "process". With processes, the motions are
+        published into shared memory once (see `SharedMotionExecutor`).
+    max_workers : int, optional
+        Maximum number of workers. Defaults to the number of CPUs.
+    **params
+        Keyword arguments of the analysis class, e.g. `inverse`, `height`,
+        `vs_slope`, `vs_base`, `damp_ratio`.
+
+    Returns
+    -------
+    DisplacementHazard
+        Hazard curve and the conditional curves for each ky value.
+
+    Raises
+    ------
+    ValueError
+        If the method, scale type or executor is unknown, or a weight vector
+        does not match its values.
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"executor must be 'process' or 'thread', got {executor!r}"
+        )
+    if scale_type not in ("scale_factor", "target_pga"):
+        raise ValueError(
+            f"scale_type must be 'scale_factor' or 'target_pga', got {scale_type!r}"
+        )
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if method not in ANALYSIS_METHODS:
+        raise ValueError(
+            f"Unknown analysis method '{method}'. "
+            f"Must be one of {list(ANALYSIS_METHODS)}."
+        )
+
+    if hasattr(ky, "ppf"):
+        kys, ky_weights = discretize_ky(ky, ky_points)
+    else:
+        kys = np.atleast_1d(np.asarray(ky, dtype=float))
+        ky_weights = (
+            np.ones(len(kys)) if ky_weights is None else np.asarray(ky_weights, float)
+        )
+        if ky_weights.shape != kys.shape or np.any(ky_weights < 0):
+            raise ValueError("ky_weights must be non-negative, one per ky value")
+        ky_weights = ky_weights / ky_weights.sum()
+    scale_levels = np.atleast_1d(np.asarray(scale_levels, dtype=float))
+    scale_weights = (
+        np.full(len(scale_levels), 1 / len(scale_levels))
+        if scale_weights is None
+        else np.asarray(scale_weights, dtype=float)
+    )
+    if scale_weights.shape != scale_levels.shape or np.any(scale_weights < 0):
+        raise ValueError("scale_weights must be non-negative, one per scale level")
+    levels = np.sort(
+        _DEFAULT_LEVELS if displacements is None else np.asarray(displacements, float)
+    )
+
+    n_ky, n_levels = len(kys), len(levels)
+    # histogram[j, k]: weight of the displacements at ky j that exceed exactly k
+    # of the levels
+    histogram = np.zeros(n_ky * (n_levels + 1))
+    offsets = (np.arange(n_ky) * (n_levels + 1))[None, :]
+    analyses = full_analyses = 0
+
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        pool = SharedMotionExecutor(max_workers=max_workers)
+    with pool:
+
+        def units():
+            for _, motion, weight in suite:
+                if executor == "process":
+                    motion = pool.share(motion)
+                for level, level_weight in zip(scale_levels, scale_weights):
+                    unit_params = {**params, scale_type: float(level)}
+                    yield motion, unit_params, weight * level_weight
+
+        for chunk in _chunks(units(), chunk_size):
+            motions, unit_params, weights = zip(*chunk)
+            results = list(
+                pool.map(
+                    _unit_displacements,
+                    motions,
+                    [method] * len(chunk),
+                    [kys] * len(chunk),
+                    unit_params,
+                )
+            )
+            disps = np.array([result[0] for result in results])
+            full_analyses += sum(result[1] for result in results)
+            analyses += disps.size
+            exceeded = np.searchsorted(levels, disps, side="left")
+            histogram += np.bincount(
+                (exceeded + offsets).ravel(),
+                weights=np.repeat(np.asarray(weights), n_ky),
+                minlength=histogram.size,
+            )
+
+    histogram = histogram.reshape(n_ky, n_levels + 1)
+    # Weight of the displacements exceeding level k: those exceeding more than k
+    exceedance_by_ky = np.cumsum(histogram[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    return DisplacementHazard(
+        displacement=levels,
+        exceedance=ky_weights @ exceedance_by_ky,
+        exceedance_by_ky=exceedance_by_ky,
+        ky=kys,
+        ky_weights=ky_weights,
+        scale_levels=scale_levels,
+        scale_weights=scale_weights,
+        total_weight=float(suite.weights.sum() * scale_weights.sum()),
+        analyses=analyses,
+        full_analyses=full_analyses,
+    )
@@ -0,0 +1,503 @@
+"""
+Sliding displacement as a function of the yield acceleration.
+
+Design work often needs the yield acceleration at which the displacement of a
+slope crosses a threshold, e.g. 5, 15 or 100 cm. `ky_sweep` traces the
+displacement-versus-ky curve of one ground motion adaptively: because the
+displacement decreases monotonically with ky, the curve only needs to be
+refined where it changes rapidly and around the requested thresholds, which
+takes far fewer analyses than a uniform grid of the same resolution.
+
+`critical_ky` answers the inverse question for a single displacement: the
+yield acceleration at which the displacement of a motion equals a target, found
+by a safeguarded root search. `critical_ky_batch` solves it for every motion of
+a suite in parallel.
+
+Both reuse the dynamic response of the slope between analyses of the decoupled
+method, since it does not depend on ky (see `hea_sliding_displacement`).
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .batch import DisplacementFunction
+from .ground_motion import GroundMotion
+
+__all__ = [
+    "DEFAULT_THRESHOLDS",
+    "CriticalKy",
+    "KySweep",
+    "critical_ky",
+    "critical_ky_batch",
+    "ky_sweep",
+]
+
+# Displacement thresholds of 5, 15 and 100 cm, in meters.
+DEFAULT_THRESHOLDS = (0.05, 0.15, 1.0)
+
+
+def _interpolate_ky(ky0, ky1, disp0, disp1, target, floor):
+    """ky at which the displacement crosses `target` between two evaluations."""
+    # The curve is close to linear in log(displacement) versus ky.
+    log0, log1 = np.log(disp0 + floor), np.log(disp1 + floor)
+    if log0 == log1:
+        return ky0
+    fraction = (log0 - np.log(target + floor)) / (log0 - log1)
+    return ky0 + fraction * (ky1 - ky0)
+
+
+def _invert(kys, disps, targets, floor):
+    """ky at which a monotonic displacement curve crosses each target."""
+    # Small non-monotonic wiggles (e.g. from the flexible methods) are removed
+    # so that each target is crossed once.
+    disps = np.minimum.accumulate(disps)
+    result = np.full(len(targets), np.nan)
+    for j, target in enumerate(targets):
+        above = np.flatnonzero(disps >= target)
+        if len(above) == 0 or above[-1] == len(kys) - 1:
+            continue
+        i = above[-1]
+        result[j] = _interpolate_ky(
+            kys[i], kys[i + 1], disps[i], disps[i + 1], target, floor
+        )
+    return result
+
+
+@dataclass
+class KySweep:
+    """
+    Displacement-versus-ky curve of a ground motion.
+
+    Attributes
+    ----------
+    method : str
+        Analysis method.
+    ky : numpy.ndarray
+        Yield accelerations (g) at which the displacement was computed, in
+        increasing order.
+    displacement : numpy.ndarray
+        Maximum sliding displacement (m) at each ky.
+    thresholds : numpy.ndarray
+        Displacement thresholds (m).
+    ky_at_threshold : numpy.ndarray
+        Yield acceleration (g) at which the displacement crosses each
+        threshold, interpolated to within the sweep's `ky_rtol`. NaN if the
+        threshold is not crossed within the swept range of ky.
+    analyses : int
+        Number of displacements computed.
+    min_displacement : float
+        Displacement (m) below which the curve is considered flat.
+    full_analyses : int
+        Number of complete analyses run. Smaller than `analyses` for the
+        decoupled method, whose dynamic response is computed once.
+    """
+
+    method: str
+    ky: np.ndarray
+    displacement: np.ndarray
+    thresholds: np.ndarray
+    ky_at_threshold: np.ndarray
+    analyses: int
+    min_displacement: float
+    full_analyses: int = 0
+
+    def displacement_at(self, ky) -> np.ndarray:
+        """
+        Interpolate the displacement at the given yield accelerations.
+
+        The displacement is interpolated linearly in log space between the
+        computed points.
+
+        Parameters
+        ----------
+        ky : float or array_like
+            Yield accelerations (g) within the swept range.
+
+        Returns
+        -------
+        numpy.ndarray
+            Displacements (m).
+        """
+        floor = self.min_displacement
+        log_disp = np.log(np.minimum.accumulate(self.displacement) + floor)
+        return np.maximum(np.exp(np.interp(ky, self.ky, log_disp)) - floor, 0.0)
+
+    def ky_for(self, displacement) -> np.ndarray:
+        """
+        Yield accelerations at which the curve crosses the given displacements.
+
+        Only as accurate as the refinement of the curve near each
+        displacement; use the sweep's `thresholds` for refined values.
+
+        Parameters
+        ----------
+        displacement : float or array_like
+            Displacements (m).
+
+        Returns
+        -------
+        numpy.ndarray
+            Yield accelerations (g), NaN outside the swept range.
+        """
+        return _invert(
+            self.ky,
+            self.displacement,
+            np.atleast_1d(displacement),
+            self.min_displacement,
+        )
+
+
+def ky_sweep(
+    ground_motion: GroundMotion,
+    method: str = "rigid",
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    ky_min: float = 0.01,
+    ky_max: Optional[float] = None,
+    ky_rtol: float = 0.01,
+    max_log_step: float = 0.5,
+    min_displacement: float = 1e-4,
+    initial_points: int = 9,
+    max_analyses: int = 200,
+    **params,
+) -> KySweep:
+    """
+    Trace the displacement-versus-ky curve of a ground motion adaptively.
+
+    The curve is first evaluated on a geometric grid of `initial_points` values
+    of ky. Intervals of the grid are then bisected (geometrically) in rounds:
+    intervals that bracket a threshold are bisected until they are narrower
+    than `ky_rtol`, and intervals over which the displacement changes by more
+    than `max_log_step` (in natural log units) are bisected until they are
+    narrower than `ky_rtol` too. The thresholds are inverted by interpolating
+    log(displacement) linearly in ky within their final intervals.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Ground motion to analyse.
+    method : str, optional
+        Analysis method: "rigid" (default), "decoupled" or "coupled".
+    thresholds : sequence of float, optional
+        Displacement thresholds (m). Default is 5, 15 and 100 cm.
+    ky_min : float, optional
+        Smallest yield acceleration (g) of the sweep. Default is 0.01.
+    ky_max : float, optional
+        Largest yield acceleration (g) of the sweep. Defaults to the PGA of the
+        scaled input for the rigid method, above which the rigid block does not
+        slide. For the flexible methods, the PGA is doubled until the
+        displacement is below `min_displacement`, up to eight times the PGA.
+    ky_rtol : float, optional
+        Relative width of the ky intervals at which refinement stops. Default
+        is 0.01.
+    max_log_step : float, optional
+        Largest change of log(displacement + `min_displacement`) across an
+        interval before it is refined. Default is 0.5.
+    min_displacement : float, optional
+        Displacement (m) added before taking logs, so that negligible
+        displacements do not drive the refinement. Default is 1e-4.
+    initial_points : int, optional
+        Number of points of the initial grid. Default is 9.
+    max_analyses : int, optional
+        Largest number of analyses to run. Default is 200.
+    **params
+        Keyword arguments of the analysis class, e.g. `target_pga`, `inverse`,
+        `height`, `vs_slope`, `vs_base` and `damp_ratio`.
+
+    Returns
+    -------
+    KySweep
+        The computed curve and the yield accelerations at the thresholds.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown or the ky range is empty.
+    """
+    displacement = DisplacementFunction(method, ground_motion, params)
+    return _sweep(
+        displacement,
+        thresholds,
+        ky_min,
+        ky_max,
+        ky_rtol,
+        max_log_step,
+        min_displacement,
+        initial_points,
+        max_analyses,
+    )
+
+
+def _sweep(
+    displacement: DisplacementFunction,
+    thresholds,
+    ky_min,
+    ky_max,
+    ky_rtol,
+    max_log_step,
+    min_displacement,
+    initial_points,
+    max_analyses,
+) -> KySweep:
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    if ky_max is None:
+        ky_max = displacement.upper_bound(min_displacement)
+    if not 0 < ky_min < ky_max:
+        raise ValueError(
+            f"Expected 0 < ky_min < ky_max, got ky_min={ky_min}, ky_max={ky_max}"
+        )
+    for ky in np.geomspace(ky_min, ky_max, max(initial_points, 2)):
+        displacement(ky)
+
+    floor = min_displacement
+    while displacement.analyses < max_analyses:
+        kys, disps = displacement.curve()
+        log_disps = np.log(np.minimum.accumulate(disps) + floor)
+        wide = kys[1:] > kys[:-1] * (1 + ky_rtol)
+        steep = np.abs(np.diff(log_disps)) > max_log_step
+        brackets = np.zeros(len(wide), dtype=bool)
+        for target in thresholds:
+            crossed = np.flatnonzero(np.diff(np.sign(np.exp(log_disps) - floor - target)))
+            brackets[crossed] = True
+        refine = np.flatnonzero(wide & (steep | brackets))
+        if len(refine) == 0:
+            break
+        budget = max_analyses - displacement.analyses
+        for i in refine[:budget]:
+            displacement(np.sqrt(kys[i] * kys[i + 1]))
+
+    kys, disps = displacement.curve()
+    return KySweep(
+        method=displacement.method,
+        ky=kys,
+        displacement=disps,
+        thresholds=thresholds,
+        ky_at_threshold=_invert(kys, disps, thresholds, floor),
+        analyses=displacement.analyses,
+        min_displacement=floor,
+        full_analyses=displacement.full_analyses,
+    )
+
+
+@dataclass
+class CriticalKy:
+    """
+    Yield acceleration at which the displacement of a motion equals a target.
+
+    Attributes
+    ----------
+    target : float
+        Target displacement (m).
+    ky : float
+        Yield acceleration (g) at which the displacement equals the target,
+        interpolated within the final bracket. NaN if the target is not
+        bracketed.
+    ky_lower, ky_upper : float
+        Final bracket of ky (g): the displacement is at least the target at
+        `ky_lower` and below it at `ky_upper`, so `ky_upper` is a conservative
+        value that keeps the displacement under the target. `ky_upper` is NaN
+        if the displacement exceeds the target over the whole search range;
+        `ky_lower` is NaN if it is below the target over the whole range.
+    displacement_lower, displacement_upper : float
+        Displacements (m) at the ends of the bracket.
+    converged : bool
+        Whether the bracket is narrower than the requested tolerance.
+    analyses : int
+        Number of displacements computed.
+    full_analyses : int
+        Number of complete analyses run. Smaller than `analyses` for the
+        decoupled method, whose dynamic response is computed once.
+    method : str
+        Analysis method.
+    """
+
+    target: float
+    ky: float
+    ky_lower: float
+    ky_upper: float
+    displacement_lower: float
+    displacement_upper: float
+    converged: bool
+    analyses: int
+    full_analyses: int
+    method: str
+
+
+def critical_ky(
+    ground_motion: GroundMotion,
+    target: float,
+    method: str = "rigid",
+    ky_min: float = 0.001,
+    ky_max: Optional[float] = None,
+    ky_rtol: float = 1e-3,
+    min_displacement: float = 1e-4,
+    max_analyses: int = 50,
+    **params,
+) -> CriticalKy:
+    """
+    Find the yield acceleration at which the displacement equals a target.
+
+    The displacement decreases monotonically with ky, so the root is bracketed
+    between `ky_min` and `ky_max` and the bracket is narrowed by regula falsi
+    on log(displacement + `min_displacement`) versus ky. Whenever a step fails
+    to halve the bracket, the next step bisects it geometrically instead, so
+    the search converges at least as fast as bisection.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Ground motion to analyse.
+    target : float
+        Target displacement (m), e.g. 0.05 for 5 cm.
+    method : str, optional
+        Analysis method: "rigid" (default), "decoupled" or "coupled".
+    ky_min : float, optional
+        Smallest yield acceleration (g) of the search. Default is 0.001.
+    ky_max : float, optional
+        Largest yield acceleration (g) of the search. Defaults to the PGA of
+        the scaled input for the rigid method and to the ky at which the block
+        stops sliding for the flexible methods (see `ky_sweep`).
+    ky_rtol : float, optional
+        Relative width of the bracket at which the search stops. Default is
+        1e-3.
+    min_displacement : float, optional
+        Displacement (m) added before taking logs. Default is 1e-4.
+    max_analyses : int, optional
+        Largest number of displacements to compute. Default is 50.
+    **params
+        Keyword arguments of the analysis class, e.g. `target_pga`, `inverse`,
+        `height`, `vs_slope`, `vs_base` and `damp_ratio`.
+
+    Returns
+    -------
+    CriticalKy
+        The critical yield acceleration, its bracket and the cost of the search.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, the target is not positive or the ky range
+        is empty.
+    """
+    if target <= 0:
+        raise ValueError(f"target must be positive, got {target}")
+    displacement = DisplacementFunction(method, ground_motion, params)
+    if ky_max is None:
+        ky_max = displacement.upper_bound(min_displacement)
+    if not 0 < ky_min < ky_max:
+        raise ValueError(
+            f"Expected 0 < ky_min < ky_max, got ky_min={ky_min}, ky_max={ky_max}"
+        )
+
+    floor = min_displacement
+    lo, hi = ky_min, ky_max
+    disp_lo, disp_hi = displacement(lo), displacement(hi)
+    if disp_lo < target or disp_hi >= target:
+        if disp_lo < target:
+            # Even the smallest ky keeps the displacement under the target.
+            hi, disp_hi = lo, disp_lo
+            lo = disp_lo = math.nan
+        else:
+            hi = disp_hi = math.nan
+        return CriticalKy(
+            target,
+            math.nan,
+            lo,
+            hi,
+            disp_lo,
+            disp_hi,
+            False,
+            displacement.analyses,
+            displacement.full_analyses,
+            method,
+        )
+
+    log_target = math.log(target + floor)
+    bisect = False
+    while hi > lo * (1 + ky_rtol) and displacement.analyses < max_analyses:
+        width = hi - lo
+        if bisect:
+            ky = math.sqrt(lo * hi)
+        else:
+            ky = _interpolate_ky(lo, hi, disp_lo, disp_hi, target, floor)
+            # Stay strictly inside the bracket.
+            ky = min(max(ky, lo + 1e-3 * width), hi - 1e-3 * width)
+        disp = displacement(ky)
+        if math.log(disp + floor) >= log_target:
+            lo, disp_lo = ky, disp
+        else:
+            hi, disp_hi = ky, disp
+        bisect = hi - lo > 0.5 * width
+
+    return CriticalKy(
+        target,
+        float(_interpolate_ky(lo, hi, disp_lo, disp_hi, target, floor)),
+        lo,
+        hi,
+        disp_lo,
+        disp_hi,
+        hi <= lo * (1 + ky_rtol),
+        displacement.analyses,
+        displacement.full_analyses,
+        method,
+    )
+
+
+def _critical_ky_star(args):
+    ground_motion, target, method, kwargs = args
+    return critical_ky(ground_motion, target, method, **kwargs)
+
+
+def critical_ky_batch(
+    motions: Mapping[str, GroundMotion],
+    target: float,
+    method: str = "rigid",
+    max_workers: Optional[int] = None,
+    executor: str = "thread",
+    **kwargs,
+) -> Dict[str, CriticalKy]:
+    """
+    Find the critical yield acceleration of every motion of a suite.
+
+    The searches of the motions are independent and run in a pool of workers.
+    Threads run in parallel when the kernels are compiled with numba (see
+    `pyslammer._kernels.HAS_NUMBA`); processes always do.
+
+    Parameters
+    ----------
+    motions : mapping of str to GroundMotion
+        Ground motions by name.
+    target : float
+        Target displacement (m).
+    method : str, optional
+        Analysis method. Default is "rigid".
+    max_workers : int, optional
+        Maximum number of workers. Defaults to the number of CPUs.
+    executor : str, optional
+        "thread" (default) or "process".
+    **kwargs
+        Keyword arguments of `critical_ky`, including those of the analysis
+        class.
+
+    Returns
+    -------
+    dict of str to CriticalKy
+        Result for each motion, in the order of `motions`.
+
+    Raises
+    ------
+    ValueError
+        If `executor` is not "process" or "thread".
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"executor must be 'process' or 'thread', got {executor!r}"
+        )
+    pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    jobs = [(motion, target, method, kwargs) for motion in motions.values()]
+    with pool_class(max_workers=max_workers) as pool:
+        results = list(pool.map(_critical_ky_star, jobs))
+    return dict(zip(motions, results))
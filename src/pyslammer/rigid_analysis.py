@@ -2,11 +2,18 @@ from typing import Optional
 
 import numpy as np
 
+from ._kernels import rigid_sliding, rigid_sliding_exact
 from .constants import G_EARTH
 from .ground_motion import GroundMotion
 from .sliding_block_analysis import SlidingBlockAnalysis
 
 
+_INTEGRATORS = {
+    "trapezoidal": rigid_sliding,
+    "exact": rigid_sliding_exact,
+}
+
+
 class RigidAnalysis(SlidingBlockAnalysis):
     """
     Rigid Block Analysis.
@@ -22,11 +29,18 @@ class RigidAnalysis(SlidingBlockAnalysis):
     target_pga : float, optional
         Target peak ground acceleration (in g). If provided, the input acceleration
         will be scaled to match this value. Cannot be used with `scale_factor`.
+    integration : str, optional
+        Time integration of the sliding block: "trapezoidal" (default) updates
+        the block with the trapezoidal rule at each sample; "exact" integrates
+        exactly between samples for a ground acceleration that is linear
+        between samples (see `pyslammer._kernels.rigid_sliding_exact`). The
+        exact integration keeps its accuracy at coarser time steps.
 
     Raises
     ------
     ValueError
-        If both `target_pga` and `scale_factor` are provided.
+        If both `target_pga` and `scale_factor` are provided, or if
+        `integration` is unknown.
 
     Attributes
     ----------
@@ -45,6 +59,7 @@ class RigidAnalysis(SlidingBlockAnalysis):
         scale_factor: float = 1.0,
         target_pga: Optional[float] = None,
         inverse: bool = False,
+        integration: str = "trapezoidal",
     ) -> None:
         """
         Initialize rigid block analysis.
@@ -63,8 +78,16 @@ class RigidAnalysis(SlidingBlockAnalysis):
         inverse : bool, optional
             If True, inverts the direction of the ground motion by negating the scale factor.
             Default is False.
+        integration : str, optional
+            "trapezoidal" (default) or "exact".
         """
+        if integration not in _INTEGRATORS:
+            raise ValueError(
+                f"Unknown integration '{integration}'. "
+                f"Must be one of {list(_INTEGRATORS)}."
+            )
         super().__init__(ky, ground_motion, scale_factor, target_pga, inverse)
+        self.integration = integration
 
         self._ground_acc_ = (
             np.array(self.a_in) * G_EARTH
@@ -94,37 +117,21 @@ class RigidAnalysis(SlidingBlockAnalysis):
         Notes
         -----
         This method iteratively calculates the block's acceleration, velocity, and displacement
-        based on the input ground acceleration and critical acceleration.
+        based on the input ground acceleration and critical acceleration. The time stepping
+        is done by `pyslammer._kernels.rigid_sliding`, which is compiled when numba is installed,
+        or by `pyslammer._kernels.rigid_sliding_exact` for ``integration="exact"``.
         """
-        tol = 1e-5
         self._block_acc_ = np.zeros(len(self._ground_acc_))
         self.sliding_vel = np.zeros(len(self._ground_acc_))
         self.sliding_disp = np.zeros(len(self._ground_acc_))
-        # [previous, current]
-        acc = [0, 0]
-        vel = [0, 0]
-        pos = [0, 0]
-
-        for i in range(len(self._ground_acc_)):
-            gnd_acc_curr = self._ground_acc_[i]
-            if vel[1] < tol:
-                if abs(gnd_acc_curr) > self._ky_:
-                    n = gnd_acc_curr / abs(gnd_acc_curr)
-                else:
-                    n = gnd_acc_curr / self._ky_
-            else:
-                n = 1
-            acc[1] = gnd_acc_curr - n * self._ky_
-            vel[1] = vel[0] + (self.dt / 2) * (acc[1] + acc[0])
-            if vel[1] > 0:
-                pos[1] = pos[0] + (self.dt / 2) * (vel[1] + vel[0])
-            else:
-                vel[1] = 0
-                acc[1] = 0
-            pos[0] = pos[1]
-            vel[0] = vel[1]
-            acc[0] = acc[1]
-            self.sliding_disp[i] = pos[1]
-            self.sliding_vel[i] = vel[1]
-            self._block_acc_[i] = gnd_acc_curr - acc[1]
+        with self._phase("sliding"):
+            _INTEGRATORS[self.integration](
+                self._ground_acc_,
+                self._ky_,
+                self.dt,
+                self._block_acc_,
+                self.sliding_vel,
+                self.sliding_disp,
+            )
         self.max_sliding_disp = self.sliding_disp[-1]
+        self._finish_instrumentation(self.sliding_disp)
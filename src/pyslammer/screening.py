@@ -0,0 +1,468 @@
+"""
+Empirical sliding displacement models and batch screening.
+
+The regression models of Jibson (2007), Bray and Travasarou (2007) and Saygili
+and Rathje (2008) predict the displacement of a sliding block from the ratio of
+the yield acceleration to the PGA and other intensity measures of the input.
+They are vectorized over arrays of ky and intensity measures, and return a
+lognormal `DisplacementPrediction` in meters.
+
+`DisplacementScreen` uses a model as a prefilter of `run_batch`: tasks whose
+predicted probability of exceeding a decision threshold is clearly low or
+clearly high are answered by the model, and time histories are only run for
+tasks near the threshold.
+
+References
+----------
+Jibson, R. W. (2007). Regression models for estimating coseismic landslide
+displacement. Engineering Geology, 91(2-4), 209-218.
+
+Bray, J. D., and Travasarou, T. (2007). Simplified procedure for estimating
+earthquake-induced deviatoric slope displacements. Journal of Geotechnical and
+Geoenvironmental Engineering, 133(4), 381-392.
+
+Saygili, G., and Rathje, E. M. (2008). Empirical predictive models for
+earthquake-induced sliding displacements of slopes. Journal of Geotechnical and
+Geoenvironmental Engineering, 134(6), 790-803.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.stats import norm
+
+from .batch import AnalysisTask
+from .constants import M_TO_CM
+from .ground_motion import GroundMotion
+
+__all__ = [
+    "DISPLACEMENT_MODELS",
+    "DisplacementPrediction",
+    "DisplacementScreen",
+    "bray_travasarou_2007",
+    "jibson_2007",
+    "saygili_rathje_2008",
+]
+
+# Coefficients of the Jibson (2007) models: log10(D [cm]) and its standard
+# deviation. Ratio exponents are those of (1 - r) and r, with r = ky / PGA.
+_JIBSON_2007 = {
+    "pga": {"c0": 0.215, "a": 2.341, "b": -1.438, "sigma": 0.510},
+    "pga_magnitude": {
+        "c0": -2.710,
+        "a": 2.335,
+        "b": -1.478,
+        "m": 0.424,
+        "sigma": 0.454,
+    },
+    "arias": {"c0": -3.230, "ia": 2.401, "ky": -3.481, "sigma": 0.656},
+    "arias_ratio": {"c0": -1.474, "ia": 0.561, "b": -3.833, "sigma": 0.616},
+}
+
+# Coefficients of the Saygili and Rathje (2008) models: ln(D [cm]) as a quartic
+# in r = ky / PGA plus terms in ln(PGA [g]), ln(PGV [cm/s]) and ln(Ia [m/s]).
+# The standard deviation is sigma0 + sigma1 * r.
+_SAYGILI_RATHJE_2008 = {
+    "pga": {
+        "c": (5.52, -4.43, -20.39, 42.61, -28.74),
+        "pga": 0.72,
+        "sigma": (1.13, 0.0),
+    },
+    "pga_pgv": {
+        "c": (-1.56, -4.58, -20.84, 44.75, -30.50),
+        "pga": -0.64,
+        "pgv": 1.55,
+        "sigma": (0.405, 0.524),
+    },
+    "pga_pgv_arias": {
+        "c": (-0.74, -4.93, -19.91, 43.75, -30.12),
+        "pga": -1.30,
+        "pgv": 1.04,
+        "ia": 0.67,
+        "sigma": (0.20, 0.79),
+    },
+}
+
+
+@dataclass
+class DisplacementPrediction:
+    """
+    Lognormal prediction of the sliding displacement.
+
+    The displacement is zero with probability `p_zero`, and otherwise lognormal
+    with median `median` and logarithmic standard deviation `sigma`.
+
+    Attributes
+    ----------
+    median : numpy.ndarray
+        Median displacement (m) when the block slides. Zero where ky is at
+        least the PGA for the models based on ky / PGA.
+    sigma : numpy.ndarray
+        Standard deviation of the natural logarithm of the displacement.
+    p_zero : numpy.ndarray
+        Probability of a negligible displacement.
+    """
+
+    median: np.ndarray
+    sigma: np.ndarray
+    p_zero: np.ndarray
+
+    def exceedance(self, displacement) -> np.ndarray:
+        """
+        Probability of exceeding a displacement.
+
+        Parameters
+        ----------
+        displacement : float or array_like
+            Displacement (m), broadcast against the prediction.
+
+        Returns
+        -------
+        numpy.ndarray
+            Exceedance probabilities.
+        """
+        with np.errstate(divide="ignore"):
+            z = (np.log(displacement) - np.log(self.median)) / self.sigma
+        return (1 - self.p_zero) * norm.sf(z)
+
+
+def _ratio(ky, pga) -> np.ndarray:
+    """ky / PGA, capped at one."""
+    return np.minimum(np.asarray(ky, dtype=float) / np.asarray(pga, dtype=float), 1.0)
+
+
+def jibson_2007(
+    ky,
+    pga,
+    arias_intensity=None,
+    magnitude=None,
+    model: str = "pga",
+) -> DisplacementPrediction:
+    """
+    Jibson (2007) rigid block displacement models.
+
+    Parameters
+    ----------
+    ky : float or array_like
+        Yield acceleration (g).
+    pga : float or array_like
+        Peak ground acceleration (g).
+    arias_intensity : float or array_like, optional
+        Arias intensity (m/s). Required by the "arias" and "arias_ratio"
+        models.
+    magnitude : float or array_like, optional
+        Moment magnitude. Required by the "pga_magnitude" model.
+    model : str, optional
+        "pga" (ky / PGA, default), "pga_magnitude" (ky / PGA and magnitude),
+        "arias" (Arias intensity and ky) or "arias_ratio" (Arias intensity and
+        ky / PGA).
+
+    Returns
+    -------
+    DisplacementPrediction
+        Broadcast over the inputs. The median is zero where ky >= PGA.
+
+    Raises
+    ------
+    ValueError
+        If the model is unknown or an input it requires is missing.
+    """
+    if model not in _JIBSON_2007:
+        raise ValueError(f"model must be one of {list(_JIBSON_2007)}, got {model!r}")
+    coef = _JIBSON_2007[model]
+    r = _ratio(ky, pga)
+    with np.errstate(divide="ignore"):
+        if model in ("pga", "pga_magnitude"):
+            log_d = coef["c0"] + coef["a"] * np.log10(1 - r) + coef["b"] * np.log10(r)
+            if model == "pga_magnitude":
+                if magnitude is None:
+                    raise ValueError("The pga_magnitude model requires magnitude")
+                log_d = log_d + coef["m"] * np.asarray(magnitude, dtype=float)
+        else:
+            if arias_intensity is None:
+                raise ValueError(f"The {model} model requires arias_intensity")
+            log_ia = np.log10(np.asarray(arias_intensity, dtype=float))
+            if model == "arias":
+                log_ky = np.log10(np.asarray(ky, dtype=float))
+                log_d = coef["c0"] + coef["ia"] * log_ia + coef["ky"] * log_ky
+            else:
+                log_d = coef["c0"] + coef["ia"] * log_ia + coef["b"] * np.log10(r)
+    median = np.where(r < 1, 10.0**log_d / M_TO_CM, 0.0)
+    return DisplacementPrediction(
+        median=median,
+        sigma=np.full(median.shape, coef["sigma"] * np.log(10)),
+        p_zero=np.zeros(median.shape),
+    )
+
+
+def bray_travasarou_2007(ky, sa, period, magnitude) -> DisplacementPrediction:
+    """
+    Bray and Travasarou (2007) flexible sliding mass displacement model.
+
+    Parameters
+    ----------
+    ky : float or array_like
+        Yield acceleration (g).
+    sa : float or array_like
+        Spectral acceleration of the input at 1.5 times the period of the
+        sliding mass (g), e.g. ``ground_motion.spectral_acceleration(1.5 *
+        period)``. The PGA for a rigid mass.
+    period : float or array_like
+        Initial fundamental period of the sliding mass (s), e.g. ``4 * height /
+        vs_slope``. Zero for a rigid mass.
+    magnitude : float or array_like
+        Moment magnitude.
+
+    Returns
+    -------
+    DisplacementPrediction
+        Broadcast over the inputs. `p_zero` is the probability of a
+        displacement below 1 cm.
+    """
+    ln_ky = np.log(np.asarray(ky, dtype=float))
+    ln_sa = np.log(np.asarray(sa, dtype=float))
+    period = np.asarray(period, dtype=float)
+    magnitude = np.asarray(magnitude, dtype=float)
+    # Periods below 0.05 s use the rigid constant and no period term.
+    flexible = period >= 0.05
+    ln_d = (
+        np.where(flexible, -1.10 + 1.50 * period, -0.22)
+        - 2.83 * ln_ky
+        - 0.333 * ln_ky**2
+        + 0.566 * ln_ky * ln_sa
+        + 3.04 * ln_sa
+        - 0.244 * ln_sa**2
+        + 0.278 * (magnitude - 7)
+    )
+    p_zero = 1 - norm.cdf(-1.76 - 3.22 * ln_ky - 0.484 * period * ln_ky + 3.52 * ln_sa)
+    median = np.exp(ln_d) / M_TO_CM
+    return DisplacementPrediction(
+        median=median, sigma=np.full(median.shape, 0.66), p_zero=p_zero
+    )
+
+
+def saygili_rathje_2008(
+    ky, pga, pgv=None, arias_intensity=None, model: str = "pga_pgv"
+) -> DisplacementPrediction:
+    """
+    Saygili and Rathje (2008) rigid block displacement models.
+
+    Parameters
+    ----------
+    ky : float or array_like
+        Yield acceleration (g).
+    pga : float or array_like
+        Peak ground acceleration (g).
+    pgv : float or array_like, optional
+        Peak ground velocity (m/s). Required by the "pga_pgv" and
+        "pga_pgv_arias" models.
+    arias_intensity : float or array_like, optional
+        Arias intensity (m/s). Required by the "pga_pgv_arias" model.
+    model : str, optional
+        "pga", "pga_pgv" (default) or "pga_pgv_arias".
+
+    Returns
+    -------
+    DisplacementPrediction
+        Broadcast over the inputs. The median is zero where ky >= PGA.
+
+    Raises
+    ------
+    ValueError
+        If the model is unknown or an input it requires is missing.
+    """
+    if model not in _SAYGILI_RATHJE_2008:
+        raise ValueError(
+            f"model must be one of {list(_SAYGILI_RATHJE_2008)}, got {model!r}"
+        )
+    coef = _SAYGILI_RATHJE_2008[model]
+    r = _ratio(ky, pga)
+    pga = np.asarray(pga, dtype=float)
+    ln_d = np.polynomial.polynomial.polyval(r, coef["c"]) + coef["pga"] * np.log(pga)
+    if "pgv" in coef:
+        if pgv is None:
+            raise ValueError(f"The {model} model requires pgv")
+        ln_d = ln_d + coef["pgv"] * np.log(np.asarray(pgv, dtype=float) * M_TO_CM)
+    if "ia" in coef:
+        if arias_intensity is None:
+            raise ValueError(f"The {model} model requires arias_intensity")
+        ln_d = ln_d + coef["ia"] * np.log(np.asarray(arias_intensity, dtype=float))
+    median = np.where(r < 1, np.exp(ln_d) / M_TO_CM, 0.0)
+    sigma0, sigma1 = coef["sigma"]
+    return DisplacementPrediction(
+        median=median,
+        sigma=np.broadcast_to(sigma0 + sigma1 * r, median.shape).copy(),
+        p_zero=np.zeros(median.shape),
+    )
+
+
+DISPLACEMENT_MODELS = {
+    "jibson_2007": jibson_2007,
+    "bray_travasarou_2007": bray_travasarou_2007,
+    "saygili_rathje_2008": saygili_rathje_2008,
+}
+
+
+class DisplacementScreen:
+    """
+    Prefilter of `run_batch` based on an empirical displacement model.
+
+    For each task, the model predicts the probability that the displacement
+    exceeds `threshold` from the ky of the task and the intensity measures of
+    its scaled motion. Tasks with a probability below ``band[0]`` or above
+    ``band[1]`` are screened: their record holds the predicted median
+    displacement instead of running the analysis. The other tasks run as
+    usual. Records of a screened batch have an extra "screened" field.
+
+    Parameters
+    ----------
+    threshold : float
+        Decision threshold of the displacement (m).
+    model : str, optional
+        One of `DISPLACEMENT_MODELS`. Default is "saygili_rathje_2008".
+    variant : str, optional
+        Variant of the model, i.e. the `model` argument of `jibson_2007` or
+        `saygili_rathje_2008`. Defaults to the default of the function.
+    band : tuple of float, optional
+        Range of exceedance probabilities for which the analysis is run.
+        Default is (0.05, 0.95).
+    magnitude : float or mapping of str to float, optional
+        Moment magnitude, or magnitude of each motion by key. Required by
+        "bray_travasarou_2007" and the magnitude variant of "jibson_2007".
+
+    Notes
+    -----
+    The rigid block models only see the input motion, so they do not account
+    for the amplification of flexible sliding masses; use
+    "bray_travasarou_2007" (with `height` and `vs_slope` in the task
+    parameters) to screen decoupled and coupled analyses.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        model: str = "saygili_rathje_2008",
+        variant: Optional[str] = None,
+        band: Tuple[float, float] = (0.05, 0.95),
+        magnitude: Optional[Union[float, Mapping[str, float]]] = None,
+    ):
+        if model not in DISPLACEMENT_MODELS:
+            raise ValueError(
+                f"model must be one of {list(DISPLACEMENT_MODELS)}, got {model!r}"
+            )
+        if variant is not None and model == "bray_travasarou_2007":
+            raise ValueError("bray_travasarou_2007 has no variant")
+        if not 0 <= band[0] <= band[1] <= 1:
+            raise ValueError(f"band must satisfy 0 <= low <= high <= 1, got {band}")
+        if threshold <= 0:
+            raise ValueError(f"threshold must be positive, got {threshold}")
+        self.threshold = threshold
+        self.model = model
+        self.band = band
+        self.magnitude = magnitude
+        self.options = {} if variant is None else {"model": variant}
+
+    def _magnitudes(self, tasks: Sequence[AnalysisTask]) -> Optional[np.ndarray]:
+        if self.magnitude is None:
+            return None
+        if isinstance(self.magnitude, Mapping):
+            return np.array([self.magnitude[task.motion] for task in tasks], float)
+        return np.full(len(tasks), float(self.magnitude))
+
+    def predict(
+        self, tasks: Sequence[AnalysisTask], motions: Mapping[str, GroundMotion]
+    ) -> DisplacementPrediction:
+        """
+        Predict the displacements of tasks.
+
+        Parameters
+        ----------
+        tasks : sequence of AnalysisTask
+            Tasks to predict.
+        motions : mapping of str to GroundMotion
+            Ground motions referenced by the tasks.
+
+        Returns
+        -------
+        DisplacementPrediction
+            One prediction per task.
+        """
+        ground_motions = [motions[task.motion] for task in tasks]
+        scale = np.array(
+            [task.scale(gm) for task, gm in zip(tasks, ground_motions)]
+        )
+        ky = np.array([task.ky for task in tasks], dtype=float)
+        pga = scale * np.array([gm.pga for gm in ground_motions])
+        magnitude = self._magnitudes(tasks)
+        if self.model == "bray_travasarou_2007":
+            if magnitude is None:
+                raise ValueError("bray_travasarou_2007 requires magnitude")
+            period = np.array(
+                [
+                    4 * task.params["height"] / task.params["vs_slope"]
+                    if task.method != "rigid"
+                    else 0.0
+                    for task in tasks
+                ]
+            )
+            sa = scale * np.array(
+                [
+                    gm.spectral_acceleration(1.5 * t)
+                    for gm, t in zip(ground_motions, period)
+                ]
+            )
+            return bray_travasarou_2007(ky, sa, period, magnitude)
+        # Arias intensity grows with the square of the scale factor.
+        arias = scale**2 * np.array([gm.arias_intensity for gm in ground_motions])
+        if self.model == "jibson_2007":
+            return jibson_2007(
+                ky, pga, arias_intensity=arias, magnitude=magnitude, **self.options
+            )
+        pgv = scale * np.array([gm.pgv for gm in ground_motions])
+        return saygili_rathje_2008(
+            ky, pga, pgv=pgv, arias_intensity=arias, **self.options
+        )
+
+    def __call__(
+        self, tasks: Sequence[AnalysisTask], motions: Mapping[str, GroundMotion]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Screen a chunk of tasks.
+
+        Parameters
+        ----------
+        tasks : sequence of AnalysisTask
+            Tasks to screen.
+        motions : mapping of str to GroundMotion
+            Ground motions referenced by the tasks.
+
+        Returns
+        -------
+        list of dict or None
+            For each task, the record of a screened task, or None if the
+            analysis must run.
+        """
+        if not tasks:
+            return []
+        prediction = self.predict(tasks, motions)
+        probability = prediction.exceedance(self.threshold)
+        low, high = self.band
+        records = []
+        for i, task in enumerate(tasks):
+            if low <= probability[i] <= high:
+                records.append(None)
+                continue
+            scale = float(task.scale(motions[task.motion]))
+            records.append(
+                {
+                    "task_id": task.task_id,
+                    "method": task.method,
+                    "motion": task.motion,
+                    "ky": task.ky,
+                    "scale_factor": -scale if task.params.get("inverse") else scale,
+                    "max_sliding_disp": float(prediction.median[i]),
+                    "screened": True,
+                }
+            )
+        return records
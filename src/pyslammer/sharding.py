@@ -0,0 +1,355 @@
+"""
+Sharded batch execution across independent worker processes or machines.
+
+A sweep is described by a deterministic task manifest, a JSON file listing
+every task with the fingerprint of its ground motion. Each worker runs one
+shard of the manifest with `run_shard` and streams its records to its own
+results directory. `merge_shards` then combines the shard results into one
+table and checks that every task in the manifest was completed exactly once.
+
+Workers can be started from the command line with the ``pyslammer-shard``
+script (see `pyslammer.sharding_cli`)::
+
+    pyslammer-shard run manifest.json --shard 0 --num-shards 4 \\
+        --motions motions/ --output results/
+    pyslammer-shard merge manifest.json --input results/ --output merged/
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from .batch import AnalysisTask, run_batch
+from .batch_io import open_result_writer, read_results
+from .ground_motion import GroundMotion
+from .utilities import csv_time_hist, sample_ground_motions
+
+__all__ = [
+    "motion_fingerprint",
+    "build_manifest",
+    "write_manifest",
+    "load_manifest",
+    "shard_tasks",
+    "load_motions",
+    "run_shard",
+    "merge_shards",
+]
+
+MANIFEST_VERSION = 1
+
+
+def motion_fingerprint(ground_motion: GroundMotion) -> str:
+    """
+    Compute a content fingerprint of a ground motion.
+
+    The fingerprint depends only on the time step and the acceleration values,
+    not on the name of the record.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Ground motion to fingerprint.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.float64(ground_motion.dt).tobytes())
+    accel = np.ascontiguousarray(ground_motion.accel, dtype=np.float64)
+    digest.update(accel.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def build_manifest(
+    tasks: Iterable[AnalysisTask], motions: Mapping[str, GroundMotion]
+) -> Dict[str, Any]:
+    """
+    Build a deterministic manifest of tasks.
+
+    Tasks are de-duplicated by `AnalysisTask.task_id` and sorted by it, so the
+    same set of tasks always gives the same manifest regardless of order.
+
+    Parameters
+    ----------
+    tasks : iterable of AnalysisTask
+        Tasks of the sweep.
+    motions : mapping of str to GroundMotion
+        Ground motions referenced by the tasks.
+
+    Returns
+    -------
+    dict
+        Manifest with the motion fingerprints and the sorted task list.
+
+    Raises
+    ------
+    KeyError
+        If a task references a motion that is not in `motions`.
+    """
+    entries = {}
+    for task in tasks:
+        entries[task.task_id] = {
+            "task_id": task.task_id,
+            "method": task.method,
+            "motion": task.motion,
+            "ky": float(task.ky),
+            "params": task.params,
+        }
+    missing = {entry["motion"] for entry in entries.values()} - set(motions)
+    if missing:
+        raise KeyError(f"Tasks reference unknown motions: {sorted(missing)}")
+    used = sorted({entry["motion"] for entry in entries.values()})
+    return {
+        "version": MANIFEST_VERSION,
+        "motions": {key: motion_fingerprint(motions[key]) for key in used},
+        "tasks": [entries[task_id] for task_id in sorted(entries)],
+    }
+
+
+def write_manifest(manifest: Dict[str, Any], path: Union[str, Path]) -> Path:
+    """
+    Write a manifest to a JSON file.
+
+    Parameters
+    ----------
+    manifest : dict
+        Manifest from `build_manifest`.
+    path : str or Path
+        Output file.
+
+    Returns
+    -------
+    Path
+        Path of the written file.
+    """
+    path = Path(path)
+    path.write_text(json.dumps(manifest, sort_keys=True, indent=1) + "\n")
+    return path
+
+
+def load_manifest(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a manifest written by `write_manifest`.
+
+    Parameters
+    ----------
+    path : str or Path
+        Manifest file.
+
+    Returns
+    -------
+    dict
+        The manifest.
+
+    Raises
+    ------
+    ValueError
+        If the manifest version is not supported.
+    """
+    manifest = json.loads(Path(path).read_text())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported manifest version {manifest.get('version')!r}, "
+            f"expected {MANIFEST_VERSION}"
+        )
+    return manifest
+
+
+def shard_tasks(
+    manifest: Dict[str, Any], shard: int, num_shards: int
+) -> List[AnalysisTask]:
+    """
+    Select the tasks of one shard.
+
+    Tasks are assigned round-robin in manifest order, so shards differ in size
+    by at most one task and together cover the manifest exactly once.
+
+    Parameters
+    ----------
+    manifest : dict
+        Manifest from `build_manifest` or `load_manifest`.
+    shard : int
+        Index of the shard, from 0 to `num_shards` - 1.
+    num_shards : int
+        Total number of shards.
+
+    Returns
+    -------
+    list of AnalysisTask
+        Tasks of the shard.
+
+    Raises
+    ------
+    ValueError
+        If `shard` is not in the range [0, `num_shards`).
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"shard must be in [0, {num_shards}), got {shard}")
+    return [
+        AnalysisTask(entry["method"], entry["motion"], entry["ky"], entry["params"])
+        for entry in manifest["tasks"][shard::num_shards]
+    ]
+
+
+def load_motions(
+    directory: Optional[Union[str, Path]] = None,
+) -> Dict[str, GroundMotion]:
+    """
+    Load all ground motion CSV files in a directory.
+
+    Parameters
+    ----------
+    directory : str or Path, optional
+        Directory of CSV files readable by `csv_time_hist`. Defaults to the
+        sample ground motions.
+
+    Returns
+    -------
+    dict of str to GroundMotion
+        Ground motions keyed by file name without extension.
+    """
+    if directory is None:
+        return sample_ground_motions()
+    return {
+        path.stem: GroundMotion(*csv_time_hist(str(path)), path.stem)
+        for path in sorted(Path(directory).glob("*.csv"))
+    }
+
+
+def _shard_dir(output: Union[str, Path], shard: int, num_shards: int) -> Path:
+    return Path(output) / f"shard-{shard:04d}-of-{num_shards:04d}"
+
+
+def run_shard(
+    manifest: Union[Dict[str, Any], str, Path],
+    shard: int,
+    num_shards: int,
+    motions: Mapping[str, GroundMotion],
+    output: Union[str, Path],
+    **kwargs,
+) -> Path:
+    """
+    Run one shard of a manifest and stream its results to disk.
+
+    Results are written to ``<output>/shard-<shard>-of-<num_shards>``. The run
+    resumes if the shard directory already holds completed tasks.
+
+    Parameters
+    ----------
+    manifest : dict, str or Path
+        Manifest or path to a manifest file.
+    shard : int
+        Index of the shard to run.
+    num_shards : int
+        Total number of shards.
+    motions : mapping of str to GroundMotion
+        Ground motions referenced by the manifest.
+    output : str or Path
+        Root directory for shard results, shared by all workers.
+    **kwargs
+        Additional keyword arguments for `run_batch`, e.g. `max_workers` or
+        `executor`.
+
+    Returns
+    -------
+    Path
+        Results directory of the shard.
+
+    Raises
+    ------
+    KeyError
+        If a motion of the shard is not in `motions`.
+    ValueError
+        If a motion does not match the fingerprint in the manifest.
+    """
+    if not isinstance(manifest, dict):
+        manifest = load_manifest(manifest)
+    tasks = shard_tasks(manifest, shard, num_shards)
+    for key in sorted({task.motion for task in tasks}):
+        if key not in motions:
+            raise KeyError(f"Motion '{key}' of shard {shard} was not provided")
+        if motion_fingerprint(motions[key]) != manifest["motions"][key]:
+            raise ValueError(
+                f"Motion '{key}' does not match its fingerprint in the manifest"
+            )
+    output = _shard_dir(output, shard, num_shards)
+    return run_batch(tasks, motions, output=output, resume=True, **kwargs)
+
+
+def merge_shards(
+    manifest: Union[Dict[str, Any], str, Path],
+    input: Union[str, Path],
+    output: Optional[Union[str, Path]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Merge shard results into one table and check its integrity.
+
+    Every task in the manifest must appear exactly once across the shard
+    directories in `input`, with the method, motion and ky recorded in the
+    manifest.
+
+    Parameters
+    ----------
+    manifest : dict, str or Path
+        Manifest or path to a manifest file.
+    input : str or Path
+        Root directory holding the shard results.
+    output : str or Path, optional
+        Directory to write the merged table to (see `open_result_writer`). It
+        must not already contain results.
+
+    Returns
+    -------
+    dict of str to numpy.ndarray
+        Merged columns, in manifest order.
+
+    Raises
+    ------
+    ValueError
+        If tasks are missing, duplicated, not in the manifest, or do not match
+        their manifest entry, or if `output` is a non-empty directory.
+    """
+    if output is not None and Path(output).is_dir() and any(Path(output).iterdir()):
+        raise ValueError(f"Output directory {output} is not empty")
+    if not isinstance(manifest, dict):
+        manifest = load_manifest(manifest)
+    shards = [read_results(path) for path in sorted(Path(input).glob("shard-*"))]
+    shards = [columns for columns in shards if columns]
+    if not shards:
+        raise ValueError(f"No shard results found in {input}")
+    merged = {
+        key: np.concatenate([columns[key] for columns in shards]) for key in shards[0]
+    }
+
+    task_ids = merged["task_id"]
+    position = {entry["task_id"]: i for i, entry in enumerate(manifest["tasks"])}
+    unique, counts = np.unique(task_ids, return_counts=True)
+    problems = []
+    duplicated = unique[counts > 1]
+    if len(duplicated):
+        problems.append(f"{len(duplicated)} duplicated tasks")
+    unexpected = [task_id for task_id in unique if task_id not in position]
+    if unexpected:
+        problems.append(f"{len(unexpected)} tasks not in the manifest")
+    missing = len(position) - (len(unique) - len(unexpected))
+    if missing:
+        problems.append(f"{missing} missing tasks")
+    if problems:
+        raise ValueError("Shard results are inconsistent: " + ", ".join(problems))
+
+    order = np.argsort([position[task_id] for task_id in task_ids], kind="stable")
+    merged = {key: values[order] for key, values in merged.items()}
+    entries = manifest["tasks"]
+    for key in ("method", "motion", "ky"):
+        expected = np.asarray([entry[key] for entry in entries])
+        if not np.array_equal(merged[key], expected):
+            raise ValueError(f"Shard results do not match the manifest in '{key}'")
+
+    if output is not None:
+        open_result_writer(output).write_columns(merged)
+    return merged
@@ -0,0 +1,69 @@
+"""
+Command line interface for sharded batch execution.
+
+Installed as the ``pyslammer-shard`` script and also runnable as
+``python -m pyslammer.sharding_cli``::
+
+    pyslammer-shard run manifest.json --shard 0 --num-shards 4 \\
+        --motions motions/ --output results/
+    pyslammer-shard merge manifest.json --input results/ --output merged/
+"""
+
+import argparse
+from typing import List, Optional
+
+from .sharding import load_motions, merge_shards, run_shard
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the sharding command line interface.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments. Defaults to ``sys.argv[1:]``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pyslammer-shard",
+        description="Run or merge shards of a pySLAMMER task manifest.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run one shard of a manifest")
+    run.add_argument("manifest", help="path to the task manifest")
+    run.add_argument("--shard", type=int, required=True, help="shard index")
+    run.add_argument("--num-shards", type=int, required=True, help="number of shards")
+    run.add_argument(
+        "--motions", help="directory of ground motion CSV files (default: samples)"
+    )
+    run.add_argument("--output", required=True, help="root directory for results")
+    run.add_argument("--max-workers", type=int, help="workers per shard")
+    run.add_argument(
+        "--executor", choices=["process", "thread"], default="process"
+    )
+
+    merge = commands.add_parser("merge", help="merge and check shard results")
+    merge.add_argument("manifest", help="path to the task manifest")
+    merge.add_argument("--input", required=True, help="root directory of results")
+    merge.add_argument("--output", required=True, help="directory for merged results")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        path = run_shard(
+            args.manifest,
+            args.shard,
+            args.num_shards,
+            load_motions(args.motions),
+            args.output,
+            max_workers=args.max_workers,
+            executor=args.executor,
+        )
+        print(f"Shard {args.shard} of {args.num_shards} written to {path}")
+    else:
+        merged = merge_shards(args.manifest, args.input, args.output)
+        print(f"Merged {len(merged['task_id'])} results into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
-from typing import Union
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -8,6 +12,75 @@ from .constants import G_EARTH
 from .ground_motion import GroundMotion
 from .utilities import psfigstyle
 
+__all__ = ["SlidingBlockAnalysis", "instrumented"]
+
+# (callback, memory) of the innermost active `instrumented` block
+_INSTRUMENTATION = ContextVar("pyslammer_instrumentation", default=None)
+
+# Shared no-op context for phases of uninstrumented analyses
+_NO_PHASE = nullcontext()
+
+
+@contextmanager
+def instrumented(
+    callback: Optional[Callable[["SlidingBlockAnalysis"], None]] = None,
+    memory: bool = False,
+):
+    """
+    Record phase timers and statistics of the analyses created in a block.
+
+    Analyses created inside the block fill their `timings` and `stats`
+    attributes while they run. Outside of it, both attributes are None and no
+    timing is done. The setting applies to the current thread or task only, so
+    it does not reach the workers of `run_batch`.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with each analysis once it has finished, e.g. to forward
+        ``analysis.timings`` and ``analysis.stats`` to a metrics system.
+    memory : bool, optional
+        Also record memory use in `stats`: "peak_bytes", the peak memory
+        allocated while the analysis ran, "retained_bytes", the memory held by
+        its arrays afterwards, and "retained_bytes_by_attribute" (see
+        `SlidingBlockAnalysis.memory_usage`). Allocations are traced with
+        `tracemalloc`, which slows analyses down several times and counts
+        allocations of the whole process, so analyses should run one at a
+        time. Default is False.
+
+    Examples
+    --------
+    >>> with instrumented(lambda a: print(a.timings["total"])):
+    ...     Coupled(0.1, motion, 50.0, 600.0, 600.0, 0.05)  # doctest: +SKIP
+    """
+    start_tracing = memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    token = _INSTRUMENTATION.set((callback, memory))
+    try:
+        yield
+    finally:
+        _INSTRUMENTATION.reset(token)
+        if start_tracing:
+            tracemalloc.stop()
+
+
+class _Phase:
+    """Context manager adding its elapsed time to a timings entry."""
+
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + elapsed
+
 
 class SlidingBlockAnalysis:
     """
@@ -78,6 +151,16 @@ class SlidingBlockAnalysis:
         Maximum sliding displacement (in m).
     _npts : int or None
         Number of points in the input acceleration time series.
+    timings : dict or None
+        Wall-clock seconds per phase of the analysis, if it was created inside
+        an `instrumented` block: "setup" (input processing and allocation),
+        "equivalent_linear" (iterations to strain-compatible properties),
+        "dynamic_response" (final response sweep), "sliding" (sliding block
+        time stepping) and "total". Phases that do not apply to a method are
+        absent.
+    stats : dict or None
+        Statistics of an instrumented analysis: "npts", "sliding_episodes"
+        and, for flexible analyses, "equivalent_linear_iterations".
     """
 
     def __init__(
@@ -88,6 +171,18 @@ class SlidingBlockAnalysis:
         target_pga=None,
         inverse=False,
     ):
+        instrumentation = _INSTRUMENTATION.get()
+        if instrumentation is None:
+            self.timings = self.stats = None
+        else:
+            self.timings = {}
+            self.stats = {}
+            self._hook, self._trace_memory = instrumentation
+            if self._trace_memory:
+                self._memory_baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            self._created = time.perf_counter()
+
         # Convert dict to GroundMotion if needed
         if isinstance(ground_motion, dict):
             try:
@@ -160,6 +255,62 @@ class SlidingBlockAnalysis:
             and self.scale_factor == other.scale_factor
         )
 
+    def _phase(self, name: str):
+        """Context manager timing a phase of an instrumented analysis."""
+        if self.timings is None:
+            return _NO_PHASE
+        if "setup" not in self.timings:
+            self.timings["setup"] = time.perf_counter() - self._created
+        return _Phase(self.timings, name)
+
+    def _finish_instrumentation(self, displacement: np.ndarray):
+        """Complete the timings and stats and call the instrumentation hook."""
+        if self.timings is None:
+            return
+        self.timings["total"] = time.perf_counter() - self._created
+        moving = np.diff(displacement, prepend=0.0) != 0
+        self.stats["npts"] = len(displacement)
+        starts = np.count_nonzero(moving[1:] & ~moving[:-1]) + moving[0]
+        self.stats["sliding_episodes"] = int(starts)
+        if self._trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - self._memory_baseline
+            by_attribute = self.memory_usage()
+            self.stats["peak_bytes"] = max(peak, 0)
+            self.stats["retained_bytes"] = sum(by_attribute.values())
+            self.stats["retained_bytes_by_attribute"] = by_attribute
+        if self._hook is not None:
+            self._hook(self)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Bytes of array memory retained by each attribute of the analysis.
+
+        Only NumPy arrays are counted, including the acceleration array of the
+        referenced `ground_motion`. An attribute whose array shares its memory
+        with an attribute listed before it counts zero bytes, so the values add
+        up to the memory held through the analysis.
+
+        Returns
+        -------
+        dict of str to int
+            Bytes per attribute, largest first.
+        """
+        arrays = {
+            name: value
+            for name, value in vars(self).items()
+            if isinstance(value, np.ndarray)
+        }
+        arrays["ground_motion"] = self.ground_motion.accel
+        usage = {}
+        seen = set()
+        for name, array in arrays.items():
+            owner = array
+            while isinstance(owner.base, np.ndarray):
+                owner = owner.base
+            usage[name] = 0 if id(owner) in seen else array.nbytes
+            seen.add(id(owner))
+        return dict(sorted(usage.items(), key=lambda item: -item[1]))
+
     @staticmethod
     def _dict_to_ground_motion(gm_dict: dict) -> GroundMotion:
         """
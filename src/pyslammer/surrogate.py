@@ -0,0 +1,507 @@
+"""
+Surrogate model of the sliding displacement.
+
+`train_surrogate` fits a Gaussian process emulator of ``max_sliding_disp`` to
+the results of a batch of analyses, for use in loops that need far more
+evaluations than time histories allow (interactive design, optimization). The
+inputs of the emulator are the ratio of the yield acceleration to the PGA, the
+logarithms of intensity measures of the scaled motion (PGA, PGV, Arias
+intensity, mean period) and the numeric parameters of the analyses (e.g. the
+site parameters of flexible methods). The output is the logarithm of the
+displacement.
+
+The Gaussian process has a squared exponential kernel with one length scale per
+input, whose hyperparameters maximize the marginal likelihood. A share of the
+results is held out to report the validation error before the final fit to all
+results, or to a random subsample of them for large batches since the fit costs
+O(n^3) time and O(n^2) memory. Predictions outside the box of the training
+inputs, or more uncertain than a tolerance, fall back to full analyses.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from scipy.linalg import cho_solve, cholesky, solve_triangular
+from scipy.optimize import minimize
+from scipy.spatial.distance import cdist
+
+from .batch import AnalysisTask, run_batch
+from .ground_motion import GroundMotion
+
+__all__ = [
+    "DisplacementSurrogate",
+    "SurrogatePrediction",
+    "train_surrogate",
+]
+
+# Analysis parameters that are not inputs of the emulator: scaling enters
+# through the intensity measures, and the direction of the motion is not a
+# continuous input.
+_NON_FEATURE_PARAMS = ("scale_factor", "target_pga", "inverse")
+_MOTION_FEATURES = ("ky_ratio", "ln_pga", "ln_pgv", "ln_arias", "ln_mean_period")
+# Bounds of the log hyperparameters on standardized data.
+_LOG_LENGTH_BOUNDS = (np.log(1e-2), np.log(1e3))
+_LOG_SIGNAL_BOUNDS = (np.log(1e-2), np.log(1e2))
+_LOG_NOISE_BOUNDS = (np.log(1e-4), np.log(1.0))
+# Number of points predicted at once, bounding the cross-covariance matrix.
+_PREDICT_BLOCK = 1024
+
+
+def _features(
+    tasks: Sequence[AnalysisTask],
+    motions: Mapping[str, GroundMotion],
+    param_names: Sequence[str],
+) -> np.ndarray:
+    """Inputs of the emulator for each task, one row per task."""
+    rows = []
+    for task in tasks:
+        gm = motions[task.motion]
+        scale = task.scale(gm)
+        pga = scale * gm.pga
+        try:
+            params = [float(task.params[name]) for name in param_names]
+        except KeyError as e:
+            raise ValueError(f"Task {task.task_id} has no parameter {e}") from None
+        rows.append(
+            [
+                task.ky / pga,
+                np.log(pga),
+                np.log(scale * gm.pgv),
+                np.log(scale**2 * gm.arias_intensity),
+                np.log(gm.mean_period),
+                *params,
+            ]
+        )
+    return np.array(rows, dtype=float).reshape(len(rows), -1)
+
+
+def _kernel(a: np.ndarray, b: np.ndarray, lengths: np.ndarray, signal: float):
+    """Squared exponential kernel with one length scale per input."""
+    return signal**2 * np.exp(-0.5 * cdist(a / lengths, b / lengths, "sqeuclidean"))
+
+
+def _negative_log_likelihood(theta: np.ndarray, x: np.ndarray, y: np.ndarray):
+    """Negative log marginal likelihood and its gradient in the log parameters."""
+    n, d = x.shape
+    lengths, signal, noise = np.exp(theta[:d]), np.exp(theta[d]), np.exp(theta[d + 1])
+    k_signal = _kernel(x, x, lengths, signal)
+    k = k_signal + noise**2 * np.eye(n)
+    try:
+        factor = cholesky(k, lower=True)
+    except np.linalg.LinAlgError:
+        return np.inf, np.zeros_like(theta)
+    alpha = cho_solve((factor, True), y)
+    nll = 0.5 * y @ alpha + np.log(np.diag(factor)).sum() + 0.5 * n * np.log(2 * np.pi)
+    # d(nll)/d(theta) = -1/2 tr((alpha alpha^T - K^-1) dK/dtheta)
+    w = np.outer(alpha, alpha) - cho_solve((factor, True), np.eye(n))
+    grad = np.empty_like(theta)
+    for j in range(d):
+        sq = (x[:, j, None] - x[None, :, j]) ** 2 / lengths[j] ** 2
+        grad[j] = -0.5 * np.sum(w * k_signal * sq)
+    grad[d] = -np.sum(w * k_signal)
+    grad[d + 1] = -noise**2 * np.trace(w)
+    return nll, grad
+
+
+def _fit_hyperparameters(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Log hyperparameters maximizing the marginal likelihood."""
+    d = x.shape[1]
+    theta0 = np.concatenate([np.zeros(d), [0.0, np.log(0.1)]])
+    bounds = [_LOG_LENGTH_BOUNDS] * d + [_LOG_SIGNAL_BOUNDS, _LOG_NOISE_BOUNDS]
+    result = minimize(
+        _negative_log_likelihood,
+        theta0,
+        args=(x, y),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=bounds,
+    )
+    return result.x
+
+
+class _GaussianProcess:
+    """Gaussian process regression on standardized data with fixed hyperparameters."""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, theta: np.ndarray):
+        d = x.shape[1]
+        self.x = x
+        self.lengths = np.exp(theta[:d])
+        self.signal = np.exp(theta[d])
+        self.noise = np.exp(theta[d + 1])
+        k = _kernel(x, x, self.lengths, self.signal) + self.noise**2 * np.eye(len(x))
+        self.factor = cholesky(k, lower=True)
+        self.alpha = cho_solve((self.factor, True), y)
+
+    def predict(self, x: np.ndarray):
+        """Posterior mean and standard deviation of the latent function."""
+        mean = np.empty(len(x))
+        var = np.empty(len(x))
+        for start in range(0, len(x), _PREDICT_BLOCK):
+            block = slice(start, start + _PREDICT_BLOCK)
+            k_star = _kernel(self.x, x[block], self.lengths, self.signal)
+            mean[block] = k_star.T @ self.alpha
+            v = solve_triangular(self.factor, k_star, lower=True)
+            var[block] = self.signal**2 - np.sum(v**2, axis=0)
+        return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+@dataclass
+class SurrogatePrediction:
+    """
+    Displacements predicted by a surrogate, with fallback analyses.
+
+    Attributes
+    ----------
+    displacement : numpy.ndarray
+        Maximum sliding displacement (m) of each task, from the surrogate or,
+        where `analysed`, from a full analysis.
+    log_std : numpy.ndarray
+        Predictive standard deviation of the natural logarithm of the
+        displacement. Zero for analysed tasks.
+    in_domain : numpy.ndarray
+        Whether the inputs of each task are within the training domain.
+    analysed : numpy.ndarray
+        Whether each task fell back to a full analysis.
+    """
+
+    displacement: np.ndarray
+    log_std: np.ndarray
+    in_domain: np.ndarray
+    analysed: np.ndarray
+
+
+class DisplacementSurrogate:
+    """
+    Gaussian process emulator of the maximum sliding displacement.
+
+    Created by `train_surrogate`.
+
+    Attributes
+    ----------
+    method : str
+        Analysis method that generated the training results.
+    feature_names : list of str
+        Inputs of the emulator: "ky_ratio" (ky / PGA), the logarithms of the
+        PGA (g), PGV (m/s), Arias intensity (m/s) and mean period (s) of the
+        scaled motion, then the numeric analysis parameters.
+    lower, upper : numpy.ndarray
+        Bounds of each input over the training results.
+    min_displacement : float
+        Offset (m) of the logarithm of the displacement, so that zero
+        displacements can be emulated.
+    length_scales : numpy.ndarray
+        Fitted length scale of each input, in standard deviations of the
+        input. Large values mark inputs the displacement hardly depends on.
+    validation : dict of str to float
+        Errors on the held-out results, in natural log units of
+        ``displacement + min_displacement``: "rmse", "mae", "max_error",
+        "r2", and "n" the number of held-out results. "r2" is NaN when the
+        held-out results are all equal. Empty without a validation split.
+    n_train : int
+        Number of results of the final fit, at most the
+        `max_train_samples` of `train_surrogate`.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        param_names: List[str],
+        x: np.ndarray,
+        y: np.ndarray,
+        theta: np.ndarray,
+        min_displacement: float,
+        validation: Dict[str, float],
+    ):
+        self.method = method
+        self.feature_names = list(_MOTION_FEATURES) + list(param_names)
+        self._param_names = list(param_names)
+        self.lower = x.min(axis=0)
+        self.upper = x.max(axis=0)
+        self.min_displacement = min_displacement
+        self.validation = validation
+        self.n_train = len(x)
+        self._x_mean, self._x_std = x.mean(axis=0), _std(x)
+        self._y_mean, self._y_std = y.mean(), _std(y)
+        self._gp = _GaussianProcess(
+            (x - self._x_mean) / self._x_std, (y - self._y_mean) / self._y_std, theta
+        )
+        self.length_scales = self._gp.lengths
+
+    def features(
+        self, tasks: Sequence[AnalysisTask], motions: Mapping[str, GroundMotion]
+    ) -> np.ndarray:
+        """
+        Inputs of the emulator for tasks.
+
+        Parameters
+        ----------
+        tasks : sequence of AnalysisTask
+            Tasks of the training method.
+        motions : mapping of str to GroundMotion
+            Ground motions referenced by the tasks.
+
+        Returns
+        -------
+        numpy.ndarray
+            One row per task, one column per entry of `feature_names`.
+        """
+        return _features(tasks, motions, self._param_names)
+
+    def in_domain(
+        self, tasks: Sequence[AnalysisTask], motions: Mapping[str, GroundMotion]
+    ) -> np.ndarray:
+        """
+        Whether the inputs of tasks are within the training domain.
+
+        The domain is the box bounded by the smallest and largest value of
+        each input over the training results. Tasks of another method are
+        outside the domain.
+
+        Parameters
+        ----------
+        tasks : sequence of AnalysisTask
+            Tasks to check.
+        motions : mapping of str to GroundMotion
+            Ground motions referenced by the tasks.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask, one per task.
+        """
+        x = self.features(tasks, motions)
+        same_method = np.array([task.method == self.method for task in tasks])
+        inside = np.all((x >= self.lower) & (x <= self.upper), axis=1)
+        return same_method & inside
+
+    def _predict_features(self, x: np.ndarray):
+        mean, std = self._gp.predict((x - self._x_mean) / self._x_std)
+        log_disp = self._y_mean + self._y_std * mean
+        displacement = np.maximum(np.exp(log_disp) - self.min_displacement, 0.0)
+        return displacement, self._y_std * std
+
+    def predict(
+        self,
+        tasks: Sequence[AnalysisTask],
+        motions: Mapping[str, GroundMotion],
+        fallback: bool = True,
+        max_log_std: Optional[float] = None,
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+    ) -> SurrogatePrediction:
+        """
+        Predict the displacements of tasks.
+
+        Parameters
+        ----------
+        tasks : sequence of AnalysisTask
+            Tasks to predict.
+        motions : mapping of str to GroundMotion
+            Ground motions referenced by the tasks.
+        fallback : bool, optional
+            Run full analyses of the tasks outside the training domain, or
+            with a predictive standard deviation above `max_log_std`.
+            Default is True. Otherwise, every task is predicted by the
+            surrogate.
+        max_log_std : float, optional
+            Largest predictive standard deviation of the log displacement
+            accepted from the surrogate. By default, only the domain is
+            checked.
+        executor : str, optional
+            Executor of `run_batch` for the fallback analyses. Default is
+            "thread".
+        max_workers : int, optional
+            Maximum number of workers of `run_batch`.
+
+        Returns
+        -------
+        SurrogatePrediction
+            Displacements, uncertainties and the tasks analysed in full.
+        """
+        tasks = list(tasks)
+        in_domain = self.in_domain(tasks, motions)
+        displacement, log_std = self._predict_features(self.features(tasks, motions))
+        analysed = np.zeros(len(tasks), dtype=bool)
+        if fallback:
+            analysed = ~in_domain
+            if max_log_std is not None:
+                analysed |= log_std > max_log_std
+            if analysed.any():
+                records = run_batch(
+                    [task for task, run in zip(tasks, analysed) if run],
+                    motions,
+                    max_workers=max_workers,
+                    executor=executor,
+                )
+                displacement[analysed] = [r["max_sliding_disp"] for r in records]
+                log_std[analysed] = 0.0
+        return SurrogatePrediction(
+            displacement=displacement,
+            log_std=log_std,
+            in_domain=in_domain,
+            analysed=analysed,
+        )
+
+
+def _std(values: np.ndarray):
+    """Standard deviation along the first axis, with constants mapped to one."""
+    std = np.std(values, axis=0)
+    return np.where(std > 0, std, 1.0)
+
+
+def train_surrogate(
+    tasks: Sequence[AnalysisTask],
+    motions: Mapping[str, GroundMotion],
+    records: Optional[Sequence[Mapping[str, Any]]] = None,
+    validation_fraction: float = 0.2,
+    min_displacement: float = 1e-4,
+    max_hyperparameter_samples: int = 500,
+    max_train_samples: int = 5000,
+    seed: Optional[int] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+) -> DisplacementSurrogate:
+    """
+    Train a displacement surrogate on the results of a batch of analyses.
+
+    Parameters
+    ----------
+    tasks : sequence of AnalysisTask
+        Training tasks, all of the same method. Numeric parameters other than
+        the scaling (e.g. `height`, `vs_slope`, `damp_ratio`) become inputs of
+        the emulator and must be given by every task.
+    motions : mapping of str to GroundMotion
+        Ground motions referenced by the tasks.
+    records : sequence of dict, optional
+        Results of the tasks from `run_batch`, matched to the tasks by
+        "task_id". By default, the tasks are run.
+    validation_fraction : float, optional
+        Share of the results held out to measure the validation error, rounded
+        so that at least two results are held out and two are kept for
+        training. The final emulator is refitted to all results with the
+        hyperparameters from the training share. Default is 0.2; zero skips
+        validation.
+    min_displacement : float, optional
+        Offset (m) added to the displacements before taking the logarithm.
+        Default is 1e-4.
+    max_hyperparameter_samples : int, optional
+        Largest number of results used to fit the hyperparameters, which costs
+        O(n^3) per optimizer iteration. Default is 500.
+    max_train_samples : int, optional
+        Largest number of results of the validation and final fits, which cost
+        O(n^3) time and O(n^2) memory. Larger batches are subsampled at
+        random. Default is 5000.
+    seed : int, optional
+        Seed of the validation split and the subsamples.
+    executor : str, optional
+        Executor of `run_batch` when the tasks are run. Default is "thread".
+    max_workers : int, optional
+        Maximum number of workers of `run_batch`.
+
+    Returns
+    -------
+    DisplacementSurrogate
+        Trained emulator with its validation errors.
+
+    Raises
+    ------
+    ValueError
+        If the tasks are empty or mix methods, a task has no record or only a
+        screened record (see `DisplacementScreen`), `validation_fraction` is
+        not in [0, 1), there are fewer than four tasks to validate on, or
+        `max_train_samples` is less than two.
+    """
+    tasks = list(tasks)
+    if len(tasks) < 2:
+        raise ValueError("At least two training tasks are required")
+    methods = {task.method for task in tasks}
+    if len(methods) > 1:
+        raise ValueError(f"Training tasks mix methods: {sorted(methods)}")
+    if not 0 <= validation_fraction < 1:
+        raise ValueError(
+            f"validation_fraction must be in [0, 1), got {validation_fraction}"
+        )
+    if validation_fraction and len(tasks) < 4:
+        raise ValueError("At least four tasks are required for validation")
+    if max_train_samples < 2:
+        raise ValueError(
+            f"max_train_samples must be at least 2, got {max_train_samples}"
+        )
+    if records is None:
+        records = run_batch(tasks, motions, max_workers=max_workers, executor=executor)
+    by_id = {record["task_id"]: record for record in records}
+    missing = [task.task_id for task in tasks if task.task_id not in by_id]
+    if missing:
+        raise ValueError(f"No records for {len(missing)} tasks, e.g. {missing[0]}")
+    # Screened records hold predicted, not analysed, displacements.
+    screened = [task.task_id for task in tasks if by_id[task.task_id].get("screened")]
+    if screened:
+        raise ValueError(
+            f"{len(screened)} records were screened, not analysed, e.g. {screened[0]}"
+        )
+
+    param_names = sorted(
+        {
+            name
+            for task in tasks
+            for name, value in task.params.items()
+            if name not in _NON_FEATURE_PARAMS
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+        }
+    )
+    x = _features(tasks, motions, param_names)
+    displacement = np.array(
+        [by_id[task.task_id]["max_sliding_disp"] for task in tasks], dtype=float
+    )
+    y = np.log(displacement + min_displacement)
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(tasks))
+    n_validation = 0
+    if validation_fraction:
+        n_validation = min(
+            max(int(round(validation_fraction * len(tasks))), 2), len(tasks) - 2
+        )
+    validation_idx = order[:n_validation]
+    train_idx = order[n_validation:][:max_train_samples]
+    hyper_idx = train_idx[:max_hyperparameter_samples]
+    x_mean, x_std = x[train_idx].mean(axis=0), _std(x[train_idx])
+    y_mean, y_std = y[train_idx].mean(), _std(y[train_idx])
+    theta = _fit_hyperparameters(
+        (x[hyper_idx] - x_mean) / x_std, (y[hyper_idx] - y_mean) / y_std
+    )
+
+    validation: Dict[str, float] = {}
+    if n_validation:
+        holdout = DisplacementSurrogate(
+            tasks[0].method,
+            param_names,
+            x[train_idx],
+            y[train_idx],
+            theta,
+            min_displacement,
+            {},
+        )
+        predicted, _ = holdout._predict_features(x[validation_idx])
+        error = np.log(predicted + min_displacement) - y[validation_idx]
+        observed = y[validation_idx]
+        total = np.sum((observed - observed.mean()) ** 2)
+        validation = {
+            "rmse": float(np.sqrt(np.mean(error**2))),
+            "mae": float(np.mean(np.abs(error))),
+            "max_error": float(np.max(np.abs(error))),
+            "r2": float(1 - np.sum(error**2) / total) if total > 0 else np.nan,
+            "n": n_validation,
+        }
+    final_idx = order[:max_train_samples]
+    return DisplacementSurrogate(
+        tasks[0].method,
+        param_names,
+        x[final_idx],
+        y[final_idx],
+        theta,
+        min_displacement,
+        validation,
+    )
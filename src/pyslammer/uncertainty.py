@@ -0,0 +1,298 @@
+"""
+Propagation of parameter uncertainty to sliding displacements.
+
+`propagate_uncertainty` samples uncertain analysis parameters (e.g. ky,
+`vs_slope`, `height`, `damp_ratio`, `ref_strain`) from their distributions with
+Latin hypercube or scrambled Sobol sampling, runs the analyses with
+`run_batch` and summarizes the distribution of the displacement.
+
+Samples are drawn in rounds. Each round is an independent randomized design
+with its own random stream, spawned from a single seed, so results are
+reproducible regardless of the number of workers. Because the rounds are
+independent replicates, the spread of their statistics gives honest standard
+errors for the stratified designs, for which the usual ``std / sqrt(n)``
+overestimates the error. Sampling stops once the standard errors of the tracked
+statistics fall below a tolerance, instead of running a fixed, huge sample.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from scipy.stats import qmc
+
+from .batch import ANALYSIS_METHODS, AnalysisTask, run_batch
+from .ground_motion import GroundMotion
+
+__all__ = [
+    "UncertaintyResult",
+    "propagate_uncertainty",
+]
+
+# Sampling designs
+_SAMPLERS = ("lhs", "sobol", "random")
+
+
+def _unit_samples(sampler: str, d: int, n: int, rng: np.random.Generator):
+    """n points of a randomized design in the unit hypercube of dimension d."""
+    if sampler == "lhs":
+        return qmc.LatinHypercube(d, rng=rng).random(n)
+    if sampler == "sobol":
+        return qmc.Sobol(d, rng=rng).random_base2(int(np.log2(n)))
+    return rng.random((n, d))
+
+
+def _statistics(displacement: np.ndarray, quantiles, thresholds) -> Dict[str, float]:
+    """Tracked statistics of a sample of displacements."""
+    stats = {"mean": float(np.mean(displacement))}
+    for q in quantiles:
+        stats[f"q{100 * q:g}"] = float(np.quantile(displacement, q))
+    for threshold in thresholds:
+        stats[f"p_exceed_{threshold:g}"] = float(np.mean(displacement > threshold))
+    return stats
+
+
+@dataclass
+class UncertaintyResult:
+    """
+    Distribution of the sliding displacement under parameter uncertainty.
+
+    Attributes
+    ----------
+    method : str
+        Analysis method.
+    sampler : str
+        Sampling design: "lhs", "sobol" or "random".
+    samples : dict of str to numpy.ndarray
+        Sampled value of each uncertain parameter, one per analysis.
+    displacement : numpy.ndarray
+        Maximum sliding displacement (m) of each analysis.
+    rounds : numpy.ndarray
+        Round of each analysis.
+    statistics : dict of str to float
+        Estimates of the tracked statistics from all rounds: "mean", the
+        quantiles ("q50", "q84", ...) and the exceedance probabilities of the
+        thresholds ("p_exceed_0.05", ...).
+    standard_errors : dict of str to float
+        Standard error of each statistic, from the spread between rounds. NaN
+        with a single round.
+    history : list of dict
+        Statistics and standard errors after each round, with the number of
+        analyses so far ("n"), for convergence plots.
+    converged : bool
+        Whether all standard errors met the tolerance before the sample limit.
+    """
+
+    method: str
+    sampler: str
+    samples: Dict[str, np.ndarray]
+    displacement: np.ndarray
+    rounds: np.ndarray
+    statistics: Dict[str, float]
+    standard_errors: Dict[str, float]
+    history: List[Dict[str, float]] = field(default_factory=list)
+    converged: bool = False
+
+    @property
+    def n(self) -> int:
+        """Number of analyses."""
+        return len(self.displacement)
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Quantiles of the displacement.
+
+        Parameters
+        ----------
+        q : float or array_like
+            Probabilities in [0, 1].
+
+        Returns
+        -------
+        numpy.ndarray
+            Displacements (m).
+        """
+        return np.quantile(self.displacement, q)
+
+    def exceedance(self, displacement) -> np.ndarray:
+        """
+        Probability of exceeding the given displacements.
+
+        Parameters
+        ----------
+        displacement : float or array_like
+            Displacements (m).
+
+        Returns
+        -------
+        numpy.ndarray
+            Exceedance probabilities.
+        """
+        displacement = np.asarray(displacement, dtype=float)
+        exceeded = self.displacement[:, None] > displacement.ravel()
+        return np.mean(exceeded, axis=0).reshape(displacement.shape)
+
+
+def propagate_uncertainty(
+    ground_motion: GroundMotion,
+    distributions: Mapping[str, Any],
+    method: str = "decoupled",
+    sampler: str = "lhs",
+    round_size: int = 64,
+    min_rounds: int = 4,
+    max_samples: int = 4096,
+    rtol: float = 0.02,
+    quantiles: Sequence[float] = (0.16, 0.5, 0.84),
+    thresholds: Sequence[float] = (),
+    seed: Optional[int] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    **params,
+) -> UncertaintyResult:
+    """
+    Propagate parameter uncertainty to the displacement of a ground motion.
+
+    Parameters
+    ----------
+    ground_motion : GroundMotion
+        Ground motion to analyse.
+    distributions : mapping of str to scipy.stats frozen distribution
+        Distribution of each uncertain keyword argument of the analysis class,
+        e.g. ``{"ky": stats.lognorm(0.3, scale=0.15), "vs_slope":
+        stats.norm(600, 60)}``. Any object with a `ppf` method works.
+    method : str, optional
+        Analysis method: "decoupled" (default), "coupled" or "rigid".
+    sampler : str, optional
+        "lhs" (Latin hypercube, default), "sobol" (scrambled Sobol) or "random".
+    round_size : int, optional
+        Number of analyses per round. Must be a power of two for "sobol".
+        Default is 64.
+    min_rounds : int, optional
+        Number of rounds before the standard errors are checked. Default is 4.
+    max_samples : int, optional
+        Largest number of analyses. Default is 4096.
+    rtol : float, optional
+        Tolerance of the standard errors, relative to the mean displacement.
+        Default is 0.02.
+    quantiles : sequence of float, optional
+        Quantiles of the displacement to track. Default is 0.16, 0.5 and 0.84.
+    thresholds : sequence of float, optional
+        Displacements (m) whose exceedance probabilities are tracked. Their
+        standard errors are compared with `rtol` directly.
+    seed : int, optional
+        Seed of the random streams. The result is reproducible for a given seed.
+    executor : str, optional
+        Executor of `run_batch`. Default is "thread".
+    max_workers : int, optional
+        Maximum number of workers of `run_batch`.
+    **params
+        Fixed keyword arguments of the analysis class, e.g. `vs_base`,
+        `soil_model` or `target_pga`.
+
+    Returns
+    -------
+    UncertaintyResult
+        Sampled parameters, displacements, statistics and convergence history.
+
+    Raises
+    ------
+    ValueError
+        If the method or sampler is unknown, a parameter is both uncertain and
+        fixed, ky is not given, or `round_size` is not a power of two for Sobol
+        sampling.
+    """
+    if method not in ANALYSIS_METHODS:
+        raise ValueError(
+            f"Unknown analysis method '{method}'. "
+            f"Must be one of {list(ANALYSIS_METHODS)}."
+        )
+    if sampler not in _SAMPLERS:
+        raise ValueError(f"sampler must be one of {list(_SAMPLERS)}, got {sampler!r}")
+    if round_size < 2:
+        raise ValueError(f"round_size must be at least 2, got {round_size}")
+    if sampler == "sobol" and round_size & (round_size - 1):
+        raise ValueError(
+            f"round_size must be a power of two for Sobol sampling, got {round_size}"
+        )
+    names = list(distributions)
+    if not names:
+        raise ValueError("At least one uncertain parameter is required")
+    overlap = set(names) & set(params)
+    if overlap:
+        raise ValueError(f"Parameters both uncertain and fixed: {sorted(overlap)}")
+    if "ky" not in names and "ky" not in params:
+        raise ValueError("ky must be given as an uncertain or a fixed parameter")
+    if max_samples < round_size:
+        raise ValueError(
+            f"max_samples ({max_samples}) must be at least round_size ({round_size})"
+        )
+
+    motions = {"motion": ground_motion}
+    streams = np.random.SeedSequence(seed)
+    samples = {name: [] for name in names}
+    displacement = []
+    round_stats = []
+    history = []
+    converged = False
+    n = 0
+    while n + round_size <= max_samples:
+        rng = np.random.default_rng(streams.spawn(1)[0])
+        unit = _unit_samples(sampler, len(names), round_size, rng)
+        values = {
+            name: np.asarray(distributions[name].ppf(unit[:, j]), dtype=float)
+            for j, name in enumerate(names)
+        }
+        tasks = []
+        for i in range(round_size):
+            kwargs = {**params, **{name: float(values[name][i]) for name in names}}
+            ky = kwargs.pop("ky")
+            tasks.append(AnalysisTask(method, "motion", ky, kwargs))
+        records = run_batch(tasks, motions, max_workers=max_workers, executor=executor)
+        disps = np.array([record["max_sliding_disp"] for record in records])
+        for name in names:
+            samples[name].append(values[name])
+        displacement.append(disps)
+        round_stats.append(_statistics(disps, quantiles, thresholds))
+        n += round_size
+
+        # Rounds are independent replicates of the design.
+        statistics = _statistics(np.concatenate(displacement), quantiles, thresholds)
+        n_rounds = len(round_stats)
+        standard_errors = {
+            key: (
+                float(
+                    np.std([stats[key] for stats in round_stats], ddof=1)
+                    / np.sqrt(n_rounds)
+                )
+                if n_rounds > 1
+                else np.nan
+            )
+            for key in statistics
+        }
+        history.append(
+            {
+                "n": n,
+                **statistics,
+                **{f"{key}_se": se for key, se in standard_errors.items()},
+            }
+        )
+        if n_rounds >= min_rounds:
+            scale = abs(statistics["mean"])
+            converged = all(
+                se <= rtol * (1 if key.startswith("p_exceed") else scale)
+                for key, se in standard_errors.items()
+            )
+            if converged:
+                break
+
+    return UncertaintyResult(
+        method=method,
+        sampler=sampler,
+        samples={name: np.concatenate(samples[name]) for name in names},
+        displacement=np.concatenate(displacement),
+        rounds=np.repeat(np.arange(len(round_stats)), round_size),
+        statistics=statistics,
+        standard_errors=standard_errors,
+        history=history,
+        converged=converged,
+    )
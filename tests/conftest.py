@@ -1,9 +1,20 @@
 """
-Pytest configuration for pySLAMMER verification tests.
+Pytest configuration and shared fixtures for pySLAMMER tests.
 """
 
 import pytest
 
+from pyslammer.ground_motion import GroundMotionSuite
+from pyslammer.utilities import sample_ground_motions
+
+# Sample records of the suite shared by the hazard, fragility and screening tests.
+SUITE_NAMES = [
+    "Landers_1992_LCN-345",
+    "Loma_Prieta_1989_HSP-000",
+    "Northridge_1994_PAC-175",
+    "Duzce_1999_375-090",
+]
+
 
 def pytest_addoption(parser):
     """Add custom command line options."""
@@ -39,4 +50,28 @@ def pytest_collection_modifyitems(config, items):
     skip_slow = pytest.mark.skip(reason="need --runslow option to run")
     for item in items:
         if "slow" in item.keywords:
-            item.add_marker(skip_slow)
\ No newline at end of file
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def site():
+    """Site parameters of the flexible (decoupled and coupled) methods."""
+    return {"height": 50.0, "vs_slope": 600.0, "vs_base": 600.0, "damp_ratio": 0.05}
+
+
+@pytest.fixture(scope="session")
+def sample_motions():
+    """Load the sample records."""
+    return sample_ground_motions()
+
+
+@pytest.fixture(scope="session")
+def suite_motions(sample_motions):
+    """Four sample records, by name."""
+    return {name: sample_motions[name] for name in SUITE_NAMES}
+
+
+@pytest.fixture(scope="session")
+def suite(suite_motions):
+    """Equally weighted suite of the four sample records."""
+    return GroundMotionSuite(suite_motions)
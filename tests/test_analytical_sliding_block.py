@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from pyslammer.analytical_sliding_block import (
+    harmonic_displacement,
+    harmonic_grid,
+    harmonic_sliding_times,
+)
+from pyslammer.constants import G_EARTH
+from pyslammer.ground_motion import GroundMotion
+from pyslammer.rigid_analysis import RigidAnalysis
+
+
+class TestHarmonicSolution:
+    """Test suite for the closed-form harmonic sliding block solution."""
+
+    def test_sliding_times(self):
+        """Test that sliding starts at arcsin(ky) and ends with zero velocity."""
+        freq, ky = 2.0, 0.4
+        t1, t2 = harmonic_sliding_times(freq, ky)
+        omega = 2 * np.pi * freq
+        assert t1 == pytest.approx(np.arcsin(ky) / omega)
+        relative_vel = (np.cos(omega * t1) - np.cos(omega * t2)) / omega - ky * (
+            t2 - t1
+        )
+        assert relative_vel == pytest.approx(0, abs=1e-14)
+        assert 0.25 / freq < t2 < 1 / freq
+
+    def test_grid_broadcasting(self):
+        """Test that a grid matches the element-wise solution."""
+        frequencies = np.array([0.5, 1.0, 5.0])
+        kys = np.array([0.1, 0.6, 1.0, 1.5])
+        grid = harmonic_grid(frequencies, kys)
+        assert grid.shape == (3, 4)
+        for i, freq in enumerate(frequencies):
+            for j, ky in enumerate(kys):
+                assert grid[i, j] == harmonic_displacement(freq, ky)
+        assert np.all(grid[:, 2:] == 0)
+        assert np.all(np.diff(grid, axis=1) <= 0)
+
+    def test_invalid_inputs(self):
+        """Test ValueError for non-positive frequencies or yield accelerations."""
+        with pytest.raises(ValueError):
+            harmonic_displacement([1.0, 0.0], 0.2)
+        with pytest.raises(ValueError):
+            harmonic_displacement(1.0, -0.2)
+
+    def test_matches_symbolic_solution(self):
+        """Test the NumPy solution against the sympy cross-check."""
+        pytest.importorskip("sympy")
+        pytest.importorskip("pandas")
+        from pyslammer.analytical_sliding_block import harmonic_solutions
+
+        combinations = [(0.5, 0.1), (1.0, 0.6), (10.0, 0.8)]
+        numeric = harmonic_solutions(combinations)["Displacement (m)"]
+        symbolic = harmonic_solutions(combinations, method="sympy")["Displacement (m)"]
+        np.testing.assert_allclose(numeric, symbolic, rtol=1e-9)
+
+    @pytest.mark.parametrize("freq, ky", [(1.0, 0.6), (2.0, 0.2)])
+    def test_rigid_analysis_converges(self, freq, ky):
+        """Test that the rigid analysis of one sine cycle converges to the solution."""
+        expected = harmonic_displacement(freq, ky, grav=G_EARTH)
+        errors = []
+        for dt in (0.01, 0.001):
+            t = np.arange(0, 3 / freq, dt)
+            accel = np.where(t <= 1 / freq, np.sin(2 * np.pi * freq * t), 0.0)
+            analysis = RigidAnalysis(ky, GroundMotion(accel, dt))
+            errors.append(abs(analysis.max_sliding_disp - expected))
+        assert errors[1] < errors[0] / 5
+        assert errors[1] < 1e-4 * expected
@@ -0,0 +1,251 @@
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from pyslammer.batch import (
+    AnalysisTask,
+    SharedGroundMotion,
+    SharedMotionExecutor,
+    run_batch,
+)
+from pyslammer.batch_io import NpzResultWriter, open_result_writer, read_results
+from pyslammer.decoupled_analysis import Decoupled
+from pyslammer.ground_motion import GroundMotion
+from pyslammer.rigid_analysis import RigidAnalysis
+
+
+class TestSharedGroundMotion:
+    """Test suite for shared memory ground motion transport."""
+
+    @pytest.fixture
+    def long_ground_motion(self):
+        """Create a long synthetic ground motion for testing."""
+        t = np.arange(0, 40, 0.005)
+        accel = 0.4 * np.sin(2 * np.pi * 1.5 * t) * np.exp(-0.1 * t)
+        return GroundMotion(accel=accel, dt=0.005, name="Synthetic")
+
+    def test_handle_round_trip(self, long_ground_motion):
+        """Test that a shared handle reconstructs an equal ground motion."""
+        with SharedMotionExecutor(max_workers=1) as pool:
+            handle = pool.share(long_ground_motion)
+            gm = handle.to_ground_motion()
+
+            assert isinstance(handle, SharedGroundMotion)
+            assert gm == long_ground_motion
+            assert gm.pga == long_ground_motion.pga
+            assert gm.mean_period == long_ground_motion.mean_period
+            assert not gm.accel.flags.writeable
+
+    def test_handle_is_lightweight(self, long_ground_motion):
+        """Test that pickled handles do not carry the acceleration data."""
+        with SharedMotionExecutor(max_workers=1) as pool:
+            handle = pool.share(long_ground_motion)
+            assert len(pickle.dumps(handle)) < 1000
+            assert long_ground_motion.accel.nbytes > 50000
+
+    def test_views_share_memory(self, long_ground_motion):
+        """Test that reconstructed motions are views of the same buffer."""
+        with SharedMotionExecutor(max_workers=1) as pool:
+            handle = pool.share(long_ground_motion)
+            assert pool.share(long_ground_motion) is handle
+            gm1 = handle.to_ground_motion()
+            gm2 = pickle.loads(pickle.dumps(handle)).to_ground_motion()
+            assert np.shares_memory(gm1.accel, gm2.accel)
+
+    def test_segments_released_on_shutdown(self, long_ground_motion):
+        """Test that shared memory is unlinked when the pool shuts down."""
+        with SharedMotionExecutor(max_workers=1) as pool:
+            shm_name = pool.share(long_ground_motion).shm_name
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shm_name)
+
+
+class TestRunBatch:
+    """Test suite for the process pool batch runner."""
+
+    @pytest.fixture
+    def motions(self):
+        """Create a small set of ground motions."""
+        t = np.arange(0, 5, 0.01)
+        return {
+            "sine": GroundMotion(np.sin(2 * np.pi * t), 0.01, "sine"),
+            "cosine": GroundMotion(0.5 * np.cos(2 * np.pi * t), 0.01, "cosine"),
+        }
+
+    def test_matches_serial_analyses(self, motions):
+        """Test that batch results match analyses run directly."""
+        flexible = {
+            "height": 50.0,
+            "vs_slope": 600.0,
+            "vs_base": 600.0,
+            "damp_ratio": 0.05,
+        }
+        tasks = [
+            AnalysisTask("rigid", "sine", 0.1),
+            AnalysisTask("rigid", "cosine", 0.2, {"inverse": True}),
+            AnalysisTask("decoupled", "sine", 0.15, flexible),
+        ]
+        records = run_batch(tasks, motions, max_workers=2)
+
+        expected = [
+            RigidAnalysis(0.1, motions["sine"]).max_sliding_disp,
+            RigidAnalysis(0.2, motions["cosine"], inverse=True).max_sliding_disp,
+            Decoupled(0.15, motions["sine"], **flexible).max_sliding_disp,
+        ]
+        assert [r["max_sliding_disp"] for r in records] == expected
+        assert [r["motion"] for r in records] == ["sine", "cosine", "sine"]
+        assert records[1]["scale_factor"] == -1.0
+
+    def test_thread_executor(self, motions):
+        """Test that the thread executor gives the same results as processes."""
+        tasks = [AnalysisTask("rigid", key, ky) for key in motions for ky in (0.1, 0.2)]
+        assert run_batch(tasks, motions, executor="thread") == run_batch(
+            tasks, motions, max_workers=2
+        )
+
+    def test_invalid_executor(self, motions):
+        """Test ValueError for an unknown executor."""
+        with pytest.raises(ValueError, match="executor must be"):
+            run_batch([], motions, executor="cluster")
+
+    def test_unknown_motion(self, motions):
+        """Test KeyError for tasks referencing missing motions."""
+        with pytest.raises(KeyError, match="unknown motions"):
+            run_batch([AnalysisTask("rigid", "missing", 0.1)], motions)
+
+    def test_unknown_method(self):
+        """Test ValueError for an invalid analysis method."""
+        with pytest.raises(ValueError, match="Unknown analysis method"):
+            AnalysisTask("flexible", "sine", 0.1)
+
+
+class TestStreamingOutput:
+    """Test suite for streaming batch results to disk."""
+
+    @pytest.fixture
+    def motions(self):
+        """Create a small set of ground motions."""
+        t = np.arange(0, 5, 0.01)
+        return {
+            "sine": GroundMotion(np.sin(2 * np.pi * t), 0.01, "sine"),
+            "cosine": GroundMotion(0.5 * np.cos(2 * np.pi * t), 0.01, "cosine"),
+        }
+
+    @pytest.fixture
+    def tasks(self, motions):
+        """Create rigid analysis tasks for all motions."""
+        return [
+            AnalysisTask("rigid", key, ky) for key in motions for ky in (0.1, 0.2, 0.3)
+        ]
+
+    @pytest.mark.parametrize("fmt", ["npz", "parquet"])
+    def test_streamed_results_match_in_memory(self, motions, tasks, tmp_path, fmt):
+        """Test that streamed results equal the in-memory records."""
+        if fmt == "parquet":
+            pytest.importorskip("pyarrow")
+        writer = open_result_writer(tmp_path / "out", format=fmt)
+        path = run_batch(
+            iter(tasks), motions, executor="thread", output=writer, output_chunk_size=4
+        )
+        expected = run_batch(tasks, motions, executor="thread")
+        results = read_results(path)
+
+        assert len(list(path.glob(f"part-*.{fmt}"))) == 2
+        assert list(results["motion"]) == [r["motion"] for r in expected]
+        np.testing.assert_array_equal(
+            results["max_sliding_disp"], [r["max_sliding_disp"] for r in expected]
+        )
+
+    def test_partial_output_readable(self, tmp_path):
+        """Test that completed parts are readable before the writer is closed."""
+        writer = NpzResultWriter(tmp_path)
+        writer.write([{"motion": "a", "max_sliding_disp": 1.0}])
+        (tmp_path / ".part-00001.npz.tmp").write_bytes(b"truncated")
+
+        results = read_results(tmp_path)
+        assert list(results["motion"]) == ["a"]
+
+    def test_writer_appends_parts(self, tmp_path):
+        """Test that a new writer continues the part numbering."""
+        NpzResultWriter(tmp_path).write([{"ky": 0.1}])
+        part = NpzResultWriter(tmp_path).write([{"ky": 0.2}])
+
+        assert part.name == "part-00001.npz"
+        np.testing.assert_array_equal(read_results(tmp_path)["ky"], [0.1, 0.2])
+
+    def test_unknown_motion_keeps_earlier_chunks(self, motions, tasks, tmp_path):
+        """Test that chunks before a failing one have been written."""
+        bad_tasks = tasks + [AnalysisTask("rigid", "missing", 0.1)]
+        with pytest.raises(KeyError, match="unknown motions"):
+            run_batch(
+                bad_tasks,
+                motions,
+                executor="thread",
+                output=tmp_path,
+                output_chunk_size=6,
+            )
+        assert len(read_results(tmp_path)["ky"]) == 6
+
+    def test_invalid_format(self, tmp_path):
+        """Test ValueError for an unknown output format."""
+        with pytest.raises(ValueError, match="format must be"):
+            open_result_writer(tmp_path, format="csv")
+
+
+class TestCheckpointResume:
+    """Test suite for resuming interrupted batches."""
+
+    @pytest.fixture
+    def motions(self):
+        """Create a small ground motion set."""
+        t = np.arange(0, 5, 0.01)
+        return {"sine": GroundMotion(np.sin(2 * np.pi * t), 0.01, "sine")}
+
+    @pytest.fixture
+    def tasks(self):
+        """Create rigid analysis tasks."""
+        return [AnalysisTask("rigid", "sine", ky) for ky in (0.1, 0.2, 0.3, 0.4)]
+
+    def test_task_id_is_stable(self):
+        """Test that task IDs depend only on the task inputs."""
+        a = AnalysisTask("rigid", "sine", 0.1, {"inverse": True, "target_pga": 0.3})
+        b = AnalysisTask("rigid", "sine", 0.1, {"target_pga": 0.3, "inverse": True})
+        assert a.task_id == b.task_id
+        assert a.task_id != AnalysisTask("rigid", "sine", 0.1).task_id
+
+    def test_resume_skips_completed_tasks(self, motions, tasks, tmp_path):
+        """Test that a resumed batch only runs the remaining tasks."""
+        run_batch(tasks[:2], motions, executor="thread", output=tmp_path)
+        run_batch(iter(tasks), motions, executor="thread", output=tmp_path, resume=True)
+        results = read_results(tmp_path)
+
+        assert list(results["ky"]) == [0.1, 0.2, 0.3, 0.4]
+        assert NpzResultWriter(tmp_path).completed_task_ids() == {
+            task.task_id for task in tasks
+        }
+
+    def test_resume_recovers_unlisted_part(self, motions, tasks, tmp_path):
+        """Test that parts missing from the manifest count as completed."""
+        run_batch(tasks[:2], motions, executor="thread", output=tmp_path)
+        (tmp_path / "manifest.jsonl").unlink()
+
+        completed = open_result_writer(tmp_path).completed_task_ids()
+        assert completed == {task.task_id for task in tasks[:2]}
+
+    def test_truncated_manifest_line_is_dropped(self, tmp_path):
+        """Test that an incomplete trailing manifest line is ignored."""
+        NpzResultWriter(tmp_path).write([{"task_id": "a", "ky": 0.1}])
+        with open(tmp_path / "manifest.jsonl", "a") as f:
+            f.write('{"part": "part-0000')
+
+        writer = NpzResultWriter(tmp_path)
+        writer.write([{"task_id": "b", "ky": 0.2}])
+        assert writer.completed_task_ids() == {"a", "b"}
+
+    def test_resume_requires_output(self, motions, tasks):
+        """Test ValueError for resume without an output."""
+        with pytest.raises(ValueError, match="resume requires"):
+            run_batch(tasks, motions, resume=True)
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from pyslammer.analytical_sliding_block import harmonic_displacement
+from pyslammer.constants import G_EARTH
+from pyslammer.convergence import (
+    coarsest_resampling_dt,
+    convergence_study,
+    harmonic_ground_motion,
+    resampling_guidance,
+)
+from pyslammer.rigid_analysis import RigidAnalysis
+
+
+@pytest.fixture(scope="module")
+def study():
+    """Run a small study of all three methods."""
+    return convergence_study(
+        frequencies=[1.0, 4.0],
+        yield_accelerations=[0.2, 0.6, 1.2],
+        resolutions=[50, 200, 1000],
+        padding=1.0,
+    )
+
+
+class TestConvergenceStudy:
+    """Test suite for convergence studies on harmonic inputs."""
+
+    def test_harmonic_ground_motion(self):
+        """Test that the input is one sine cycle followed by zeros."""
+        gm = harmonic_ground_motion(1.0, 100, padding=1.0)
+        assert gm.dt == pytest.approx(0.01)
+        assert gm.name == "sine_1_Hz_100_sps"
+        assert len(gm.accel) == 201
+        assert gm.accel[25] == pytest.approx(1.0)
+        assert np.all(gm.accel[100:] == 0)
+
+    def test_records(self, study):
+        """Test one record per method, resolution, frequency and ky."""
+        assert len(study.records) == 3 * 3 * 2 * 3
+        assert study.methods == ["rigid", "decoupled", "coupled"]
+        assert study.references == {
+            "rigid": "closed-form",
+            "decoupled": "4000 sps",
+            "coupled": "4000 sps",
+        }
+        rigid = [record for record in study.records if record["method"] == "rigid"]
+        for record in rigid:
+            expected = harmonic_displacement(
+                record["frequency"], record["ky"], grav=G_EARTH
+            )
+            assert record["reference_m"] == pytest.approx(expected)
+            if record["ky"] > 1:
+                assert np.isnan(record["rel_error"])
+
+    def test_errors_decrease_with_resolution(self, study):
+        """Test that each method converges towards its reference."""
+        for method in study.methods:
+            curve = study.curve(method)
+            assert np.all(np.diff(curve["max_rel_error"]) < 0)
+            assert curve["max_rel_error"][-1] < 0.01
+            assert np.all(curve["time_per_analysis_s"] > 0)
+
+    def test_coarsest_dt(self, study):
+        """Test that the coarsest dt meets the tolerance at all finer rates."""
+        curve = study.curve("rigid")
+        tolerance = curve["max_rel_error"][1] * 1.01
+        assert study.coarsest_dt("rigid", tolerance) == pytest.approx(1 / 200)
+        assert study.coarsest_dt("rigid", 1.0) == pytest.approx(1 / 50)
+        assert study.coarsest_dt("rigid", 1e-12) is None
+        with pytest.raises(ValueError):
+            study.coarsest_dt("rigid", 0.01, metric="dt")
+        with pytest.raises(KeyError):
+            study.curve("unknown")
+
+    def test_invalid_arguments(self):
+        """Test ValueError for unknown methods and coarse references."""
+        with pytest.raises(ValueError):
+            convergence_study(methods=["newmark"])
+        with pytest.raises(ValueError):
+            convergence_study(
+                methods=["decoupled"], resolutions=[100], reference_resolution=100
+            )
+
+
+class TestResamplingGuidance:
+    """Test suite for the resampling error estimates."""
+
+    @pytest.fixture
+    def ground_motion(self):
+        """Load a sample record at dt = 0.005."""
+        from pyslammer.utilities import sample_ground_motions
+
+        return sample_ground_motions()["Loma_Prieta_1989_HSP-000"]
+
+    def test_rigid_estimate(self, ground_motion):
+        """Test that the rigid estimate compares rigid analyses of both records."""
+        guidance = resampling_guidance(ground_motion, 0.1, 0.01)
+        resampled = ground_motion.resample(0.01)
+        expected = RigidAnalysis(0.1, resampled).max_sliding_disp
+        assert guidance.resampled_disp_m == pytest.approx(expected)
+        assert guidance.speedup == pytest.approx(2, rel=1e-3)
+        assert guidance.rel_error == pytest.approx(
+            abs(expected - guidance.original_disp_m) / guidance.original_disp_m
+        )
+
+    def test_harmonic_estimate(self, ground_motion):
+        """Test that the harmonic estimate grows with the time step."""
+        errors = [
+            resampling_guidance(ground_motion, 0.1, dt, method="harmonic").rel_error
+            for dt in (0.01, 0.02)
+        ]
+        assert 0 < errors[0] < errors[1] < 0.05
+        assert resampling_guidance(ground_motion, 1.0, 0.01, "harmonic").rel_error == 0
+        with pytest.raises(ValueError):
+            resampling_guidance(ground_motion, 0.1, 0.01, method="exact")
+
+    def test_coarsest_resampling_dt(self, ground_motion):
+        """Test that the coarsest dt meets the tolerance."""
+        guidance = coarsest_resampling_dt(ground_motion, 0.1, 0.01)
+        assert guidance.dt > ground_motion.dt
+        assert guidance.rel_error <= 0.01
+        strict = coarsest_resampling_dt(ground_motion, 0.1, 0.0)
+        assert strict.dt == ground_motion.dt
+        assert strict.speedup == 1
@@ -128,4 +128,27 @@ class TestCoupled:
         assert hasattr(ca, "soil_model")
 
         # Test that parent methods are available
-        assert callable(getattr(ca, "run_sliding_analysis", None))
\ No newline at end of file
+        assert callable(getattr(ca, "run_sliding_analysis", None))
+
+    @pytest.mark.parametrize("soil_model", ["linear_elastic", "equivalent_linear"])
+    def test_kernel_matches_stepwise_sliding(self, sample_coupled_params, soil_model):
+        """Test that the constant-ky kernel matches the per-step sliding methods."""
+
+        class StepwiseCoupled(Coupled):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._constant_ky = None
+                self.run_sliding_analysis()
+
+        t = np.arange(0, 4, 0.005)
+        gm = GroundMotion(accel=0.5 * np.sin(2 * np.pi * 2 * t), dt=0.005)
+        params = {**sample_coupled_params, "soil_model": soil_model}
+
+        kernel = Coupled(ground_motion=gm, **params)
+        stepwise = StepwiseCoupled(ground_motion=gm, **params)
+
+        assert kernel.max_sliding_disp > 0
+        np.testing.assert_array_equal(kernel.s, stepwise.s)
+        np.testing.assert_array_equal(kernel.u, stepwise.u)
+        np.testing.assert_array_equal(kernel.HEA, stepwise.HEA)
+        np.testing.assert_array_equal(kernel.sliding_vel, stepwise.sliding_vel)
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from pyslammer.decoupled_analysis import Decoupled
+from pyslammer.decoupled_analysis import Decoupled, hea_sliding_displacement
 from pyslammer.ground_motion import GroundMotion
 
 
@@ -134,4 +134,58 @@ class TestDecoupled:
 
         # Test that k_y returns expected value for constant case
         assert da.k_y(0.0) == sample_decoupled_params["ky"]
-        assert da.k_y(10.0) == sample_decoupled_params["ky"]
\ No newline at end of file
+        assert da.k_y(10.0) == sample_decoupled_params["ky"]
+
+    @pytest.mark.parametrize("soil_model", ["linear_elastic", "equivalent_linear"])
+    def test_kernel_matches_stepwise_sliding(self, sample_decoupled_params, soil_model):
+        """Test that the constant-ky kernel matches the per-step sliding method."""
+
+        class StepwiseDecoupled(Decoupled):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._constant_ky = None
+                self.run_sliding_analysis()
+
+        t = np.arange(0, 4, 0.005)
+        gm = GroundMotion(accel=0.5 * np.sin(2 * np.pi * 2 * t), dt=0.005)
+        params = {**sample_decoupled_params, "soil_model": soil_model}
+
+        kernel = Decoupled(ground_motion=gm, **params)
+        stepwise = StepwiseDecoupled(ground_motion=gm, **params)
+
+        assert kernel.max_sliding_disp > 0
+        np.testing.assert_array_equal(kernel.block_disp, stepwise.block_disp)
+        np.testing.assert_array_equal(kernel.sliding_vel, stepwise.sliding_vel)
+        np.testing.assert_array_equal(kernel._block_acc_, stepwise._block_acc_)
+
+    @pytest.mark.parametrize("ky", [1, np.float32(0.125), np.int64(1)])
+    def test_numeric_ky_types(self, sample_ground_motion, sample_decoupled_params, ky):
+        """Test that integer and NumPy yield accelerations are constant kys."""
+        params = {**sample_decoupled_params, "ky": ky}
+        analysis = Decoupled(ground_motion=sample_ground_motion, **params)
+        expected = Decoupled(
+            ground_motion=sample_ground_motion, **{**params, "ky": float(ky)}
+        )
+        assert analysis._constant_ky == float(ky)
+        np.testing.assert_array_equal(analysis.block_disp, expected.block_disp)
+
+    @pytest.mark.parametrize("soil_model", ["linear_elastic", "equivalent_linear"])
+    def test_sliding_displacement_reuses_response(
+        self, sample_decoupled_params, soil_model
+    ):
+        """Test that rerunning only the sliding matches a new analysis."""
+        t = np.arange(0, 4, 0.005)
+        gm = GroundMotion(accel=0.5 * np.sin(2 * np.pi * 2 * t), dt=0.005)
+        params = {**sample_decoupled_params, "soil_model": soil_model}
+        analysis = Decoupled(ground_motion=gm, **params)
+        block_disp = analysis.block_disp.copy()
+
+        for ky in (0.05, 0.3):
+            expected = Decoupled(ground_motion=gm, **{**params, "ky": ky})
+            reused = hea_sliding_displacement(
+                analysis.HEA, ky, analysis.dt, analysis.g
+            )
+            assert reused == expected.max_sliding_disp
+        np.testing.assert_array_equal(analysis.block_disp, block_disp)
+        with pytest.raises(ValueError):
+            hea_sliding_displacement(analysis.HEA, 0.0, analysis.dt)
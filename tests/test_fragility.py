@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from pyslammer.decoupled_analysis import Decoupled
+from pyslammer.fragility import fit_lognormal_fragility, fragility_curves
+from pyslammer.rigid_analysis import RigidAnalysis
+
+IM = [0.1, 0.2, 0.3, 0.5, 0.7, 1.0]
+
+
+class TestFitLognormalFragility:
+    """Test suite for the maximum likelihood lognormal fit."""
+
+    def test_recovers_parameters(self):
+        """Test that exact probabilities recover the generating parameters."""
+        im = np.geomspace(0.05, 2.0, 12)
+        trials = 1000
+        exceedances = trials * norm.cdf(np.log(im / 0.4) / 0.6)
+        median, beta = fit_lognormal_fragility(im, exceedances, trials)
+        assert median == pytest.approx(0.4, rel=1e-6)
+        assert beta == pytest.approx(0.6, rel=1e-6)
+
+    def test_vectorized_matches_individual_fits(self):
+        """Test that fits over leading dimensions match one-at-a-time fits."""
+        rng = np.random.default_rng(0)
+        im = np.geomspace(0.1, 1.0, 6)
+        p = norm.cdf(np.log(im / 0.3) / 0.5)
+        counts = rng.binomial(20, p, size=(5, 6))
+        median, beta = fit_lognormal_fragility(im, counts, 20)
+        for i in range(5):
+            single = fit_lognormal_fragility(im, counts[i], 20)
+            assert median[i] == pytest.approx(single[0])
+            assert beta[i] == pytest.approx(single[1])
+
+    def test_degenerate_counts(self):
+        """Test NaN for no exceedances and a bounded beta for separated data."""
+        im = [0.1, 0.2, 0.4]
+        median, beta = fit_lognormal_fragility(im, [[0, 0, 0], [0, 0, 10]], 10)
+        assert np.isnan(median[0]) and np.isnan(beta[0])
+        assert 0.2 < median[1] < 0.4
+        assert beta[1] == pytest.approx(0.01)
+
+
+class TestFragilityCurves:
+    """Test suite for fragility curves of scaled suites."""
+
+    def test_rigid_scaling(self, suite):
+        """Test that scaled displacements match analyses scaled to the PGA.
+
+        The match is up to the velocity tolerance of the sliding kernel, which
+        does not scale.
+        """
+        result = fragility_curves(suite, 0.15, IM, n_bootstrap=200, seed=0)
+        assert result.linear_scaling
+        assert result.displacement.shape == (len(suite), len(IM))
+        for i, name in enumerate(suite.motions):
+            for j in (0, 3, 5):
+                expected = RigidAnalysis(
+                    0.15, suite.motions[name], target_pga=IM[j]
+                ).max_sliding_disp
+                assert result.displacement[i, j] == pytest.approx(
+                    expected, rel=1e-4, abs=1e-9
+                )
+
+    def test_decoupled_shares_response(self, suite, site):
+        """Test one dynamic response per motion for linear elastic decoupled."""
+        result = fragility_curves(
+            suite, 0.15, IM[:3], method="decoupled", n_bootstrap=10, **site
+        )
+        assert result.full_analyses == len(suite)
+        assert result.analyses == len(suite) * 3
+        name = list(suite.motions)[0]
+        expected = Decoupled(
+            0.15, suite.motions[name], target_pga=IM[2], **site
+        ).max_sliding_disp
+        assert result.displacement[0, 2] == pytest.approx(expected, rel=1e-6)
+
+    def test_fit_and_bands(self, suite):
+        """Test fitted curves, bootstrap bands and reproducibility."""
+        result = fragility_curves(
+            suite, 0.1, IM, limit_states=[0.05], n_bootstrap=300, seed=1
+        )
+        np.testing.assert_allclose(
+            result.exceedance_fraction[0],
+            np.mean(result.displacement > 0.05, axis=0),
+        )
+        assert np.all(np.diff(result.exceedance_fraction[0]) >= 0)
+        assert IM[0] < result.median[0] < IM[-1]
+        assert result.bootstrap_median.shape == (1, 300)
+        lower, upper = result.band(IM)
+        probability = result.probability(IM)
+        assert np.all(lower <= upper)
+        assert np.all((lower - 1e-9 <= probability) & (probability <= upper + 1e-9))
+        again = fragility_curves(
+            suite, 0.1, IM, limit_states=[0.05], n_bootstrap=300, seed=1
+        )
+        np.testing.assert_array_equal(again.bootstrap_beta, result.bootstrap_beta)
+
+    def test_invalid_arguments(self, suite):
+        """Test ValueError for unknown methods, scaling and PGA levels."""
+        with pytest.raises(ValueError, match="Unknown analysis method"):
+            fragility_curves(suite, 0.1, IM, method="newmark")
+        with pytest.raises(ValueError):
+            fragility_curves(suite, 0.1, IM, target_pga=0.3)
+        with pytest.raises(ValueError):
+            fragility_curves(suite, 0.1, [0.0, 0.2])
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from pyslammer.ground_motion import GroundMotion
+from pyslammer.ground_motion import GroundMotion, GroundMotionSuite
 
 
 class TestGroundMotion:
@@ -177,3 +177,96 @@ class TestGroundMotion:
         # Not equal to non-GroundMotion objects
         assert gm1 != "not a ground motion"
         assert gm1 != 42
+
+    def test_resample_decimation(self):
+        """Test that decimation keeps low frequencies and removes aliases."""
+        dt = 0.002
+        t = np.arange(0, 10, dt)
+        low = 0.3 * np.sin(2 * np.pi * 2 * t)
+        # 70 Hz would alias to 5 Hz after decimating to dt = 0.01 (50 Hz Nyquist)
+        gm = GroundMotion(low + 0.1 * np.sin(2 * np.pi * 70 * t), dt, name="Two tones")
+
+        resampled = gm.resample(0.01)
+
+        assert resampled.dt == pytest.approx(0.01)
+        assert resampled.name == "Two tones"
+        assert len(resampled.accel) == len(t) // 5
+        interior = slice(50, -50)
+        np.testing.assert_allclose(
+            resampled.accel[interior], low[::5][interior], atol=2e-3
+        )
+
+    def test_intensity_measures(self):
+        """Test PGV, Arias intensity and spectral acceleration of a sine."""
+        dt = 0.001
+        t = np.arange(0, 10, dt)
+        freq, amplitude = 1.0, 0.3
+        gm = GroundMotion(amplitude * np.sin(2 * np.pi * freq * t), dt)
+        g = 9.80665
+        assert gm.pgv == pytest.approx(amplitude * g / (np.pi * freq), rel=1e-3)
+        # Ia = pi / (2 g) * integral of a^2 = pi / (2 g) * (A g)^2 * duration / 2
+        assert gm.arias_intensity == pytest.approx(
+            np.pi / (2 * g) * (amplitude * g) ** 2 * 10 / 2, rel=1e-3
+        )
+        assert gm.spectral_acceleration(0.0) == gm.pga
+        # A stiff oscillator follows the ground.
+        assert gm.spectral_acceleration(0.01) == pytest.approx(gm.pga, rel=1e-3)
+        # Resonance after 10 cycles with 5% damping builds up to
+        # (1 - exp(-2 pi zeta n)) / (2 zeta) times the input.
+        sa = gm.spectral_acceleration([0.5, 1.0])
+        assert sa.shape == (2,)
+        assert sa[1] == pytest.approx(
+            amplitude * (1 - np.exp(-2 * np.pi * 0.05 * 10)) / 0.1, rel=0.02
+        )
+        assert sa[0] < sa[1]
+
+    def test_resample_rational_factor(self):
+        """Test resampling by a non-integer factor."""
+        gm = GroundMotion(np.sin(np.linspace(0, 20, 1000)), 0.01)
+        resampled = gm.resample(0.025)
+        assert resampled.dt == pytest.approx(0.025)
+        assert len(resampled.accel) == 400
+        assert gm.resample(0.01) == gm
+
+    def test_resample_invalid_dt(self):
+        """Test ValueError for non-positive or vanishing time steps."""
+        gm = GroundMotion([0.1, 0.2, 0.1], 0.01)
+        with pytest.raises(ValueError, match="must be positive"):
+            gm.resample(0)
+        with pytest.raises(ValueError, match="too small"):
+            gm.resample(1e-6)
+
+
+class TestGroundMotionSuite:
+    """Test suite for weighted ground motion suites."""
+
+    @pytest.fixture
+    def motions(self):
+        """Create two small ground motions."""
+        return {
+            "a": GroundMotion([0.1, 0.2, 0.1], 0.01, name="a"),
+            "b": GroundMotion([0.3, -0.2, 0.1], 0.01, name="b"),
+        }
+
+    def test_default_weights(self, motions):
+        """Test equal weights that sum to one by default."""
+        suite = GroundMotionSuite(motions)
+        assert len(suite) == 2
+        np.testing.assert_allclose(suite.weights, [0.5, 0.5])
+        assert [name for name, _, _ in suite] == ["a", "b"]
+
+    def test_weights_by_name(self, motions):
+        """Test weights given by motion name."""
+        suite = GroundMotionSuite(motions, {"b": 3.0, "a": 1.0})
+        assert [weight for _, _, weight in suite] == [1.0, 3.0]
+
+    def test_invalid_weights(self, motions):
+        """Test ValueError for missing, mismatched or negative weights."""
+        with pytest.raises(ValueError, match="Missing weights"):
+            GroundMotionSuite(motions, {"a": 1.0})
+        with pytest.raises(ValueError, match="Expected 2 weights"):
+            GroundMotionSuite(motions, [1.0])
+        with pytest.raises(ValueError, match="non-negative"):
+            GroundMotionSuite(motions, [1.0, -1.0])
+        with pytest.raises(ValueError, match="at least one"):
+            GroundMotionSuite({})
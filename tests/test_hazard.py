@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from pyslammer.ground_motion import GroundMotionSuite
+from pyslammer.hazard import discretize_ky, displacement_hazard
+from pyslammer.rigid_analysis import RigidAnalysis
+
+
+@pytest.fixture(scope="module")
+def suite(suite_motions):
+    """Build a weighted suite of four sample records."""
+    return GroundMotionSuite(suite_motions, [0.1, 0.2, 0.3, 0.4])
+
+
+class TestDisplacementHazard:
+    """Test suite for the displacement hazard engine."""
+
+    def test_matches_direct_summation(self, suite):
+        """Test the hazard curve against a loop over all analyses."""
+        kys, ky_weights = [0.05, 0.1, 0.2], [1, 2, 1]
+        scale_levels, scale_weights = [0.5, 1.0], [0.7, 0.3]
+        hazard = displacement_hazard(
+            suite,
+            kys,
+            scale_levels,
+            ky_weights=ky_weights,
+            scale_weights=scale_weights,
+            chunk_size=3,
+        )
+
+        expected = np.zeros(len(hazard.displacement))
+        for _, motion, weight in suite:
+            for scale, scale_weight in zip(scale_levels, scale_weights):
+                for ky, ky_weight in zip(kys, np.array(ky_weights) / 4):
+                    disp = RigidAnalysis(ky, motion, scale_factor=scale).max_sliding_disp
+                    expected += weight * scale_weight * ky_weight * (
+                        disp > hazard.displacement
+                    )
+        np.testing.assert_allclose(hazard.exceedance, expected, atol=1e-12)
+        assert hazard.analyses == 4 * 2 * 3
+        assert hazard.total_weight == pytest.approx(1.0)
+        assert np.all(np.diff(hazard.exceedance) <= 1e-12)
+        np.testing.assert_allclose(
+            hazard.ky_weights @ hazard.exceedance_by_ky, hazard.exceedance
+        )
+
+    def test_ky_distribution_and_target_pga(self, suite):
+        """Test a discretized ky distribution with target PGA scale levels."""
+        distribution = stats.lognorm(0.3, scale=0.15)
+        hazard = displacement_hazard(
+            suite, distribution, [0.3, 0.6], ky_points=5, scale_type="target_pga"
+        )
+        kys, weights = discretize_ky(distribution, 5)
+        np.testing.assert_allclose(hazard.ky, kys)
+        np.testing.assert_allclose(weights, 0.2)
+        assert np.median(kys) == pytest.approx(0.15)
+        # Exceedance grows with the scale level
+        low = displacement_hazard(suite, kys, [0.3], scale_type="target_pga")
+        high = displacement_hazard(suite, kys, [0.6], scale_type="target_pga")
+        assert np.all(high.exceedance >= low.exceedance)
+        np.testing.assert_allclose(
+            hazard.exceedance, 0.5 * (low.exceedance + high.exceedance), atol=1e-12
+        )
+
+    def test_decoupled_processes(self, suite, site):
+        """Test that the decoupled response is computed once per unit."""
+        kwargs = dict(method="decoupled", displacements=[0.01, 0.1], **site)
+        threads = displacement_hazard(suite, [0.1, 0.2, 0.3], **kwargs)
+        processes = displacement_hazard(
+            suite, [0.1, 0.2, 0.3], executor="process", max_workers=2, **kwargs
+        )
+        assert threads.full_analyses == len(suite)
+        assert threads.analyses == 3 * len(suite)
+        np.testing.assert_allclose(processes.exceedance, threads.exceedance)
+        assert threads.exceedance_at(0.01) == pytest.approx(threads.exceedance[0])
+
+    def test_invalid_arguments(self, suite):
+        """Test ValueError for invalid options and weights."""
+        with pytest.raises(ValueError, match="Unknown analysis method"):
+            displacement_hazard(suite, 0.1, method="newmark")
+        with pytest.raises(ValueError, match="scale_type"):
+            displacement_hazard(suite, 0.1, scale_type="pgv")
+        with pytest.raises(ValueError, match="ky_weights"):
+            displacement_hazard(suite, [0.1, 0.2], ky_weights=[1.0])
+        with pytest.raises(ValueError, match="executor"):
+            displacement_hazard(suite, 0.1, executor="cluster")
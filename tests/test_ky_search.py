@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from pyslammer.batch import ANALYSIS_METHODS
+from pyslammer.decoupled_analysis import Decoupled
+from pyslammer.ky_search import critical_ky, critical_ky_batch, ky_sweep
+from pyslammer.rigid_analysis import RigidAnalysis
+
+
+@pytest.fixture(scope="module")
+def ground_motion(sample_motions):
+    """Load a sample record."""
+    return sample_motions["Landers_1992_LCN-345"]
+
+
+class TestKySweep:
+    """Test suite for the adaptive displacement-versus-ky sweep."""
+
+    def test_rigid_thresholds(self, ground_motion):
+        """Test that the inverted kys bracket the thresholds within ky_rtol."""
+        sweep = ky_sweep(ground_motion, ky_rtol=0.01)
+        assert not np.any(np.isnan(sweep.ky_at_threshold))
+        assert np.all(np.diff(sweep.ky_at_threshold) < 0)
+        for ky, threshold in zip(sweep.ky_at_threshold, sweep.thresholds):
+            below = RigidAnalysis(ky * 0.99, ground_motion).max_sliding_disp
+            above = RigidAnalysis(ky * 1.01, ground_motion).max_sliding_disp
+            assert below > threshold > above
+
+    def test_fewer_analyses_than_uniform_grid(self, ground_motion):
+        """Test an order of magnitude fewer analyses than a 1% uniform grid."""
+        sweep = ky_sweep(ground_motion, ky_rtol=0.01)
+        uniform = np.log(ground_motion.pga / 0.01) / np.log(1.01)
+        assert sweep.analyses < uniform / 5
+        assert sweep.analyses == len(sweep.ky)
+        assert sweep.ky[-1] == pytest.approx(ground_motion.pga)
+        assert sweep.displacement[-1] == pytest.approx(0, abs=1e-12)
+
+    def test_curve_interpolation(self, ground_motion):
+        """Test that the curve interpolates between the computed points."""
+        sweep = ky_sweep(ground_motion)
+        np.testing.assert_allclose(
+            sweep.displacement_at(sweep.ky),
+            np.minimum.accumulate(sweep.displacement),
+            atol=1e-12,
+        )
+        assert sweep.ky_for(sweep.thresholds) == pytest.approx(sweep.ky_at_threshold)
+        assert np.isnan(sweep.ky_for(1000.0)[0])
+
+    def test_flexible_method(self, ground_motion, site):
+        """Test a decoupled sweep with an automatic upper bound of ky."""
+        sweep = ky_sweep(ground_motion, "decoupled", thresholds=[0.15], **site)
+        assert sweep.method == "decoupled"
+        assert sweep.displacement[-1] < sweep.min_displacement
+        (ky,) = sweep.ky_at_threshold
+        below = Decoupled(ky * 0.99, ground_motion, **site).max_sliding_disp
+        above = Decoupled(ky * 1.01, ground_motion, **site).max_sliding_disp
+        assert below > 0.15 > above
+
+    def test_max_analyses(self, ground_motion):
+        """Test that the number of analyses is capped."""
+        sweep = ky_sweep(ground_motion, ky_rtol=1e-6, max_analyses=20)
+        assert sweep.analyses == 20
+
+    def test_invalid_arguments(self, ground_motion):
+        """Test ValueError for unknown methods and empty ky ranges."""
+        with pytest.raises(ValueError, match="Unknown analysis method"):
+            ky_sweep(ground_motion, "newmark")
+        with pytest.raises(ValueError, match="ky_min"):
+            ky_sweep(ground_motion, ky_min=0.5, ky_max=0.2)
+
+
+class TestCriticalKy:
+    """Test suite for the critical yield acceleration search."""
+
+    @pytest.mark.parametrize(
+        "method, flexible",
+        [("rigid", False), ("decoupled", True), ("coupled", True)],
+    )
+    def test_critical_ky(self, ground_motion, site, method, flexible):
+        """Test that the displacement at the critical ky equals the target."""
+        params = site if flexible else {}
+        result = critical_ky(ground_motion, 0.15, method, ky_rtol=1e-3, **params)
+        assert result.converged
+        assert result.ky_lower <= result.ky <= result.ky_upper
+        assert result.ky_upper <= result.ky_lower * (1 + 1e-3)
+        assert result.displacement_lower >= 0.15 > result.displacement_upper
+        analysis = ANALYSIS_METHODS[method](result.ky, ground_motion, **params)
+        assert analysis.max_sliding_disp == pytest.approx(0.15, rel=1e-3)
+        assert result.analyses < 30
+
+    def test_decoupled_reuses_response(self, ground_motion, site):
+        """Test that the decoupled dynamic response is computed once."""
+        result = critical_ky(ground_motion, 0.05, "decoupled", **site)
+        assert result.full_analyses == 1
+        assert result.analyses > 1
+
+    def test_target_not_bracketed(self, ground_motion):
+        """Test results for targets outside the range of displacements."""
+        too_large = critical_ky(ground_motion, 100.0)
+        assert np.isnan(too_large.ky) and np.isnan(too_large.ky_lower)
+        assert too_large.ky_upper == 0.001
+        too_small = critical_ky(ground_motion, 0.05, ky_max=0.1)
+        assert np.isnan(too_small.ky) and np.isnan(too_small.ky_upper)
+        assert not too_small.converged
+        with pytest.raises(ValueError):
+            critical_ky(ground_motion, 0.0)
+
+    def test_batch(self, sample_motions):
+        """Test that a batch matches the per-motion searches."""
+        motions = sample_motions
+        names = ["Landers_1992_LCN-345", "Loma_Prieta_1989_HSP-000"]
+        results = critical_ky_batch(
+            {name: motions[name] for name in names}, 0.05, max_workers=2
+        )
+        assert list(results) == names
+        for name in names:
+            assert results[name] == critical_ky(motions[name], 0.05)
+        with pytest.raises(ValueError):
+            critical_ky_batch(motions, 0.05, executor="cluster")
@@ -109,3 +109,86 @@ class TestRigidAnalysis:
             isinstance(arr, np.ndarray)
             for arr in [ra._block_acc_, ra.sliding_vel, ra.sliding_disp]
         )
+
+
+class TestExactIntegration:
+    """Test suite for the exact segment integration of the rigid block."""
+
+    @pytest.fixture
+    def ground_motion(self):
+        """Load a sample record."""
+        from pyslammer.utilities import sample_ground_motions
+
+        return sample_ground_motions()["Northridge_1994_PAC-175"]
+
+    @staticmethod
+    def upsample(ground_motion, factor):
+        """Linearly interpolate a record, which does not change the exact result."""
+        t = np.arange(ground_motion._npts) * ground_motion.dt
+        fine_t = np.arange((ground_motion._npts - 1) * factor + 1) * (
+            ground_motion.dt / factor
+        )
+        return GroundMotion(
+            np.interp(fine_t, t, ground_motion.accel), ground_motion.dt / factor
+        )
+
+    @pytest.mark.parametrize("ky", [0.05, 0.2])
+    def test_invariant_to_linear_upsampling(self, ground_motion, ky):
+        """Test that the result is exact for a piecewise linear acceleration."""
+        exact = RigidAnalysis(ky, ground_motion, integration="exact")
+        fine = RigidAnalysis(
+            ky, self.upsample(ground_motion, 10), integration="exact"
+        )
+        assert fine.max_sliding_disp == pytest.approx(exact.max_sliding_disp, rel=1e-9)
+        np.testing.assert_allclose(
+            fine.sliding_disp[::10], exact.sliding_disp, rtol=0, atol=1e-12
+        )
+
+    @pytest.mark.parametrize("ky", [0.05, 0.2])
+    def test_matches_trapezoidal(self, ground_motion, ky):
+        """Test that the trapezoidal integration converges to the exact result."""
+        exact = RigidAnalysis(ky, ground_motion, integration="exact")
+        trapezoidal = RigidAnalysis(ky, self.upsample(ground_motion, 10))
+        assert trapezoidal.max_sliding_disp == pytest.approx(
+            exact.max_sliding_disp, rel=1e-3
+        )
+        np.testing.assert_allclose(
+            trapezoidal.sliding_disp[::10], exact.sliding_disp, atol=1e-4
+        )
+
+    def test_decimated_record(self, sample_motions):
+        """Test velocity dips below zero between samples of a coarse record."""
+        landers = sample_motions["Landers_1992_LCN-345"]
+        coarse = GroundMotion(landers.accel[::4], landers.dt * 4)
+        exact = RigidAnalysis(0.05, coarse, integration="exact")
+        fine = RigidAnalysis(0.05, self.upsample(coarse, 50), integration="exact")
+        assert exact.max_sliding_disp == pytest.approx(fine.max_sliding_disp, rel=1e-9)
+        np.testing.assert_allclose(
+            exact.sliding_disp, fine.sliding_disp[::50], rtol=0, atol=1e-12
+        )
+
+    def test_rough_records(self):
+        """Test random records whose relative acceleration changes every step."""
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            rough = GroundMotion(rng.normal(0.0, 0.3, 60), 0.02)
+            exact = RigidAnalysis(0.1, rough, integration="exact")
+            fine = RigidAnalysis(0.1, self.upsample(rough, 200), integration="exact")
+            np.testing.assert_allclose(
+                exact.sliding_disp, fine.sliding_disp[::200], rtol=0, atol=1e-12
+            )
+            assert np.all(np.diff(exact.sliding_disp) >= 0)
+
+    def test_block_response(self, ground_motion):
+        """Test that the block moves with ky while sliding and is monotonic."""
+        analysis = RigidAnalysis(0.1, ground_motion, integration="exact")
+        sliding = analysis.sliding_vel > 0
+        assert sliding.any()
+        np.testing.assert_allclose(analysis._block_acc_[sliding], analysis._ky_)
+        assert np.all(np.diff(analysis.sliding_disp) >= 0)
+        assert np.all(analysis.sliding_vel >= 0)
+
+    def test_invalid_integration(self, ground_motion):
+        """Test ValueError for an unknown integration."""
+        with pytest.raises(ValueError, match="Unknown integration"):
+            RigidAnalysis(0.1, ground_motion, integration="euler")
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from pyslammer.batch import AnalysisTask, run_batch
+from pyslammer.batch_io import read_results
+from pyslammer.rigid_analysis import RigidAnalysis
+from pyslammer.screening import (
+    DisplacementScreen,
+    bray_travasarou_2007,
+    jibson_2007,
+    saygili_rathje_2008,
+)
+
+
+class TestDisplacementModels:
+    """Test suite for the empirical displacement models."""
+
+    def test_published_values(self):
+        """Test the models against hand calculations of the published equations."""
+        # Jibson (2007) eq. 6 with ky / PGA = 0.25
+        jibson = jibson_2007(0.1, 0.4)
+        expected = 10 ** (0.215 + 2.341 * np.log10(0.75) - 1.438 * np.log10(0.25))
+        assert jibson.median == pytest.approx(expected / 100)
+        assert jibson.sigma == pytest.approx(0.510 * np.log(10))
+        # Saygili and Rathje (2008) PGA-PGV model with PGV = 30 cm/s
+        saygili = saygili_rathje_2008(0.1, 0.4, pgv=0.3)
+        r = 0.25
+        ln_d = (
+            -1.56 - 4.58 * r - 20.84 * r**2 + 44.75 * r**3 - 30.50 * r**4
+            - 0.64 * np.log(0.4) + 1.55 * np.log(30)
+        )
+        assert saygili.median == pytest.approx(np.exp(ln_d) / 100)
+        assert saygili.sigma == pytest.approx(0.405 + 0.524 * r)
+        # Bray and Travasarou (2007) for a rigid mass, M 7
+        bray = bray_travasarou_2007(0.1, 0.4, 0.0, 7.0)
+        ln_ky, ln_sa = np.log(0.1), np.log(0.4)
+        ln_d = (
+            -0.22 - 2.83 * ln_ky - 0.333 * ln_ky**2 + 0.566 * ln_ky * ln_sa
+            + 3.04 * ln_sa - 0.244 * ln_sa**2
+        )
+        assert bray.median == pytest.approx(np.exp(ln_d) / 100)
+        assert 0 < bray.p_zero < 0.5
+
+    def test_vectorized(self):
+        """Test broadcasting over ky and motions, and zero displacement above PGA."""
+        ky = np.array([0.05, 0.1, 0.2, 0.5])[:, None]
+        pga = np.array([0.3, 0.6])
+        prediction = saygili_rathje_2008(ky, pga, pgv=np.array([0.2, 0.5]))
+        assert prediction.median.shape == (4, 2)
+        assert np.all(np.diff(prediction.median, axis=0) <= 0)
+        assert prediction.median[3, 0] == 0
+        assert prediction.exceedance(0.01)[3, 0] == 0
+        jibson = jibson_2007(ky, pga)
+        assert np.all(jibson.exceedance(0.01) >= jibson.exceedance(0.1))
+
+    def test_missing_inputs(self):
+        """Test ValueError for unknown models and missing intensity measures."""
+        with pytest.raises(ValueError, match="model must be"):
+            jibson_2007(0.1, 0.4, model="pgv")
+        with pytest.raises(ValueError, match="arias_intensity"):
+            jibson_2007(0.1, 0.4, model="arias")
+        with pytest.raises(ValueError, match="pgv"):
+            saygili_rathje_2008(0.1, 0.4)
+
+
+class TestDisplacementScreen:
+    """Test suite for screening batches with an empirical model."""
+
+    def test_prefilter(self, suite_motions):
+        """Test that only tasks near the threshold run full analyses."""
+        kys = np.geomspace(0.02, 0.8, 12)
+        tasks = [
+            AnalysisTask("rigid", name, float(ky))
+            for name in suite_motions
+            for ky in kys
+        ]
+        screen = DisplacementScreen(0.05)
+        records = run_batch(tasks, suite_motions, executor="thread", prefilter=screen)
+        assert [record["task_id"] for record in records] == [
+            task.task_id for task in tasks
+        ]
+        screened = [record for record in records if record["screened"]]
+        run = [record for record in records if not record["screened"]]
+        assert screened and run
+        for record in run:
+            expected = RigidAnalysis(record["ky"], suite_motions[record["motion"]])
+            assert record["max_sliding_disp"] == expected.max_sliding_disp
+        # Screened decisions agree with the analyses.
+        for record in screened:
+            actual = RigidAnalysis(record["ky"], suite_motions[record["motion"]])
+            assert (record["max_sliding_disp"] > 0.05) == (
+                actual.max_sliding_disp > 0.05
+            )
+
+    def test_scaled_tasks(self, suite_motions):
+        """Test that intensity measures follow the scaling of the tasks."""
+        name = list(suite_motions)[0]
+        screen = DisplacementScreen(0.05, model="jibson_2007", variant="arias_ratio")
+        tasks = [
+            AnalysisTask("rigid", name, 0.1, {"scale_factor": 2.0}),
+            AnalysisTask(
+                "rigid", name, 0.1, {"target_pga": 2 * suite_motions[name].pga}
+            ),
+            AnalysisTask("rigid", name, 0.1, {"scale_factor": 2.0, "inverse": True}),
+        ]
+        prediction = screen.predict(tasks, suite_motions)
+        assert prediction.median[0] == pytest.approx(prediction.median[1])
+        assert prediction.median[0] == pytest.approx(prediction.median[2])
+        records = screen(tasks, suite_motions)
+        assert records[2]["scale_factor"] == -2.0
+        assert all(type(record["scale_factor"]) is float for record in records)
+
+    def test_flexible_screen_and_output(self, suite_motions, site, tmp_path):
+        """Test Bray and Travasarou screening of decoupled tasks to disk."""
+        tasks = [
+            AnalysisTask("decoupled", name, ky, site)
+            for name in suite_motions
+            for ky in (0.02, 0.1, 0.6)
+        ]
+        magnitudes = dict(zip(suite_motions, (7.3, 6.9, 6.7, 7.1)))
+        screen = DisplacementScreen(
+            0.05, model="bray_travasarou_2007", magnitude=magnitudes
+        )
+        run_batch(
+            tasks,
+            suite_motions,
+            executor="thread",
+            output=tmp_path,
+            prefilter=screen,
+        )
+        columns = read_results(tmp_path)
+        assert len(columns["task_id"]) == len(tasks)
+        assert columns["screened"].dtype == bool
+        with pytest.raises(ValueError, match="magnitude"):
+            DisplacementScreen(0.05, model="bray_travasarou_2007").predict(
+                tasks, suite_motions
+            )
+
+    def test_invalid_arguments(self):
+        """Test ValueError for unknown models, bands and thresholds."""
+        with pytest.raises(ValueError, match="model must be"):
+            DisplacementScreen(0.05, model="newmark")
+        with pytest.raises(ValueError, match="variant"):
+            DisplacementScreen(0.05, model="bray_travasarou_2007", variant="pga")
+        with pytest.raises(ValueError, match="band"):
+            DisplacementScreen(0.05, band=(0.9, 0.1))
+        with pytest.raises(ValueError, match="threshold"):
+            DisplacementScreen(0.0)
@@ -0,0 +1,122 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pyslammer.batch import AnalysisTask, run_batch
+from pyslammer.batch_io import read_results
+from pyslammer.sharding import (
+    build_manifest,
+    load_manifest,
+    load_motions,
+    merge_shards,
+    motion_fingerprint,
+    run_shard,
+    shard_tasks,
+    write_manifest,
+)
+
+
+class TestShardManifest:
+    """Test suite for task manifests and sharding."""
+
+    @pytest.fixture
+    def motion_dir(self, tmp_path):
+        """Write two ground motion CSV files."""
+        t = np.arange(0, 4, 0.01)
+        directory = tmp_path / "motions"
+        directory.mkdir()
+        for name, accel in [
+            ("sine", 0.5 * np.sin(2 * np.pi * t)),
+            ("cosine", 0.3 * np.cos(3 * np.pi * t)),
+        ]:
+            data = np.column_stack([t, accel])
+            np.savetxt(directory / f"{name}.csv", data, delimiter=",")
+        return directory
+
+    @pytest.fixture
+    def motions(self, motion_dir):
+        """Load the ground motions from disk."""
+        return load_motions(motion_dir)
+
+    @pytest.fixture
+    def tasks(self, motions):
+        """Create a sweep of rigid and decoupled tasks."""
+        tasks = [
+            AnalysisTask("rigid", key, ky) for key in motions for ky in (0.05, 0.1, 0.2)
+        ]
+        site = {"height": 30.0, "vs_slope": 400.0, "vs_base": 400.0, "damp_ratio": 0.1}
+        tasks.append(AnalysisTask("decoupled", "sine", 0.1, site))
+        return tasks
+
+    def test_manifest_is_deterministic(self, tasks, motions, tmp_path):
+        """Test that task order does not change the manifest file."""
+        a = write_manifest(build_manifest(tasks, motions), tmp_path / "a.json")
+        b = write_manifest(build_manifest(tasks[::-1], motions), tmp_path / "b.json")
+        assert a.read_bytes() == b.read_bytes()
+        assert load_manifest(a)["motions"]["sine"] == motion_fingerprint(motions["sine"])
+
+    def test_shards_partition_tasks(self, tasks, motions):
+        """Test that shards cover every task exactly once."""
+        manifest = build_manifest(tasks, motions)
+        shards = [shard_tasks(manifest, i, 3) for i in range(3)]
+        ids = [task.task_id for shard in shards for task in shard]
+        assert sorted(ids) == sorted(task.task_id for task in tasks)
+        assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+    def test_fingerprint_mismatch(self, tasks, motions, tmp_path):
+        """Test ValueError when a worker has a different motion."""
+        manifest = build_manifest(tasks, motions)
+        altered = dict(motions, sine=load_motions()["Kobe_1995_TAK-090"])
+        with pytest.raises(ValueError, match="fingerprint"):
+            run_shard(manifest, 0, 1, altered, tmp_path, executor="thread")
+
+    def test_merge_detects_missing_shard(self, tasks, motions, tmp_path):
+        """Test that merging incomplete results fails."""
+        manifest = build_manifest(tasks, motions)
+        run_shard(manifest, 0, 2, motions, tmp_path, executor="thread")
+        with pytest.raises(ValueError, match="missing tasks"):
+            merge_shards(manifest, tmp_path)
+
+    def test_merge_refuses_existing_output(self, tasks, motions, tmp_path):
+        """Test that a repeated merge does not append to earlier results."""
+        manifest = build_manifest(tasks, motions)
+        results = tmp_path / "results"
+        run_shard(manifest, 0, 1, motions, results, executor="thread")
+        merge_shards(manifest, results, tmp_path / "merged")
+        with pytest.raises(ValueError, match="not empty"):
+            merge_shards(manifest, results, tmp_path / "merged")
+        assert len(read_results(tmp_path / "merged")["task_id"]) == len(tasks)
+
+    @pytest.mark.slow
+    def test_worker_processes_end_to_end(self, tasks, motions, motion_dir, tmp_path):
+        """Test independent CLI workers and merge against a single batch run."""
+        manifest = write_manifest(build_manifest(tasks, motions), tmp_path / "m.json")
+        results = tmp_path / "results"
+        cli = [sys.executable, "-m", "pyslammer.sharding_cli"]
+        workers = [
+            subprocess.Popen(
+                cli
+                + ["run", str(manifest), "--shard", str(i), "--num-shards", "2"]
+                + ["--motions", str(motion_dir), "--output", str(results)]
+                + ["--executor", "thread"]
+            )
+            for i in range(2)
+        ]
+        assert [worker.wait(timeout=120) for worker in workers] == [0, 0]
+        subprocess.run(
+            cli
+            + ["merge", str(manifest), "--input", str(results)]
+            + ["--output", str(tmp_path / "merged")],
+            check=True,
+        )
+
+        merged = read_results(tmp_path / "merged")
+        expected = {
+            r["task_id"]: r["max_sliding_disp"]
+            for r in run_batch(tasks, motions, executor="thread")
+        }
+        assert len(merged["task_id"]) == len(tasks)
+        for task_id, disp in zip(merged["task_id"], merged["max_sliding_disp"]):
+            assert disp == expected[task_id]
@@ -1,9 +1,14 @@
+import tracemalloc
+
 import numpy as np
 import pytest
 
 from pyslammer.constants import G_EARTH
+from pyslammer.coupled_analysis import Coupled
+from pyslammer.decoupled_analysis import Decoupled
 from pyslammer.ground_motion import GroundMotion
-from pyslammer.sliding_block_analysis import SlidingBlockAnalysis
+from pyslammer.rigid_analysis import RigidAnalysis
+from pyslammer.sliding_block_analysis import SlidingBlockAnalysis, instrumented
 from pyslammer.utilities import sample_ground_motions
 
 
@@ -295,3 +300,106 @@ class TestSlidingBlockAnalysis:
 
         # Verify that inverse has opposite scale factor
         assert sba_inverse.scale_factor == -sba_normal.scale_factor
+
+
+class TestInstrumentation:
+    """Test suite for phase timers, statistics and the instrumentation hook."""
+
+    FLEXIBLE = {
+        "height": 50.0,
+        "vs_slope": 600.0,
+        "vs_base": 600.0,
+        "damp_ratio": 0.05,
+        "ref_strain": 0.0005,
+        "soil_model": "equivalent_linear",
+    }
+
+    @pytest.fixture
+    def motion(self):
+        """Load a sample ground motion."""
+        return sample_ground_motions()["Chi-Chi_1999_TCU068-090"]
+
+    def test_disabled_by_default(self, motion):
+        """Test that analyses outside an instrumented block record nothing."""
+        analysis = RigidAnalysis(0.1, motion)
+        assert analysis.timings is None
+        assert analysis.stats is None
+
+    def test_rigid_timings(self, motion):
+        """Test phases and statistics of a rigid analysis."""
+        with instrumented():
+            analysis = RigidAnalysis(0.1, motion)
+        assert set(analysis.timings) == {"setup", "sliding", "total"}
+        assert analysis.timings["total"] >= analysis.timings["sliding"] > 0
+        assert analysis.stats["npts"] == len(motion.accel)
+        assert analysis.stats["sliding_episodes"] > 0
+
+    def test_equivalent_linear_coupled(self, motion):
+        """Test phases and iteration count of an equivalent linear analysis."""
+        with instrumented():
+            analysis = Coupled(0.1, motion, **self.FLEXIBLE)
+        assert set(analysis.timings) == {
+            "setup",
+            "equivalent_linear",
+            "dynamic_response",
+            "sliding",
+            "total",
+        }
+        assert analysis.stats["equivalent_linear_iterations"] > 1
+        assert analysis.timings["total"] >= sum(
+            value for key, value in analysis.timings.items() if key != "total"
+        )
+
+    def test_results_unchanged(self, motion):
+        """Test that instrumentation does not change the results."""
+        with instrumented():
+            instrumented_disp = Decoupled(0.1, motion, **self.FLEXIBLE).block_disp
+        assert np.array_equal(
+            instrumented_disp, Decoupled(0.1, motion, **self.FLEXIBLE).block_disp
+        )
+
+    def test_episodes(self):
+        """Test sliding episode counting on a motion with two pulses."""
+        accel = np.zeros(300)
+        accel[50:60] = 0.5
+        accel[200:210] = 0.5
+        with instrumented():
+            analysis = RigidAnalysis(0.1, GroundMotion(accel, 0.01))
+        assert analysis.stats["sliding_episodes"] == 2
+
+    def test_callback(self, motion):
+        """Test that the hook is called once per finished analysis."""
+        finished = []
+        with instrumented(finished.append):
+            rigid = RigidAnalysis(0.1, motion)
+            coupled = Coupled(0.1, motion, **self.FLEXIBLE)
+        RigidAnalysis(0.1, motion)
+        assert len(finished) == 2
+        assert finished[0] is rigid and finished[1] is coupled
+        assert "total" in finished[1].timings
+
+    @pytest.mark.slow
+    def test_memory_mode(self, motion):
+        """Test peak and retained bytes of a coupled analysis."""
+        Coupled(0.1, motion, **self.FLEXIBLE)  # compile kernels before tracing
+        with instrumented(memory=True):
+            analysis = Coupled(0.1, motion, **self.FLEXIBLE)
+        assert not tracemalloc.is_tracing()
+
+        by_attribute = analysis.stats["retained_bytes_by_attribute"]
+        array_bytes = motion.accel.nbytes
+        assert by_attribute["HEA"] == by_attribute["x_resp"] == array_bytes
+        assert by_attribute["ground_motion"] == array_bytes
+        # block_disp is the coupled displacement array s, counted once
+        assert by_attribute["block_disp"] + by_attribute["s"] == array_bytes
+        assert analysis.stats["retained_bytes"] == sum(by_attribute.values())
+        stats = analysis.stats
+        assert stats["peak_bytes"] >= stats["retained_bytes"] - array_bytes
+
+    def test_memory_usage_without_instrumentation(self, motion):
+        """Test that memory_usage works on any analysis."""
+        analysis = RigidAnalysis(0.1, motion)
+        assert analysis.stats is None
+        usage = analysis.memory_usage()
+        assert set(usage) >= {"a_in", "sliding_disp", "ground_motion"}
+        assert list(usage.values()) == sorted(usage.values(), reverse=True)
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+from pyslammer.batch import AnalysisTask, run_batch
+from pyslammer.rigid_analysis import RigidAnalysis
+from pyslammer.surrogate import train_surrogate
+
+
+@pytest.fixture(scope="module")
+def training_tasks(sample_motions):
+    """Rigid tasks over random kys and scale factors of every sample record."""
+    rng = np.random.default_rng(0)
+    return [
+        AnalysisTask("rigid", name, float(ky), {"scale_factor": float(scale)})
+        for name in sorted(sample_motions)
+        for ky, scale in zip(rng.uniform(0.03, 0.4, 12), rng.uniform(0.5, 2.0, 12))
+    ]
+
+
+@pytest.fixture(scope="module")
+def surrogate(sample_motions, training_tasks):
+    """Train a rigid surrogate."""
+    return train_surrogate(training_tasks, sample_motions, seed=0)
+
+
+class TestDisplacementSurrogate:
+    """Test suite for the Gaussian process displacement surrogate."""
+
+    def test_validation(self, surrogate, training_tasks):
+        """Test that the validation error is reported and small."""
+        assert surrogate.method == "rigid"
+        assert surrogate.feature_names[0] == "ky_ratio"
+        assert surrogate.n_train == len(training_tasks)
+        assert surrogate.validation["n"] == round(0.2 * len(training_tasks))
+        assert surrogate.validation["r2"] > 0.8
+        assert surrogate.validation["mae"] < 0.5
+
+    def test_predictions_match_analyses(self, surrogate, sample_motions):
+        """Test in-domain predictions against full analyses."""
+        tasks = [AnalysisTask("rigid", name, 0.1) for name in sorted(sample_motions)]
+        prediction = surrogate.predict(tasks, sample_motions)
+        assert prediction.in_domain.all()
+        assert not prediction.analysed.any()
+        expected = np.array(
+            [
+                RigidAnalysis(0.1, sample_motions[t.motion]).max_sliding_disp
+                for t in tasks
+            ]
+        )
+        error = np.log(prediction.displacement + 1e-4) - np.log(expected + 1e-4)
+        assert np.median(np.abs(error)) < 0.3
+
+    def test_fallback(self, surrogate, sample_motions):
+        """Test that tasks outside the training domain are analysed in full."""
+        name = "Landers_1992_LCN-345"
+        tasks = [
+            AnalysisTask("rigid", name, 0.1),
+            AnalysisTask("rigid", name, 0.1, {"scale_factor": 5.0}),
+            AnalysisTask("decoupled", name, 0.1, {"height": 50.0, "vs_slope": 600.0}),
+        ]
+        prediction = surrogate.predict(tasks[:2], sample_motions)
+        np.testing.assert_array_equal(prediction.in_domain, [True, False])
+        np.testing.assert_array_equal(prediction.analysed, [False, True])
+        assert prediction.displacement[1] == (
+            RigidAnalysis(0.1, sample_motions[name], scale_factor=5.0).max_sliding_disp
+        )
+        assert prediction.log_std[1] == 0
+        assert not surrogate.in_domain(tasks[2:], sample_motions)[0]
+        # Without fallback, every task is predicted.
+        unchecked = surrogate.predict(tasks[:2], sample_motions, fallback=False)
+        assert not unchecked.analysed.any()
+        # A tight uncertainty tolerance falls back everywhere.
+        strict = surrogate.predict(tasks[:1], sample_motions, max_log_std=0.0)
+        assert strict.analysed.all()
+
+    def test_site_parameters_are_features(self, sample_motions):
+        """Test training a decoupled surrogate on given records."""
+        names = ["Landers_1992_LCN-345", "Northridge_1994_PAC-175"]
+        tasks = [
+            AnalysisTask(
+                "decoupled",
+                name,
+                ky,
+                {"height": 50.0, "vs_slope": vs, "vs_base": 600.0, "damp_ratio": 0.05},
+            )
+            for name in names
+            for ky in (0.05, 0.1, 0.2)
+            for vs in (300.0, 600.0)
+        ]
+        records = run_batch(tasks, sample_motions, executor="thread")
+        surrogate = train_surrogate(
+            tasks, sample_motions, records=records, validation_fraction=0.0
+        )
+        assert surrogate.feature_names[-4:] == [
+            "damp_ratio",
+            "height",
+            "vs_base",
+            "vs_slope",
+        ]
+        assert surrogate.validation == {}
+        prediction = surrogate.predict(tasks, sample_motions, fallback=False)
+        observed = np.array([record["max_sliding_disp"] for record in records])
+        np.testing.assert_allclose(
+            np.log(prediction.displacement + 1e-4), np.log(observed + 1e-4), atol=0.5
+        )
+
+    def test_invalid_arguments(self, sample_motions, training_tasks):
+        """Test ValueError for mixed methods, missing records and bad fractions."""
+        coupled = AnalysisTask("coupled", "Landers_1992_LCN-345", 0.1)
+        mixed = [training_tasks[0], coupled]
+        with pytest.raises(ValueError, match="mix methods"):
+            train_surrogate(mixed, sample_motions)
+        with pytest.raises(ValueError, match="No records"):
+            train_surrogate(training_tasks[:5], sample_motions, records=[])
+        with pytest.raises(ValueError, match="validation_fraction"):
+            train_surrogate(training_tasks[:5], sample_motions, validation_fraction=1.0)
+        with pytest.raises(ValueError, match="four tasks"):
+            train_surrogate(training_tasks[:3], sample_motions)
+
+    def test_rejects_screened_records(self, sample_motions, training_tasks):
+        """Test ValueError when records were predicted by a screen."""
+        tasks = training_tasks[:4]
+        records = run_batch(tasks, sample_motions, executor="thread")
+        records[1] = dict(records[1], screened=True)
+        with pytest.raises(ValueError, match="screened"):
+            train_surrogate(tasks, sample_motions, records=records)
+
+    def test_small_validation_split(self, sample_motions, training_tasks):
+        """Test that a small batch keeps two results for training and validation."""
+        tasks = training_tasks[:5]
+        records = [
+            {"task_id": task.task_id, "max_sliding_disp": 0.0, "screened": False}
+            for task in tasks
+        ]
+        surrogate = train_surrogate(
+            tasks, sample_motions, records=records, validation_fraction=0.9, seed=0
+        )
+        assert surrogate.validation["n"] == 3
+        # Constant held-out results leave r2 undefined.
+        assert np.isnan(surrogate.validation["r2"])
+        surrogate = train_surrogate(
+            tasks, sample_motions, records=records, validation_fraction=0.01, seed=0
+        )
+        assert surrogate.validation["n"] == 2
+
+    def test_train_samples_cap(self, sample_motions, training_tasks):
+        """Test that the final fit is subsampled to max_train_samples."""
+        surrogate = train_surrogate(
+            training_tasks, sample_motions, max_train_samples=20, seed=0
+        )
+        assert surrogate.n_train == 20
+        assert surrogate._gp.x.shape == (20, len(surrogate.feature_names))
+        # Predictions are computed in blocks of test points.
+        x = np.tile(surrogate._gp.x, (120, 1))
+        mean, std = surrogate._gp.predict(x)
+        np.testing.assert_allclose(mean, np.tile(mean[:20], 120))
+        np.testing.assert_allclose(std, np.tile(std[:20], 120))
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from pyslammer.uncertainty import propagate_uncertainty
+
+
+@pytest.fixture(scope="module")
+def ground_motion(sample_motions):
+    """Load a sample record."""
+    return sample_motions["Landers_1992_LCN-345"]
+
+
+class TestPropagateUncertainty:
+    """Test suite for Monte Carlo uncertainty propagation."""
+
+    def test_latin_hypercube_rounds(self, ground_motion, site):
+        """Test that each round stratifies every parameter."""
+        distributions = {
+            "ky": stats.uniform(0.05, 0.2),
+            "vs_slope": stats.uniform(400, 400),
+        }
+        fixed = {key: value for key, value in site.items() if key != "vs_slope"}
+        result = propagate_uncertainty(
+            ground_motion,
+            distributions,
+            round_size=16,
+            min_rounds=2,
+            max_samples=32,
+            rtol=0.0,
+            seed=0,
+            **fixed,
+        )
+        assert result.n == 32
+        assert not result.converged
+        assert len(result.history) == 2
+        for name, distribution in distributions.items():
+            for round_number in range(2):
+                values = result.samples[name][result.rounds == round_number]
+                strata = np.floor(distribution.cdf(values) * 16)
+                assert sorted(strata) == list(range(16))
+
+    def test_reproducible(self, ground_motion):
+        """Test that a seed reproduces the samples regardless of the workers."""
+        kwargs = dict(
+            distributions={"ky": stats.lognorm(0.3, scale=0.1)},
+            method="rigid",
+            round_size=8,
+            max_samples=16,
+            seed=42,
+        )
+        first = propagate_uncertainty(ground_motion, max_workers=1, **kwargs)
+        second = propagate_uncertainty(ground_motion, max_workers=2, **kwargs)
+        np.testing.assert_array_equal(first.samples["ky"], second.samples["ky"])
+        np.testing.assert_array_equal(first.displacement, second.displacement)
+        other = propagate_uncertainty(ground_motion, **{**kwargs, "seed": 43})
+        assert not np.array_equal(first.samples["ky"], other.samples["ky"])
+
+    @pytest.mark.parametrize("sampler", ["lhs", "sobol"])
+    def test_stops_when_converged(self, ground_motion, sampler):
+        """Test that sampling stops once the standard errors meet the tolerance."""
+        result = propagate_uncertainty(
+            ground_motion,
+            {"ky": stats.lognorm(0.3, scale=0.1)},
+            method="rigid",
+            sampler=sampler,
+            round_size=32,
+            rtol=0.02,
+            thresholds=[0.1],
+            seed=1,
+        )
+        assert result.converged
+        assert result.n < 4096
+        assert result.history[-1]["n"] == result.n
+        assert result.standard_errors["mean"] <= 0.02 * result.statistics["mean"]
+        assert result.statistics["q50"] == pytest.approx(result.quantile(0.5))
+        assert result.statistics["p_exceed_0.1"] == pytest.approx(
+            result.exceedance(0.1)
+        )
+
+    def test_invalid_arguments(self, ground_motion, site):
+        """Test ValueError for invalid samplers and parameters."""
+        ky = {"ky": stats.uniform(0.05, 0.1)}
+        with pytest.raises(ValueError, match="sampler"):
+            propagate_uncertainty(ground_motion, ky, sampler="halton", **site)
+        with pytest.raises(ValueError, match="power of two"):
+            propagate_uncertainty(ground_motion, ky, sampler="sobol", round_size=10)
+        with pytest.raises(ValueError, match="both uncertain and fixed"):
+            propagate_uncertainty(ground_motion, ky, ky=0.1)
+        with pytest.raises(ValueError, match="ky must be given"):
+            propagate_uncertainty(ground_motion, {"height": stats.uniform(30, 40)})
@@ -42,6 +42,8 @@ class VerificationResults:
     rigid: MethodResults
     decoupled: MethodResults
     coupled: MethodResults
+    validation_time: float = 0.0
+    validated_records: int = 0
 
 
 def get_pyslammer_version(requested_version: Optional[str] = None) -> str:
@@ -99,27 +101,21 @@ def calculate_individual_pass_rate(expected: np.ndarray, actual: np.ndarray, con
     """Calculate individual test pass rate based on tolerances."""
     tol = config["tolerances"]
     small_threshold = tol["value_dependent"]["small_displacement_threshold"]
-    
-    passes = 0
-    total = len(expected)
-    
-    for exp, act in zip(expected, actual):
-        abs_error = abs(act - exp)
-        
-        if abs(exp) <= small_threshold:
-            # Use absolute tolerance for small values
-            small_abs_tol = tol["value_dependent"]["small_displacement_absolute"]
-            passed = abs_error <= small_abs_tol
-        else:
-            # Use relative and absolute tolerance for larger values
-            rel_error = abs_error / abs(exp) if exp != 0 else float('inf')
-            passed = (rel_error <= tol["default_relative"] and 
-                     abs_error <= tol["default_absolute"])
-        
-        if passed:
-            passes += 1
-    
-    return (passes / total) * 100
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+
+    abs_error = np.abs(actual - expected)
+    small = np.abs(expected) <= small_threshold
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_error = np.where(expected != 0, abs_error / np.abs(expected), np.inf)
+
+    # Use absolute tolerance for small values, relative and absolute otherwise
+    passed = np.where(
+        small,
+        abs_error <= tol["value_dependent"]["small_displacement_absolute"],
+        (rel_error <= tol["default_relative"]) & (abs_error <= tol["default_absolute"]),
+    )
+    return float(np.mean(passed) * 100)
 
 
 def run_verification_tests(version: str) -> VerificationResults:
@@ -172,7 +168,9 @@ def run_verification_tests(version: str) -> VerificationResults:
         slammer_version="1.1",  # This should come from reference data
         rigid=method_results["rigid"],
         decoupled=method_results["decoupled"], 
-        coupled=method_results["coupled"]
+        coupled=method_results["coupled"],
+        validation_time=data_manager.schema_validator.validation_time,
+        validated_records=data_manager.schema_validator.validated_records,
     )
 
 
@@ -258,7 +256,12 @@ def test_generate_verification_report(verification_results, tmp_path):
     permanent_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Save to permanent location
-    saved_path = save_report(verification_results, permanent_path)
+    saved_path = save_report(
+        verification_results,
+        permanent_path,
+        validation_time=verification_results.validation_time,
+        validated_records=verification_results.validated_records,
+    )
     print(f"Verification report saved to: {saved_path}")
     
     assert saved_path.exists(), f"Report not generated at {saved_path}"
@@ -6,12 +6,43 @@ This module provides comprehensive test coverage for the verification system
 and integration with CI/CD pipelines.
 """
 
+import gzip
+import importlib.util
 import json
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
 
 import pytest
 from verification.comparisons import ComparisonEngine, ConfigManager, VerificationSummary
+from verification.config.generate_report import (
+    MethodResults,
+    VerificationResults,
+    find_previous_version,
+    generate_performance_section,
+    load_performance_section,
+    load_result_analyses,
+    save_report,
+    summarize_performance,
+)
 from verification.data_loader import DataManager
-from verification.schemas import VerificationData
+from verification.fingerprints import (
+    ENGINE_MODULES,
+    engine_fingerprint,
+    module_dependencies,
+)
+from verification.generate_pyslammer_verification_results import (
+    _call_with_timeout,
+    run_verification_analyses,
+)
+from verification.schemas import (
+    AnalysisRecord,
+    SchemaValidator,
+    ValidationError,
+    VerificationData,
+)
 
 
 class TestVerificationFramework:
@@ -90,11 +121,63 @@ class TestDataManagement(TestVerificationFramework):
         assert key1 == key2  # Should be deterministic
         assert len(key1) == 16  # Should be 16 character hash
 
-        # Different version should produce different key
+        # Code-keyed results do not depend on the version string
+        assert data_manager.cache_key_strategy == "code"
+        assert data_manager.generate_cache_key(analysis_record, "1.0.1") == key1
+
+    def test_version_cache_keys(self, sample_analysis_records):
+        """Test that the version strategy keys on the version string."""
+        data_manager = DataManager()
+        data_manager.config_manager.config["cache"]["key_strategy"] = "version"
+        analysis_record = sample_analysis_records[0]
+
+        key1 = data_manager.generate_cache_key(analysis_record, "1.0.0")
         key3 = data_manager.generate_cache_key(analysis_record, "1.0.1")
         assert key1 != key3
 
 
+class TestEngineFingerprints:
+    """Test source fingerprints of the analysis engines."""
+
+    @pytest.fixture
+    def package_copy(self, tmp_path):
+        """Fixture providing a copy of the pySLAMMER sources."""
+        source = Path(importlib.util.find_spec("pyslammer").origin).parent
+        return Path(shutil.copytree(source, tmp_path / "pyslammer"))
+
+    def _fingerprints(self, package_dir):
+        engine_fingerprint.cache_clear()
+        return {
+            method: engine_fingerprint(method, package_dir)
+            for method in ENGINE_MODULES
+        }
+
+    def test_dependencies_follow_imports(self):
+        """Test that engines include the modules they import."""
+        coupled = module_dependencies("coupled_analysis")
+        assert {"decoupled_analysis", "_kernels", "ground_motion"} <= set(coupled)
+        assert "coupled_analysis" not in module_dependencies("rigid_analysis")
+
+    def test_change_only_affects_dependent_methods(self, package_copy):
+        """Test that editing the coupled engine keeps other keys valid."""
+        before = self._fingerprints(package_copy)
+        with open(package_copy / "coupled_analysis.py", "a") as f:
+            f.write("\n# changed\n")
+        after = self._fingerprints(package_copy)
+
+        assert after["coupled"] != before["coupled"]
+        assert after["rigid"] == before["rigid"]
+        assert after["decoupled"] == before["decoupled"]
+
+    def test_shared_module_change_affects_all(self, package_copy):
+        """Test that editing a shared module changes every fingerprint."""
+        before = self._fingerprints(package_copy)
+        with open(package_copy / "_kernels.py", "a") as f:
+            f.write("\n# changed\n")
+        after = self._fingerprints(package_copy)
+        assert all(after[m] != before[m] for m in ENGINE_MODULES)
+
+
 class TestConfigurationManagement(TestVerificationFramework):
     """Test configuration and tolerance management."""
 
@@ -247,4 +330,358 @@ class TestStatisticalComparison(TestVerificationFramework):
 
 
 
+class TestComparisonTable(TestVerificationFramework):
+    """Test vectorized comparisons on a columnar table."""
+
+    @pytest.fixture
+    def cases(self):
+        """Fixture providing tests covering each tolerance branch."""
+        return [
+            ("a", "rigid", "normal", 10.0, 10.1),
+            ("b", "rigid", "inverse", 10.0, 12.0),
+            ("c", "decoupled", "normal", 0.1, 0.12),
+            ("d", "decoupled", "inverse", 0.0, 0.0),
+            ("e", "coupled", "normal", 0.0, 0.3),
+            ("f", "coupled", "inverse", 50.0, 50.5),
+        ]
+
+    def test_matches_individual_comparisons(self, comparison_engine, cases):
+        """Test that the table agrees with per-test comparisons."""
+        table = comparison_engine.compare_tests(*zip(*cases))
+        expected = [comparison_engine.compare_individual_test(*case) for case in cases]
+        assert list(table) == expected
+        assert table[1] == expected[1]
+
+    def test_summary_from_table(self, comparison_engine, cases):
+        """Test that summaries from a table and from a list agree."""
+        table = comparison_engine.compare_tests(*zip(*cases))
+        from_table = comparison_engine.generate_verification_summary(table)
+        from_list = comparison_engine.generate_verification_summary(list(table))
+
+        assert from_table.passing_tests == from_list.passing_tests
+        assert repr(from_table.group_results) == repr(from_list.group_results)
+        assert comparison_engine.format_comparison_report(
+            from_table
+        ) == comparison_engine.format_comparison_report(from_list)
+
+    def test_compare_records(self, comparison_engine, reference_data):
+        """Test comparing reference records against themselves."""
+        table = comparison_engine.compare_records(
+            reference_data.analyses, reference_data.analyses[:10]
+        )
+        assert len(table) == 20
+        assert table.passes_tolerance.all()
+        assert table.mask("rigid", "Normal").sum() == table.mask("rigid", "Inverse").sum()
+
+
+class TestSchemaValidation(TestVerificationFramework):
+    """Test compiled and bulk schema validation."""
+
+    @pytest.fixture
+    def validator(self):
+        """Fixture providing a fresh SchemaValidator."""
+        schemas = Path(__file__).parent / "verification_data" / "schemas"
+        return SchemaValidator(schemas / "results_schema.json")
+
+    @pytest.fixture(scope="class")
+    def raw_analyses(self):
+        """Fixture providing the raw reference analysis records."""
+        results = Path(__file__).parent / "verification_data" / "results"
+        with gzip.open(results / "slammer_results.json.gz", "rt", encoding="utf-8") as f:
+            return json.load(f)["analyses"][:50]
+
+    def test_bulk_validation_timing(self, validator, raw_analyses):
+        """Test that bulk validation records its cost."""
+        validator.validate_analysis_records(raw_analyses)
+        assert validator.validated_records == len(raw_analyses)
+        assert validator.validation_time > 0
+        assert validator.records_validator is validator.records_validator
+
+    def test_bulk_validation_reports_index(self, validator, raw_analyses):
+        """Test that errors identify the offending record."""
+        records = [dict(r) for r in raw_analyses]
+        del records[7]["results"]
+        with pytest.raises(ValidationError, match="at '7'"):
+            validator.validate_analysis_records(records)
+
+    def test_trusted_save_skips_validation(self, tmp_path):
+        """Test that trusted cache writes bypass the validator."""
+        schemas = Path(__file__).parent / "verification_data" / "schemas"
+        shutil.copytree(schemas, tmp_path / "schemas")
+        data_manager = DataManager(tmp_path)
+        data_manager.save_cached_results("key", {"analysis_id": "x"}, validate=False)
+        assert data_manager.schema_validator.validated_records == 0
+        assert data_manager.load_cached_results("key") == {"analysis_id": "x"}
+
+    def test_summary_reports_validation_time(self, comparison_engine):
+        """Test that the summary report includes validation cost."""
+        result = comparison_engine.compare_individual_test(
+            "rigid_0", "rigid", "normal", 1.0, 1.0
+        )
+        summary = comparison_engine.generate_verification_summary(
+            [result], validation_time=0.25, validated_records=10
+        )
+        report = comparison_engine.format_comparison_report(summary)
+        assert "Schema Validation: 10 records in 0.250 s" in report
+
+
+class TestResultCache(TestVerificationFramework):
+    """Test the SQLite verification result cache."""
+
+    @pytest.fixture
+    def isolated_data_manager(self, tmp_path):
+        """Fixture providing a DataManager with an empty cache."""
+        schemas = Path(__file__).parent / "verification_data" / "schemas"
+        shutil.copytree(schemas, tmp_path / "schemas")
+        return DataManager(tmp_path)
+
+    @pytest.fixture
+    def result_record(self):
+        """Fixture providing a minimal cached result."""
+        return {
+            "analysis_id": "rigid_test",
+            "ground_motion_parameters": {
+                "earthquake": "Test",
+                "record_station": "TST-000",
+                "target_pga_g": 0.3,
+                "ground_motion_file": "test.csv",
+            },
+            "analysis": {"method": "rigid"},
+            "site_parameters": {"ky_g": 0.1},
+            "results": {"normal_displacement_cm": 1.0, "inverse_displacement_cm": 2.0},
+        }
+
+    def test_bulk_round_trip(self, isolated_data_manager, result_record):
+        """Test saving and loading many results at once."""
+        results = {f"key{i}": result_record for i in range(2000)}
+        isolated_data_manager.save_cached_results_bulk(results)
+
+        loaded = isolated_data_manager.load_cached_results_bulk([*results, "missing"])
+        assert loaded == results
+        assert isolated_data_manager.load_cached_results("key7") == result_record
+        assert isolated_data_manager.load_cached_results("missing") is None
+
+    def test_invalid_result_is_not_saved(self, isolated_data_manager, result_record):
+        """Test that a bulk save with an invalid result writes nothing."""
+        with pytest.raises(ValidationError):
+            isolated_data_manager.save_cached_results_bulk(
+                {"good": result_record, "bad": {"analysis_id": "bad"}}
+            )
+        assert isolated_data_manager.load_cached_results("good") is None
+
+    def test_expired_results_are_ignored(self, isolated_data_manager, result_record):
+        """Test that results older than default_expiry_days are not returned."""
+        isolated_data_manager.save_cached_results("key", result_record)
+        expiry_days = isolated_data_manager.config_manager.config["cache"][
+            "default_expiry_days"
+        ]
+        with closing(sqlite3.connect(isolated_data_manager.cache_path)) as connection:
+            with connection:
+                connection.execute(
+                    "UPDATE results SET created = ?",
+                    [time.time() - (expiry_days + 1) * 86400],
+                )
+        assert isolated_data_manager.load_cached_results("key") is None
+
+    def test_delete(self, isolated_data_manager, result_record):
+        """Test deleting cached results."""
+        isolated_data_manager.save_cached_results_bulk(
+            {"a": result_record, "b": result_record}
+        )
+        assert isolated_data_manager.delete_cached_results(["a", "missing"]) == 1
+        assert list(isolated_data_manager.load_cached_results_bulk(["a", "b"])) == ["b"]
+
+
+class TestVerificationRunner(TestVerificationFramework):
+    """Test the parallel verification analysis runner."""
+
+    @pytest.fixture
+    def isolated_data_manager(self, tmp_path):
+        """Fixture providing a DataManager with an empty cache."""
+        schemas = Path(__file__).parent / "verification_data" / "schemas"
+        shutil.copytree(schemas, tmp_path / "schemas")
+        return DataManager(tmp_path)
+
+    def _cached_results(self, data_manager):
+        with closing(sqlite3.connect(data_manager.cache_path)) as connection:
+            keys = [row[0] for row in connection.execute("SELECT cache_key FROM results")]
+        return data_manager.load_cached_results_bulk(keys)
+
+    def test_parallel_matches_serial(self, isolated_data_manager, tmp_path):
+        """Test that a worker pool caches the same results as a serial run."""
+        kwargs = dict(max_analyses=4, methods=["rigid"], pyslammer_version="test")
+        parallel_count = run_verification_analyses(
+            data_manager=isolated_data_manager, max_workers=2, **kwargs
+        )
+        parallel = self._cached_results(isolated_data_manager)
+
+        serial_manager = DataManager(tmp_path)
+        shutil.rmtree(tmp_path / "cache")
+        serial_count = run_verification_analyses(
+            data_manager=serial_manager, max_workers=1, **kwargs
+        )
+
+        # Timings differ between runs, so only the results have to match
+        serial = self._cached_results(serial_manager)
+        assert parallel_count == serial_count == 4
+        for record in [*parallel.values(), *serial.values()]:
+            assert record.pop("performance")["wall_time_s"] >= 0
+        assert parallel == serial
+
+    def test_performance_is_recorded(self, isolated_data_manager):
+        """Test that results record timing, memory and npts."""
+        run_verification_analyses(
+            data_manager=isolated_data_manager,
+            max_analyses=2,
+            methods=["decoupled"],
+            pyslammer_version="test",
+            max_workers=1,
+            measure_memory=True,
+        )
+        records = list(self._cached_results(isolated_data_manager).values())
+        isolated_data_manager.schema_validator.validate_analysis_records(records)
+        for record in records:
+            performance = AnalysisRecord.from_dict(record).performance
+            assert performance.wall_time_s > 0
+            assert performance.cpu_time_s > 0
+            assert performance.peak_memory_bytes > 8 * performance.npts
+            assert performance.npts > 1000
+
+    def test_memory_measurement_is_opt_in(self, isolated_data_manager):
+        """Test that peak memory is omitted by default."""
+        run_verification_analyses(
+            data_manager=isolated_data_manager,
+            max_analyses=1,
+            methods=["rigid"],
+            pyslammer_version="test",
+            max_workers=1,
+        )
+        (record,) = self._cached_results(isolated_data_manager).values()
+        assert "peak_memory_bytes" not in record["performance"]
+
+    def test_cached_records_are_skipped(self, isolated_data_manager):
+        """Test that cached records do not count towards max_analyses."""
+        kwargs = dict(
+            methods=["rigid"],
+            pyslammer_version="test",
+            data_manager=isolated_data_manager,
+        )
+        assert run_verification_analyses(max_analyses=2, **kwargs) == 2
+        assert run_verification_analyses(max_analyses=2, max_workers=2, **kwargs) == 2
+        assert len(self._cached_results(isolated_data_manager)) == 4
+
+    def test_interrupted_run_keeps_completed_results(
+        self, isolated_data_manager, monkeypatch
+    ):
+        """Test that results completed before an interruption are cached."""
+        from verification import generate_pyslammer_verification_results as runner
+
+        run_analysis = runner._run_analysis_safely
+        calls = []
+
+        def interrupted(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return run_analysis(*args)
+
+        monkeypatch.setattr(runner, "_run_analysis_safely", interrupted)
+        kwargs = dict(
+            methods=["rigid"],
+            pyslammer_version="test",
+            data_manager=isolated_data_manager,
+            max_workers=1,
+        )
+        with pytest.raises(KeyboardInterrupt):
+            run_verification_analyses(max_analyses=4, save_batch_size=10, **kwargs)
+        assert len(self._cached_results(isolated_data_manager)) == 2
+
+        monkeypatch.setattr(runner, "_run_analysis_safely", run_analysis)
+        assert run_verification_analyses(max_analyses=2, **kwargs) == 2
+        assert len(self._cached_results(isolated_data_manager)) == 4
+
+    def test_timeout(self):
+        """Test that the per-analysis timeout interrupts long analyses."""
+        with pytest.raises(TimeoutError):
+            _call_with_timeout(time.sleep, 0.05, 5)
+        assert _call_with_timeout(sum, 0.05, [1, 2]) == 3
+
+
+class TestPerformanceReport:
+    """Test the performance section of the verification report."""
+
+    @staticmethod
+    def _analysis(analysis_id, method, wall_time, memory=1024):
+        return {
+            "analysis_id": analysis_id,
+            "analysis": {"method": method},
+            "performance": {
+                "wall_time_s": wall_time,
+                "cpu_time_s": wall_time,
+                "peak_memory_bytes": memory,
+                "npts": 4000,
+            },
+        }
+
+    @pytest.fixture
+    def results_dir(self, tmp_path):
+        """Fixture with results files of two versions."""
+        versions = {
+            "0.9.0": [self._analysis("a0", "rigid", 0.002)],
+            "0.10.0": [
+                self._analysis("a0", "rigid", 0.003),
+                self._analysis("a1", "coupled", 0.010, 2**21),
+            ],
+        }
+        for version, analyses in versions.items():
+            path = tmp_path / f"pyslammer_{version}_results.json.gz"
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump({"analyses": analyses}, f)
+        return tmp_path
+
+    def test_previous_version(self, results_dir):
+        """Test that versions are ordered numerically."""
+        assert find_previous_version("0.10.0", results_dir) == "0.9.0"
+        assert find_previous_version("0.9.0", results_dir) is None
+
+    def test_summary(self, results_dir):
+        """Test per-method throughput and memory."""
+        summary = summarize_performance(
+            load_result_analyses(results_dir / "pyslammer_0.10.0_results.json.gz")
+        )
+        assert list(summary) == ["COUPLED", "RIGID"]
+        assert summary["COUPLED"].throughput == pytest.approx(100)
+        assert summary["COUPLED"].max_peak_memory_bytes == 2**21
+
+    def test_section(self, results_dir):
+        """Test slowest records and the comparison with the previous version."""
+        section = load_performance_section("0.10.0", results_dir)
+        assert section.index("| a1 |") < section.index("| a0 |")
+        assert "### Comparison with v0.9.0" in section
+        assert "| RIGID | 1 | 0.002 | 0.003 | +50.0% |" in section
+        assert "2.0 MiB" in section
+
+    def test_section_omitted_without_data(self, results_dir):
+        """Test that results without performance data add no section."""
+        assert generate_performance_section([{"analysis_id": "a0"}]) is None
+        assert load_performance_section("1.0.0", results_dir) is None
+
+    def test_report_includes_schema_validation(self, results_dir, tmp_path):
+        """Test that save_report forwards the schema validation timing."""
+        method = MethodResults(1.0, 1.0, 0.0, 1.0, 1.0, 0.0, 100.0)
+        results = VerificationResults("1.0.0", "1.1", method, method, method)
+        path = save_report(
+            results,
+            tmp_path / "report.md",
+            results_dir,
+            validation_time=0.5,
+            validated_records=1000,
+        )
+        report = path.read_text()
+        assert "## Schema Validation" in report
+        assert "1000 analysis records validated in 0.500 s (2,000 records/s)" in report
+        plain = save_report(results, tmp_path / "plain.md", results_dir).read_text()
+        assert "Schema Validation" not in plain
+
+
 # End of test file
@@ -5,10 +5,10 @@ This module implements both individual test comparisons and group statistical an
 to validate pySLAMMER results against legacy SLAMMER data.
 """
 
-import math
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import toml
@@ -89,6 +89,39 @@ class ConfigManager:
 
         return ToleranceSettings(relative=relative, absolute=absolute)
 
+    def get_tolerances(
+        self, methods: np.ndarray, displacement_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized form of get_tolerance for many tests at once.
+
+        Args:
+            methods: Analysis method of each test
+            displacement_values: Expected displacement of each test
+
+        Returns:
+            Arrays of relative and absolute tolerances
+        """
+        methods = np.asarray(methods)
+        displacement_values = np.asarray(displacement_values, dtype=float)
+        relative = np.empty(len(methods))
+        absolute = np.empty(len(methods))
+        for method in np.unique(methods):
+            tolerance = self.get_tolerance(str(method))
+            in_method = methods == method
+            relative[in_method] = tolerance.relative
+            absolute[in_method] = tolerance.absolute
+
+        value_dep = self.config.get("tolerances", {}).get("value_dependent", {})
+        small = displacement_values <= value_dep.get(
+            "small_displacement_threshold", 0.5
+        )
+        small_rel = value_dep.get("small_displacement_relative")
+        if small_rel is not None:
+            relative[small] = float("inf") if small_rel == "inf" else small_rel
+        if "small_displacement_absolute" in value_dep:
+            absolute[small] = value_dep["small_displacement_absolute"]
+        return relative, absolute
+
     def get_additional_output_tolerance(self, output_type: str) -> float:
         """Get tolerance for additional outputs (kmax, vs, damping).
 
@@ -127,6 +160,121 @@ class IndividualComparisonResult:
     units: str = "cm"
 
 
+@dataclass
+class ComparisonTable:
+    """Columnar comparison results for many tests.
+
+    Each attribute is an array with one entry per test, so tolerance checks
+    and group statistics can be computed with vectorized masks.
+    """
+
+    test_id: np.ndarray
+    method: np.ndarray
+    direction: np.ndarray
+    legacy_value: np.ndarray
+    pyslammer_value: np.ndarray
+    absolute_error: np.ndarray
+    relative_error: np.ndarray
+    percent_difference: np.ndarray
+    tolerance_relative: np.ndarray
+    tolerance_absolute: np.ndarray
+    passes_tolerance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.test_id)
+
+    def __iter__(self) -> Iterator["IndividualComparisonResult"]:
+        return iter(self.to_individual_results())
+
+    def __getitem__(self, index: int) -> "IndividualComparisonResult":
+        return self.select([index]).to_individual_results()[0]
+
+    def select(self, rows) -> "ComparisonTable":
+        """Return the rows selected by a boolean mask or index array."""
+        return ComparisonTable(
+            **{f.name: getattr(self, f.name)[rows] for f in fields(self)}
+        )
+
+    @classmethod
+    def from_individual_results(
+        cls, individual_results: List["IndividualComparisonResult"]
+    ) -> "ComparisonTable":
+        """Build a table from individual comparison results."""
+
+        def column(name: str, dtype) -> np.ndarray:
+            return np.array([getattr(r, name) for r in individual_results], dtype=dtype)
+
+        tolerances = [r.tolerance_used for r in individual_results]
+        return cls(
+            test_id=column("test_id", object),
+            method=column("method", object),
+            direction=column("direction", object),
+            legacy_value=column("legacy_value", float),
+            pyslammer_value=column("pyslammer_value", float),
+            absolute_error=column("absolute_error", float),
+            relative_error=column("relative_error", float),
+            percent_difference=column("percent_difference", float),
+            tolerance_relative=np.array([t.relative for t in tolerances], dtype=float),
+            tolerance_absolute=np.array([t.absolute for t in tolerances], dtype=float),
+            passes_tolerance=column("passes_tolerance", bool),
+        )
+
+    def to_individual_results(self) -> List["IndividualComparisonResult"]:
+        """Convert the table to individual comparison results."""
+        return [
+            IndividualComparisonResult(
+                test_id=test_id,
+                method=method,
+                direction=direction,
+                absolute_error=absolute_error,
+                relative_error=relative_error,
+                percent_difference=percent_difference,
+                passes_tolerance=passes,
+                tolerance_used=ToleranceSettings(
+                    relative=tolerance_relative, absolute=tolerance_absolute
+                ),
+                legacy_value=legacy_value,
+                pyslammer_value=pyslammer_value,
+            )
+            for (
+                test_id,
+                method,
+                direction,
+                absolute_error,
+                relative_error,
+                percent_difference,
+                passes,
+                tolerance_relative,
+                tolerance_absolute,
+                legacy_value,
+                pyslammer_value,
+            ) in zip(
+                self.test_id.tolist(),
+                self.method.tolist(),
+                self.direction.tolist(),
+                self.absolute_error.tolist(),
+                self.relative_error.tolist(),
+                self.percent_difference.tolist(),
+                self.passes_tolerance.tolist(),
+                self.tolerance_relative.tolist(),
+                self.tolerance_absolute.tolist(),
+                self.legacy_value.tolist(),
+                self.pyslammer_value.tolist(),
+            )
+        ]
+
+    @cached_property
+    def _direction_lower(self) -> np.ndarray:
+        return np.array([d.lower() for d in self.direction.tolist()], dtype=object)
+
+    def mask(self, method: str, direction: str = "All") -> np.ndarray:
+        """Boolean mask selecting a method and direction ("All" for both)."""
+        selected = self.method == method
+        if direction != "All":
+            selected &= self._direction_lower == direction.lower()
+        return selected
+
+
 @dataclass
 class GroupComparisonResult:
     """Result of comparing a group of test cases."""
@@ -159,12 +307,45 @@ class VerificationSummary:
     failing_tests: int
     overall_pass_rate: float
 
-    individual_results: List[IndividualComparisonResult]
+    # A list, or a ComparisonTable when the summary was built from one
+    individual_results: Sequence[IndividualComparisonResult]
     group_results: List[GroupComparisonResult]
 
     # Method-specific summaries
     method_summaries: Dict[str, Dict[str, Any]]
 
+    # Schema validation cost
+    validation_time: float = 0.0  # seconds
+    validated_records: int = 0
+
+
+def _linear_regression(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float]:
+    """Least-squares slope, intercept and correlation of y on x.
+
+    Uses the same formulas as scipy.stats.linregress without its per-call
+    overhead, and defers to it for degenerate inputs so errors are unchanged.
+    """
+    x_mean = x.mean()
+    y_mean = y.mean()
+    ssxm = np.mean((x - x_mean) ** 2)
+    ssym = np.mean((y - y_mean) ** 2)
+    ssxym = np.mean((x - x_mean) * (y - y_mean))
+    if len(x) < 2 or ssxm == 0 or ssym == 0:
+        result = stats.linregress(x, y)
+        return float(result.slope), float(result.intercept), float(result.rvalue)
+    r_value = float(np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0))
+    slope = float(ssxym / ssxm)
+    return slope, float(y_mean - slope * x_mean), r_value
+
+
+def _as_table(
+    individual_results: Union[List[IndividualComparisonResult], ComparisonTable],
+) -> ComparisonTable:
+    """Return individual results as a comparison table."""
+    if isinstance(individual_results, ComparisonTable):
+        return individual_results
+    return ComparisonTable.from_individual_results(individual_results)
+
 
 class ComparisonEngine:
     """Statistical comparison engine for verification framework."""
@@ -177,6 +358,70 @@ class ComparisonEngine:
         """
         self.config_manager = config_manager or ConfigManager()
 
+    def compare_tests(
+        self,
+        test_ids: Sequence[str],
+        methods: Sequence[str],
+        directions: Sequence[str],
+        legacy_values: Sequence[float],
+        pyslammer_values: Sequence[float],
+    ) -> ComparisonTable:
+        """Compare many test results at once.
+
+        Args:
+            test_ids: Unique test identifiers
+            methods: Analysis method of each test (rigid, decoupled, coupled)
+            directions: Direction of each test (normal, inverse)
+            legacy_values: Expected results from legacy SLAMMER
+            pyslammer_values: Computed results from pySLAMMER
+
+        Returns:
+            Comparison table with one row per test
+        """
+        methods = np.asarray(methods, dtype=object)
+        legacy = np.asarray(legacy_values, dtype=float)
+        pyslammer = np.asarray(pyslammer_values, dtype=float)
+
+        # Calculate error metrics; zero legacy values give inf (or 0 if exact)
+        absolute_error = np.abs(pyslammer - legacy)
+        nonzero = legacy != 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_error = np.where(
+                nonzero,
+                absolute_error / np.abs(legacy),
+                np.where(absolute_error > 0, np.inf, 0.0),
+            )
+            percent_difference = np.where(
+                nonzero,
+                (pyslammer - legacy) / legacy * 100,
+                np.where(pyslammer != 0, np.inf, 0.0),
+            )
+
+        # Check tolerances; small displacements use the absolute tolerance only
+        tolerance_relative, tolerance_absolute = self.config_manager.get_tolerances(
+            methods, legacy
+        )
+        passes_absolute = absolute_error <= tolerance_absolute
+        passes_relative = relative_error <= tolerance_relative
+        small = legacy <= self.config_manager.config.get("tolerances", {}).get(
+            "value_dependent", {}
+        ).get("small_displacement_threshold", 0.5)
+        passes_tolerance = passes_absolute & (small | passes_relative)
+
+        return ComparisonTable(
+            test_id=np.asarray(test_ids, dtype=object),
+            method=methods,
+            direction=np.asarray(directions, dtype=object),
+            legacy_value=legacy,
+            pyslammer_value=pyslammer,
+            absolute_error=absolute_error,
+            relative_error=relative_error,
+            percent_difference=percent_difference,
+            tolerance_relative=tolerance_relative,
+            tolerance_absolute=tolerance_absolute,
+            passes_tolerance=passes_tolerance,
+        )
+
     def compare_individual_test(
         self,
         test_id: str,
@@ -197,46 +442,37 @@ class ComparisonEngine:
         Returns:
             Individual comparison result
         """
-        # Calculate error metrics
-        absolute_error = abs(pyslammer_value - legacy_value)
-
-        if legacy_value != 0:
-            relative_error = absolute_error / abs(legacy_value)
-            percent_difference = ((pyslammer_value - legacy_value) / legacy_value) * 100
-        else:
-            # Handle case where legacy value is zero
-            relative_error = float("inf") if absolute_error > 0 else 0
-            percent_difference = float("inf") if pyslammer_value != 0 else 0
-
-        # Get tolerance settings
-        tolerance = self.config_manager.get_tolerance(method, legacy_value)
-
-        # Check if test passes tolerance
-        passes_absolute = absolute_error <= tolerance.absolute
-        passes_relative = relative_error <= tolerance.relative
-
-        # For very small displacements, use special handling
-        if legacy_value <= self.config_manager.config.get("tolerances", {}).get(
-            "value_dependent", {}
-        ).get("small_displacement_threshold", 0.5):
-            # For small displacements, use absolute tolerance primarily
-            passes_tolerance = passes_absolute
-        else:
-            # For normal displacements, both absolute and relative must pass
-            passes_tolerance = passes_absolute and passes_relative
-
-        return IndividualComparisonResult(
-            test_id=test_id,
-            method=method,
-            direction=direction,
-            absolute_error=absolute_error,
-            relative_error=relative_error,
-            percent_difference=percent_difference,
-            passes_tolerance=passes_tolerance,
-            tolerance_used=tolerance,
-            legacy_value=legacy_value,
-            pyslammer_value=pyslammer_value,
+        table = self.compare_tests(
+            [test_id], [method], [direction], [legacy_value], [pyslammer_value]
         )
+        return table.to_individual_results()[0]
+
+    def compare_records(
+        self,
+        reference_records: List[AnalysisRecord],
+        pyslammer_records: List[AnalysisRecord],
+    ) -> ComparisonTable:
+        """Compare both directions of all records with matching analysis IDs.
+
+        Args:
+            reference_records: Reference analysis records with expected results
+            pyslammer_records: Analysis records computed by pySLAMMER
+
+        Returns:
+            Comparison table with a normal and an inverse row per matched record
+        """
+        computed = {r.analysis_id: r.results for r in pyslammer_records}
+        matched = [r for r in reference_records if r.analysis_id in computed]
+        test_ids, methods, directions, legacy, pyslammer = [], [], [], [], []
+        for direction in ("normal", "inverse"):
+            field_name = f"{direction}_displacement_cm"
+            for record in matched:
+                test_ids.append(f"{record.analysis_id}_{direction}")
+                methods.append(record.analysis.method)
+                directions.append(direction)
+                legacy.append(getattr(record.results, field_name))
+                pyslammer.append(getattr(computed[record.analysis_id], field_name))
+        return self.compare_tests(test_ids, methods, directions, legacy, pyslammer)
 
     def compare_analysis_record(
         self, analysis_record: AnalysisRecord, pyslammer_results: Results
@@ -250,56 +486,50 @@ class ComparisonEngine:
         Returns:
             List of individual comparison results for each direction
         """
-        results = []
         method = analysis_record.analysis.method
-
-        # Compare normal direction
-        normal_result = self.compare_individual_test(
-            test_id=f"{analysis_record.analysis_id}_normal",
-            method=method,
-            direction="normal",
-            legacy_value=analysis_record.results.normal_displacement_cm,
-            pyslammer_value=pyslammer_results.normal_displacement_cm,
-        )
-        results.append(normal_result)
-
-        # Compare inverse direction
-        inverse_result = self.compare_individual_test(
-            test_id=f"{analysis_record.analysis_id}_inverse",
-            method=method,
-            direction="inverse",
-            legacy_value=analysis_record.results.inverse_displacement_cm,
-            pyslammer_value=pyslammer_results.inverse_displacement_cm,
+        table = self.compare_tests(
+            [
+                f"{analysis_record.analysis_id}_normal",
+                f"{analysis_record.analysis_id}_inverse",
+            ],
+            [method, method],
+            ["normal", "inverse"],
+            [
+                analysis_record.results.normal_displacement_cm,
+                analysis_record.results.inverse_displacement_cm,
+            ],
+            [
+                pyslammer_results.normal_displacement_cm,
+                pyslammer_results.inverse_displacement_cm,
+            ],
         )
-        results.append(inverse_result)
-
-        return results
+        return table.to_individual_results()
 
     def analyze_group(
         self,
-        individual_results: List[IndividualComparisonResult],
+        individual_results: Union[List[IndividualComparisonResult], ComparisonTable],
         method: str,
         direction: str = "All",
     ) -> GroupComparisonResult:
         """Perform group statistical analysis.
 
         Args:
-            individual_results: List of individual comparison results
+            individual_results: Individual comparison results or a comparison table
             method: Analysis method to analyze
             direction: Direction to analyze ("Normal", "Inverse", or "All")
 
         Returns:
             Group comparison result
         """
-        # Filter results by method and direction
-        filtered_results = [
-            r
-            for r in individual_results
-            if r.method == method
-            and (direction == "All" or r.direction.lower() == direction.lower())
-        ]
+        table = _as_table(individual_results)
+        return self._analyze_mask(table, table.mask(method, direction), method, direction)
 
-        if not filtered_results:
+    def _analyze_mask(
+        self, table: ComparisonTable, mask: np.ndarray, method: str, direction: str
+    ) -> GroupComparisonResult:
+        """Group statistics for the rows of table selected by mask."""
+        number_of_samples = int(np.count_nonzero(mask))
+        if number_of_samples == 0:
             return GroupComparisonResult(
                 method=method,
                 direction=direction,
@@ -315,31 +545,24 @@ class ComparisonEngine:
             )
 
         # Calculate basic statistics
-        number_of_samples = len(filtered_results)
-        passing_tests = sum(1 for r in filtered_results if r.passes_tolerance)
-        percent_passing = (passing_tests / number_of_samples) * 100
-
-        # Extract values for regression analysis
-        legacy_values = np.array([r.legacy_value for r in filtered_results])
-        pyslammer_values = np.array([r.pyslammer_value for r in filtered_results])
+        percent_passing = float(np.mean(table.passes_tolerance[mask]) * 100)
 
         # Calculate linear regression
-        regression_result = stats.linregress(legacy_values, pyslammer_values)
-        slope = float(regression_result.slope)
-        intercept = float(regression_result.intercept)
-        r_squared = float(regression_result.rvalue**2)
+        slope, intercept, r_value = _linear_regression(
+            table.legacy_value[mask], table.pyslammer_value[mask]
+        )
+        r_squared = r_value**2
 
         # Additional statistics
-        relative_errors = [
-            r.relative_error
-            for r in filtered_results
-            if not math.isinf(r.relative_error)
-        ]
+        relative_errors = table.relative_error[mask]
+        relative_errors = relative_errors[~np.isinf(relative_errors)]
         mean_relative_error = (
-            float(np.mean(relative_errors)) if relative_errors else 0.0
+            float(np.mean(relative_errors)) if relative_errors.size else 0.0
+        )
+        std_relative_error = (
+            float(np.std(relative_errors)) if relative_errors.size else 0.0
         )
-        std_relative_error = float(np.std(relative_errors)) if relative_errors else 0.0
-        max_absolute_error = max(r.absolute_error for r in filtered_results)
+        max_absolute_error = float(np.max(table.absolute_error[mask]))
 
         # Check group tolerances
         config = self.config_manager.config
@@ -381,59 +604,59 @@ class ComparisonEngine:
         )
 
     def generate_verification_summary(
-        self, individual_results: List[IndividualComparisonResult]
+        self,
+        individual_results: Union[List[IndividualComparisonResult], ComparisonTable],
+        validation_time: float = 0.0,
+        validated_records: int = 0,
     ) -> VerificationSummary:
         """Generate comprehensive verification summary.
 
         Args:
-            individual_results: All individual comparison results
+            individual_results: Individual comparison results or a comparison table
+            validation_time: Seconds spent on schema validation (e.g.
+                ``SchemaValidator.validation_time``)
+            validated_records: Number of analysis records validated
 
         Returns:
             Complete verification summary
         """
-        total_tests = len(individual_results)
-        passing_tests = sum(1 for r in individual_results if r.passes_tolerance)
+        table = _as_table(individual_results)
+
+        total_tests = len(table)
+        passing_tests = int(np.count_nonzero(table.passes_tolerance))
         failing_tests = total_tests - passing_tests
         overall_pass_rate = (
             (passing_tests / total_tests * 100) if total_tests > 0 else 0.0
         )
 
         # Generate group analyses
-        methods = list(set(r.method for r in individual_results))
+        methods = sorted(set(table.method.tolist()))
         directions = ["Normal", "Inverse", "All"]
 
         group_results = []
         for method in methods:
             for direction in directions:
-                group_result = self.analyze_group(individual_results, method, direction)
-                if group_result.number_of_samples > 0:  # Only include non-empty groups
-                    group_results.append(group_result)
+                mask = table.mask(method, direction)
+                if mask.any():  # Only include non-empty groups
+                    group_results.append(
+                        self._analyze_mask(table, mask, method, direction)
+                    )
 
         # Generate method-specific summaries
         method_summaries = {}
         for method in methods:
-            method_results = [r for r in individual_results if r.method == method]
-            method_passing = sum(1 for r in method_results if r.passes_tolerance)
+            mask = table.mask(method)
+            method_passing = int(np.count_nonzero(table.passes_tolerance[mask]))
+            relative_errors = table.relative_error[mask]
+            relative_errors = relative_errors[~np.isinf(relative_errors)]
             method_summaries[method] = {
-                "total_tests": len(method_results),
+                "total_tests": int(np.count_nonzero(mask)),
                 "passing_tests": method_passing,
-                "pass_rate": (method_passing / len(method_results) * 100)
-                if method_results
-                else 0.0,
-                "mean_absolute_error": np.mean(
-                    [r.absolute_error for r in method_results]
-                )
-                if method_results
-                else 0.0,
-                "mean_relative_error": np.mean(
-                    [
-                        r.relative_error
-                        for r in method_results
-                        if not math.isinf(r.relative_error)
-                    ]
-                )
-                if method_results
-                else 0.0,
+                "pass_rate": method_passing / np.count_nonzero(mask) * 100,
+                "mean_absolute_error": float(np.mean(table.absolute_error[mask])),
+                "mean_relative_error": float(np.mean(relative_errors))
+                if relative_errors.size
+                else float("nan"),
             }
 
         return VerificationSummary(
@@ -444,6 +667,8 @@ class ComparisonEngine:
             individual_results=individual_results,
             group_results=group_results,
             method_summaries=method_summaries,
+            validation_time=validation_time,
+            validated_records=validated_records,
         )
 
     def format_comparison_report(
@@ -475,6 +700,11 @@ class ComparisonEngine:
             f"  Passing: {summary.passing_tests} ({summary.overall_pass_rate:.1f}%)"
         )
         report.append(f"  Failing: {summary.failing_tests}")
+        if summary.validated_records:
+            report.append(
+                f"  Schema Validation: {summary.validated_records} records "
+                f"in {summary.validation_time:.3f} s"
+            )
         report.append("")
 
         # Method-specific summaries
@@ -513,7 +743,8 @@ class ComparisonEngine:
             report.append("")
 
         # Failed tests detail
-        failed_tests = [r for r in summary.individual_results if not r.passes_tolerance]
+        table = _as_table(summary.individual_results)
+        failed_tests = table.select(~table.passes_tolerance)
         if failed_tests:
             report.append(f"Failed Tests ({len(failed_tests)}):")
             for test in failed_tests:
@@ -526,7 +757,7 @@ class ComparisonEngine:
 
         # Passed tests detail (if requested)
         if include_passed:
-            passed_tests = [r for r in summary.individual_results if r.passes_tolerance]
+            passed_tests = table.select(table.passes_tolerance)
             if passed_tests:
                 report.append(f"Passed Tests ({len(passed_tests)}):")
                 for test in passed_tests:
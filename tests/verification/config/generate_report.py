@@ -9,9 +9,18 @@ try:
     import tomli
 except ImportError:
     import tomllib as tomli
+import gzip
+import json
+import re
+import statistics
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+# Directory holding the versioned results files
+RESULTS_DIR = (
+    Path(__file__).resolve().parent.parent.parent / "verification_data" / "results"
+)
 
 
 @dataclass
@@ -38,6 +47,24 @@ class VerificationResults:
     coupled: MethodResults
 
 
+@dataclass
+class MethodPerformance:
+    """Performance of a single analysis method over a results file."""
+
+    analyses: int
+    total_wall_time_s: float
+    total_cpu_time_s: float
+    median_wall_time_s: float
+    max_peak_memory_bytes: Optional[int]
+
+    @property
+    def throughput(self) -> float:
+        """Analysis records per second of wall time."""
+        if self.total_wall_time_s <= 0:
+            return float("inf")
+        return self.analyses / self.total_wall_time_s
+
+
 def load_config() -> Dict[str, Any]:
     """Load verification configuration from TOML file."""
     config_path = Path(__file__).parent / "verification_config.toml"
@@ -85,8 +112,207 @@ def format_pass_rate(rate: float, config: Dict[str, Any]) -> str:
     return f"{rate:.1f}% {'✅' if passed else '❌'}"
 
 
-def generate_report(results: VerificationResults) -> str:
-    """Generate the complete verification report markdown."""
+def _version_key(version: str) -> Tuple[int, ...]:
+    """Sort key for version strings such as "0.2.3" or "0.3.0.dev1"."""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def load_result_analyses(path: Path) -> List[Dict[str, Any]]:
+    """Load the analysis records of a results file (JSON or gzipped JSON)."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f).get("analyses", [])
+
+
+def find_results_file(
+    version: str, results_dir: Path = RESULTS_DIR
+) -> Optional[Path]:
+    """Path of the pySLAMMER results file for a version, if it exists."""
+    for suffix in (".json.gz", ".json"):
+        path = results_dir / f"pyslammer_{version}_results{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def find_previous_version(
+    version: str, results_dir: Path = RESULTS_DIR
+) -> Optional[str]:
+    """Latest version with a results file that is older than the given version."""
+    versions = {
+        match.group(1)
+        for path in results_dir.glob("pyslammer_*_results.json*")
+        if (match := re.match(r"pyslammer_(.+)_results\.json", path.name))
+    }
+    older = [v for v in versions if _version_key(v) < _version_key(version)]
+    return max(older, key=_version_key) if older else None
+
+
+def summarize_performance(
+    analyses: List[Dict[str, Any]],
+) -> Dict[str, MethodPerformance]:
+    """Summarize the performance data of analysis records by method.
+
+    Records without performance data are ignored.
+    """
+    by_method: Dict[str, List[Dict[str, Any]]] = {}
+    for analysis in analyses:
+        if "performance" in analysis:
+            method = analysis["analysis"]["method"].upper()
+            by_method.setdefault(method, []).append(analysis["performance"])
+
+    summary = {}
+    for method, records in sorted(by_method.items()):
+        wall_times = [r["wall_time_s"] for r in records]
+        memory = [r["peak_memory_bytes"] for r in records if "peak_memory_bytes" in r]
+        summary[method] = MethodPerformance(
+            analyses=len(records),
+            total_wall_time_s=sum(wall_times),
+            total_cpu_time_s=sum(r["cpu_time_s"] for r in records),
+            median_wall_time_s=statistics.median(wall_times),
+            max_peak_memory_bytes=max(memory) if memory else None,
+        )
+    return summary
+
+
+def _format_memory(value: Optional[int]) -> str:
+    """Format a byte count in MiB."""
+    return "n/a" if value is None else f"{value / 2**20:.1f} MiB"
+
+
+def generate_performance_section(
+    analyses: List[Dict[str, Any]],
+    previous_analyses: Optional[List[Dict[str, Any]]] = None,
+    previous_version: Optional[str] = None,
+    slowest: int = 5,
+) -> Optional[str]:
+    """Generate the performance section of the report.
+
+    Args:
+        analyses: Analysis records of the version being reported
+        previous_analyses: Analysis records of the previous version, if any
+        previous_version: Version string of the previous results
+        slowest: Number of slowest records to list
+
+    Returns:
+        Markdown section, or None if the records have no performance data
+    """
+    summary = summarize_performance(analyses)
+    if not summary:
+        return None
+
+    lines = [
+        "## Performance",
+        "",
+        "Times are for the normal and inverse analyses of a record together.",
+        "",
+        "| Method | Records | Throughput (records/s) | Median wall time (ms) | CPU time (s) | Peak memory |",
+        "|---|---|---|---|---|---|",
+    ]
+    for method, perf in summary.items():
+        lines.append(
+            f"| {method} | {perf.analyses} | {perf.throughput:.1f} | "
+            f"{perf.median_wall_time_s * 1000:.2f} | {perf.total_cpu_time_s:.2f} | "
+            f"{_format_memory(perf.max_peak_memory_bytes)} |"
+        )
+
+    timed = sorted(
+        (a for a in analyses if "performance" in a),
+        key=lambda a: a["performance"]["wall_time_s"],
+        reverse=True,
+    )
+    lines += [
+        "",
+        "### Slowest records",
+        "",
+        "| Analysis | Method | npts | Wall time (ms) | Peak memory |",
+        "|---|---|---|---|---|",
+    ]
+    for analysis in timed[:slowest]:
+        perf = analysis["performance"]
+        lines.append(
+            f"| {analysis['analysis_id']} | {analysis['analysis']['method'].upper()} | "
+            f"{perf['npts']} | {perf['wall_time_s'] * 1000:.2f} | "
+            f"{_format_memory(perf.get('peak_memory_bytes'))} |"
+        )
+
+    if previous_version is not None:
+        lines += ["", f"### Comparison with v{previous_version}", ""]
+        previous = {
+            a["analysis_id"]: a["performance"]
+            for a in previous_analyses or []
+            if "performance" in a
+        }
+        rows = []
+        for method in summary:
+            # Compare totals over the records timed in both versions
+            pairs = [
+                (previous[a["analysis_id"]]["wall_time_s"], a["performance"]["wall_time_s"])
+                for a in timed
+                if a["analysis"]["method"].upper() == method
+                and a["analysis_id"] in previous
+            ]
+            if not pairs:
+                continue
+            before = sum(p for p, _ in pairs)
+            after = sum(c for _, c in pairs)
+            change = (after / before - 1) * 100 if before > 0 else float("nan")
+            rows.append(
+                f"| {method} | {len(pairs)} | {before:.3f} | {after:.3f} | {change:+.1f}% |"
+            )
+        if rows:
+            lines += [
+                "| Method | Records | Previous wall time (s) | Wall time (s) | Change |",
+                "|---|---|---|---|---|",
+                *rows,
+            ]
+        else:
+            lines.append(f"v{previous_version} results have no performance data.")
+
+    return "\n".join(lines)
+
+
+def load_performance_section(
+    version: str, results_dir: Path = RESULTS_DIR
+) -> Optional[str]:
+    """Performance section for a version, compared with the previous version.
+
+    Returns None if there is no results file with performance data.
+    """
+    path = find_results_file(version, results_dir)
+    if path is None:
+        return None
+    previous_version = find_previous_version(version, results_dir)
+    previous_analyses = None
+    if previous_version is not None:
+        previous_analyses = load_result_analyses(
+            find_results_file(previous_version, results_dir)
+        )
+    return generate_performance_section(
+        load_result_analyses(path), previous_analyses, previous_version
+    )
+
+
+def generate_validation_section(validation_time: float, validated_records: int) -> str:
+    """Markdown section reporting the time spent on schema validation."""
+    rate = validated_records / validation_time if validation_time > 0 else float("inf")
+    return (
+        "## Schema Validation\n"
+        f"{validated_records} analysis records validated in {validation_time:.3f} s "
+        f"({rate:,.0f} records/s)."
+    )
+
+
+def generate_report(
+    results: VerificationResults,
+    performance_section: Optional[str] = None,
+    validation_section: Optional[str] = None,
+) -> str:
+    """Generate the complete verification report markdown.
+
+    The performance and schema validation sections, if given, follow the
+    verification results.
+    """
     config = load_config()
     tol = config["tolerances"]
 
@@ -142,7 +368,8 @@ SLAMMER version: {results.slammer_version}
 ## Verification Results
 
 {chr(10).join(method_sections)}
-
+{chr(10) + performance_section + chr(10) if performance_section else ""}\
+{chr(10) + validation_section + chr(10) if validation_section else ""}
 ## Verification Tolerances
 
 ### Linear regression tolerance
@@ -167,10 +394,30 @@ Expected values $\\le$ {small_threshold} cm:
 
 
 def save_report(
-    results: VerificationResults, output_path: Optional[Path] = None
+    results: VerificationResults,
+    output_path: Optional[Path] = None,
+    results_dir: Path = RESULTS_DIR,
+    validation_time: float = 0.0,
+    validated_records: int = 0,
 ) -> Path:
-    """Generate and save verification report."""
-    report_content = generate_report(results)
+    """Generate and save verification report.
+
+    A performance section is included when the version's results file in
+    ``results_dir`` records performance data, and a schema validation section
+    when ``validated_records`` is positive (e.g. from the
+    ``SchemaValidator.validation_time`` and ``validated_records`` of the
+    ``DataManager`` that loaded the results).
+    """
+    validation_section = (
+        generate_validation_section(validation_time, validated_records)
+        if validated_records
+        else None
+    )
+    report_content = generate_report(
+        results,
+        load_performance_section(results.pyslammer_version, results_dir),
+        validation_section,
+    )
 
     if output_path is None:
         output_path = (
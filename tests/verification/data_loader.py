@@ -5,13 +5,34 @@ Data loading and management for the verification framework.
 import gzip
 import hashlib
 import json
+import sqlite3
+import time
+import zlib
+from contextlib import closing
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from .comparisons import ConfigManager
+from .fingerprints import engine_fingerprint
 from .schemas import AnalysisRecord, SchemaValidator, VerificationData
 
+# Keys per query, below SQLite's default limit on host parameters.
+_SQLITE_BATCH_SIZE = 900
+
+
+def _encode_cache_entry(result: Dict[str, Any], compress: bool) -> bytes:
+    """Serialize a cached result, optionally zlib-compressed."""
+    data = json.dumps(result).encode("utf-8")
+    return zlib.compress(data) if compress else data
+
+
+def _decode_cache_entry(data: bytes) -> Dict[str, Any]:
+    """Deserialize a cached result written by _encode_cache_entry."""
+    if data[:1] != b"{":
+        data = zlib.decompress(data)
+    return json.loads(data.decode("utf-8"))
+
 
 class DataManager:
     """Manages loading, saving, and validation of verification data."""
@@ -85,6 +106,7 @@ class DataManager:
         filename: str = None,
         pyslammer_version: str = "unknown",
         compress: bool = True,
+        validate: bool = True,
     ) -> Path:
         """Save verification results to file with pyslammer version in filename.
 
@@ -93,12 +115,15 @@ class DataManager:
             filename: Optional custom filename, defaults to pyslammer_{version}_results.json.gz
             pyslammer_version: Version of pySLAMMER for filename generation
             compress: Whether to compress the output
+            validate: Whether to validate against schema (skip only for data
+                produced by a trusted writer)
 
         Returns:
             Path to saved file
         """
         # Validate results against schema before saving
-        self.schema_validator.validate(results)
+        if validate:
+            self.schema_validator.validate(results)
 
         if filename is None:
             # Generate filename with version (keeping periods)
@@ -121,6 +146,31 @@ class DataManager:
 
         return output_path
 
+    @property
+    def cache_path(self) -> Path:
+        """Path of the SQLite file holding cached analysis results."""
+        return self.data_path / "cache" / "results_cache.sqlite"
+
+    def _connect_cache(self) -> sqlite3.Connection:
+        """Open the cache database, creating it if needed."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.cache_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "cache_key TEXT PRIMARY KEY, created REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        return connection
+
+    def _expiry_cutoff(self) -> float:
+        """Creation time before which cached results are expired."""
+        expiry_days = self.config_manager.config.get("cache", {}).get(
+            "default_expiry_days"
+        )
+        if not expiry_days:
+            return float("-inf")
+        return time.time() - expiry_days * 86400
+
     def load_cached_results(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Load cached results if they exist.
 
@@ -130,57 +180,141 @@ class DataManager:
         Returns:
             Cached results or None if not found/expired
         """
-        cache_dir = self.data_path / "cache"
-        cache_file = cache_dir / f"{cache_key}.json.gz"
+        return self.load_cached_results_bulk([cache_key]).get(cache_key)
 
-        if not cache_file.exists():
-            return None
+    def load_cached_results_bulk(
+        self, cache_keys: Iterable[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load many cached results in one pass over the cache.
 
-        try:
-            with gzip.open(cache_file, "rt", encoding="utf-8") as f:
-                cached_data = json.load(f)
+        Results older than ``[cache] default_expiry_days`` are treated as
+        missing.
 
-            # TODO: Check cache expiry based on config settings
-            # For now, just return the data
-            return cached_data
-        except (json.JSONDecodeError, OSError):
-            # Cache file is corrupted, ignore it
-            return None
+        Args:
+            cache_keys: Unique identifiers of the cached results
 
-    def save_cached_results(self, cache_key: str, results: Dict[str, Any]) -> None:
+        Returns:
+            Mapping from cache key to cached results, for the keys that were
+            found and not expired
+        """
+        cache_keys = list(dict.fromkeys(cache_keys))
+        if not cache_keys or not self.cache_path.exists():
+            return {}
+
+        cutoff = self._expiry_cutoff()
+        found = {}
+        with closing(self._connect_cache()) as connection:
+            for start in range(0, len(cache_keys), _SQLITE_BATCH_SIZE):
+                batch = cache_keys[start : start + _SQLITE_BATCH_SIZE]
+                rows = connection.execute(
+                    "SELECT cache_key, data FROM results WHERE created >= ? "
+                    f"AND cache_key IN ({','.join('?' * len(batch))})",
+                    [cutoff, *batch],
+                )
+                for cache_key, data in rows:
+                    try:
+                        found[cache_key] = _decode_cache_entry(data)
+                    except (json.JSONDecodeError, zlib.error, UnicodeDecodeError):
+                        # Cache entry is corrupted, ignore it
+                        continue
+        return found
+
+    def save_cached_results(
+        self, cache_key: str, results: Dict[str, Any], validate: bool = True
+    ) -> None:
         """Save results to cache with schema validation.
 
         Args:
             cache_key: Unique identifier for the results
             results: Results data to cache (individual analysis result)
+            validate: Whether to validate against schema
 
         Raises:
             ValidationError: If the individual result doesn't match schema requirements
         """
-        # Validate individual cached result against schema
-        self.schema_validator.validate_analysis_record(results)
+        self.save_cached_results_bulk({cache_key: results}, validate=validate)
 
-        cache_dir = self.data_path / "cache"
-        cache_dir.mkdir(exist_ok=True)
+    def save_cached_results_bulk(
+        self, results: Dict[str, Dict[str, Any]], validate: bool = True
+    ) -> None:
+        """Save many results to the cache in a single transaction.
 
-        cache_file = cache_dir / f"{cache_key}.json.gz"
+        Either all results are written or, if any fails validation or the
+        write is interrupted, none are.
 
-        with gzip.open(cache_file, "wt", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
+        Args:
+            results: Mapping from cache key to results data
+            validate: Whether to validate against schema (skip only for
+                results produced by a trusted writer)
+
+        Raises:
+            ValidationError: If a result doesn't match schema requirements
+        """
+        if validate:
+            self.schema_validator.validate_analysis_records(list(results.values()))
+
+        compress = self.config_manager.config.get("cache", {}).get(
+            "cache_compression", True
+        )
+        now = time.time()
+        rows = [
+            (cache_key, now, _encode_cache_entry(result, compress))
+            for cache_key, result in results.items()
+        ]
+        with closing(self._connect_cache()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", rows
+            )
+
+    def delete_cached_results(self, cache_keys: Iterable[str]) -> int:
+        """Delete cached results.
+
+        Args:
+            cache_keys: Unique identifiers of the results to delete
+
+        Returns:
+            Number of results deleted
+        """
+        cache_keys = [(cache_key,) for cache_key in cache_keys]
+        if not cache_keys or not self.cache_path.exists():
+            return 0
+        with closing(self._connect_cache()) as connection, connection:
+            before = connection.total_changes
+            connection.executemany("DELETE FROM results WHERE cache_key = ?", cache_keys)
+            return connection.total_changes - before
+
+    @property
+    def cache_key_strategy(self) -> str:
+        """How cache keys identify the code under test ("code" or "version")."""
+        strategy = self.config_manager.config.get("cache", {}).get(
+            "key_strategy", "version"
+        )
+        if strategy not in ("code", "version"):
+            raise ValueError(
+                f"Unknown cache key_strategy '{strategy}'. Must be 'code' or 'version'"
+            )
+        return strategy
 
     def generate_cache_key(
         self, analysis_record: AnalysisRecord, pyslammer_version: str = "unknown"
     ) -> str:
         """Generate a unique cache key for an analysis record.
 
+        With ``[cache] key_strategy = "code"`` the key depends on the source
+        fingerprint of the record's analysis engine (see
+        ``fingerprints.engine_fingerprint``), so results stay cached until code
+        the method depends on changes. With "version" it depends on the
+        pySLAMMER version string instead.
+
         Args:
             analysis_record: Analysis record to generate key for
-            pyslammer_version: Version of pySLAMMER being tested
+            pyslammer_version: Version of pySLAMMER being tested (only used
+                with the "version" strategy)
 
         Returns:
             Unique cache key string
         """
-        # Create a deterministic hash from analysis parameters and version
+        # Create a deterministic hash from analysis parameters and code identity
         key_data = {
             "analysis_id": analysis_record.analysis_id,
             "ground_motion_parameters": asdict(
@@ -188,8 +322,13 @@ class DataManager:
             ),
             "analysis": asdict(analysis_record.analysis),
             "site_parameters": asdict(analysis_record.site_parameters),
-            "pyslammer_version": pyslammer_version,
         }
+        if self.cache_key_strategy == "code":
+            key_data["engine_fingerprint"] = engine_fingerprint(
+                analysis_record.analysis.method
+            )
+        else:
+            key_data["pyslammer_version"] = pyslammer_version
 
         key_string = json.dumps(key_data, sort_keys=True)
         return hashlib.sha256(key_string.encode()).hexdigest()[:16]
@@ -0,0 +1,100 @@
+"""
+Source fingerprints of the pySLAMMER analysis engines.
+
+Each analysis method is fingerprinted by hashing the source of its engine
+module together with every pySLAMMER module it imports, directly or
+indirectly. Cached verification results keyed on these fingerprints stay
+valid until code that the method actually depends on changes.
+"""
+
+import ast
+import hashlib
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+
+# Engine module of each analysis method
+ENGINE_MODULES = {
+    "rigid": "rigid_analysis",
+    "decoupled": "decoupled_analysis",
+    "coupled": "coupled_analysis",
+}
+
+
+def _package_dir() -> Path:
+    """Directory holding the pySLAMMER source, without importing it."""
+    spec = importlib.util.find_spec("pyslammer")
+    if spec is None or not spec.submodule_search_locations:
+        raise ImportError(
+            "pySLAMMER package not found. Install pySLAMMER to run verification."
+        )
+    return Path(next(iter(spec.submodule_search_locations)))
+
+
+def _local_imports(source: str, package_dir: Path) -> FrozenSet[str]:
+    """Names of the pySLAMMER modules imported by a module's source."""
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom):
+            if node.level == 1 and node.module:
+                names.add(node.module.split(".")[0])
+            elif node.level == 1:
+                names.update(alias.name for alias in node.names)
+            elif node.level == 0 and node.module and node.module.startswith("pyslammer."):
+                names.add(node.module.split(".")[1])
+    return frozenset(name for name in names if (package_dir / f"{name}.py").exists())
+
+
+def module_dependencies(
+    module: str, package_dir: Optional[Path] = None
+) -> Dict[str, str]:
+    """Source of a pySLAMMER module and all pySLAMMER modules it imports.
+
+    Args:
+        module: Module name within the package (e.g. "rigid_analysis")
+        package_dir: Package source directory (defaults to the installed one)
+
+    Returns:
+        Mapping from module name to source text
+    """
+    package_dir = package_dir or _package_dir()
+    sources = {}
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        if name in sources:
+            continue
+        sources[name] = (package_dir / f"{name}.py").read_text(encoding="utf-8")
+        pending.extend(_local_imports(sources[name], package_dir) - sources.keys())
+    return sources
+
+
+@lru_cache(maxsize=None)
+def engine_fingerprint(method: str, package_dir: Optional[Path] = None) -> str:
+    """Fingerprint of the source an analysis method depends on.
+
+    Fingerprints are computed once per process; call
+    ``engine_fingerprint.cache_clear()`` after editing the sources in place.
+
+    Args:
+        method: Analysis method (rigid, decoupled, coupled)
+        package_dir: Package source directory (defaults to the installed one)
+
+    Returns:
+        Hexadecimal digest of the engine's source closure
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    method = method.lower()
+    if method not in ENGINE_MODULES:
+        raise ValueError(f"Unknown analysis method: {method}")
+    sources = module_dependencies(ENGINE_MODULES[method], package_dir)
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(sources[name].encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
@@ -3,13 +3,19 @@ Generate pySLAMMER verification results by running analyses and caching results.
 
 This module contains methods to:
 1. Convert AnalysisRecord objects to pySLAMMER input parameters
-2. Run verification analyses with pySLAMMER and cache results
+2. Run verification analyses with pySLAMMER, in parallel, and cache results
+3. Record the wall time, CPU time and peak memory of each analysis
 """
 
 import gzip
 import json
+import signal
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .data_loader import DataManager
 from .schemas import AnalysisRecord
@@ -95,6 +101,168 @@ def analysis_record_to_pyslammer_inputs(record: AnalysisRecord) -> Dict[str, Any
     return {"method_class": method_class, "input_dict": input_dict}
 
 
+def _call_with_timeout(func, timeout: Optional[float], *args):
+    """Call func(*args), raising TimeoutError if it runs longer than timeout.
+
+    The timeout is enforced with SIGALRM and therefore only applies on Unix,
+    in the main thread of a process. Elsewhere func runs without a limit.
+
+    The handler runs between Python bytecodes, so the limit is best effort: it
+    cannot interrupt a call that does not return to the interpreter, such as
+    a compiled numba kernel (`pyslammer._kernels`). An analysis that hangs
+    inside a kernel is only stopped once the kernel returns, or never if it
+    does not. Kill the run externally if that happens.
+    """
+    if (
+        not timeout
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return func(*args)
+
+    def _raise_timeout(signum, frame):
+        raise TimeoutError(f"analysis exceeded {timeout} s")
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _build_result_record(
+    analysis_record: AnalysisRecord,
+    results: Dict[str, float],
+    performance: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build a result record matching the results schema."""
+    result_record = {
+        "analysis_id": analysis_record.analysis_id,
+        "ground_motion_parameters": {
+            "earthquake": analysis_record.ground_motion_parameters.earthquake,
+            "record_station": analysis_record.ground_motion_parameters.record_station,
+            "target_pga_g": analysis_record.ground_motion_parameters.target_pga_g,
+            "ground_motion_file": analysis_record.ground_motion_parameters.ground_motion_file,
+        },
+        "analysis": {
+            "method": analysis_record.analysis.method,
+        },
+        "site_parameters": {
+            "ky_g": analysis_record.site_parameters.ky_g,
+        },
+        "results": {
+            "normal_displacement_cm": results.get("normal_displacement_cm", 0.0),
+            "inverse_displacement_cm": results.get("inverse_displacement_cm", 0.0),
+        },
+    }
+
+    # Add optional fields if present
+    if analysis_record.analysis.mode:
+        result_record["analysis"]["mode"] = analysis_record.analysis.mode
+
+    for param in [
+        "height_m",
+        "vs_slope_mps",
+        "vs_base_mps",
+        "damping_ratio",
+        "reference_strain",
+    ]:
+        value = getattr(analysis_record.site_parameters, param)
+        if value is not None:
+            result_record["site_parameters"][param] = value
+
+    for result_field in ["kmax", "vs_final_mps", "damping_final"]:
+        if result_field in results:
+            result_record["results"][result_field] = results[result_field]
+
+    if performance is not None:
+        result_record["performance"] = performance
+
+    return result_record
+
+
+# Analysis classes already run once in this process (see _run_analysis)
+_WARM_METHODS = set()
+
+
+def _peak_memory(method_class, input_dict: Dict[str, Any]) -> int:
+    """Peak memory in bytes allocated by the normal and inverse analyses."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        method_class(**input_dict)
+        method_class(**input_dict, inverse=True)
+        return max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def _run_analysis(
+    analysis_record: AnalysisRecord, measure_memory: bool = False
+) -> Dict[str, Any]:
+    """Run the normal and inverse pySLAMMER analyses for one record.
+
+    The first analysis of each method in a process is run once untimed, so
+    that import and JIT compilation costs are not attributed to one record.
+    Peak memory is opt-in and measured in a separate run, because tracing
+    allocations slows the analyses down several times.
+    """
+    pyslammer_inputs = analysis_record_to_pyslammer_inputs(analysis_record)
+    method_class = pyslammer_inputs["method_class"]
+    input_dict = pyslammer_inputs["input_dict"]
+
+    if method_class not in _WARM_METHODS:
+        method_class(**input_dict)
+        _WARM_METHODS.add(method_class)
+
+    # Create and run the analysis (normal and inverse)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    normal_analysis = method_class(**input_dict)
+    inverse_analysis = method_class(**input_dict, inverse=True)
+    performance = {
+        "wall_time_s": time.perf_counter() - wall_start,
+        "cpu_time_s": time.process_time() - cpu_start,
+        "npts": len(normal_analysis.a_in),
+    }
+    if measure_memory:
+        performance["peak_memory_bytes"] = _peak_memory(method_class, input_dict)
+
+    # Extract results from instance attributes
+    results = {
+        "normal_displacement_cm": getattr(normal_analysis, "max_sliding_disp", 0.0)
+        * 100,  # Convert m to cm
+        "inverse_displacement_cm": getattr(inverse_analysis, "max_sliding_disp", 0.0)
+        * 100,  # Convert m to cm
+    }
+    return _build_result_record(analysis_record, results, performance)
+
+
+def _run_analysis_safely(
+    analysis_record: AnalysisRecord,
+    timeout: Optional[float],
+    measure_memory: bool = False,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Run one record, returning (result_record, None) or (None, error message).
+
+    Errors are returned rather than raised so that one failing record does not
+    abort a pool of workers.
+    """
+    try:
+        return (
+            _call_with_timeout(_run_analysis, timeout, analysis_record, measure_memory),
+            None,
+        )
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
 def run_verification_analyses(
     source_file: Optional[Union[str, Path]] = DEFAULT_RESULTS_FILE,
     max_analyses: Union[int, str] = "all",
@@ -102,9 +270,25 @@ def run_verification_analyses(
     data_manager: Optional[DataManager] = None,
     pyslammer_version: str = "unknown",
     force_recompute: bool = False,
+    max_workers: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    measure_memory: Optional[bool] = None,
+    save_batch_size: Optional[int] = None,
 ) -> int:
     """Run pySLAMMER analyses from completed suite and cache results.
 
+    Records that are not cached are run in a process pool when
+    ``[execution] parallel_tests`` is enabled in the verification config, with
+    ``max_workers`` processes and a per-analysis limit of ``timeout_seconds``
+    (best effort; see `_call_with_timeout`).
+    Results are cached by the calling process as they complete, in bulk
+    batches of ``save_batch_size`` records (``[execution] cache_batch_size``),
+    and whatever has completed is saved if the run is interrupted, so a rerun
+    only runs the remaining records. Each result records the wall
+    time, CPU time, ground motion length and, when ``[execution]
+    measure_memory`` is enabled, the peak allocated memory of its analyses
+    (from an extra traced run of the record, so it is off by default).
+
     Args:
         source_file: Path to results file (defaults to slammer_results.json.gz)
         max_analyses: Number of analyses to run, or "all" for all
@@ -112,6 +296,13 @@ def run_verification_analyses(
         data_manager: DataManager instance (creates new if None)
         pyslammer_version: Version of pySLAMMER for caching
         force_recompute: If True, recompute even if cached results exist
+        max_workers: Number of worker processes (overrides the config; 1 runs
+            serially in this process)
+        timeout_seconds: Time limit per analysis record (overrides the config).
+            It cannot interrupt compiled analysis kernels.
+        measure_memory: Whether to record peak memory (overrides the config)
+        save_batch_size: Number of results per cache write (overrides the
+            config)
 
     Returns:
         Number of analyses actually run (excluding cached/skipped)
@@ -124,6 +315,20 @@ def run_verification_analyses(
     if data_manager is None:
         data_manager = DataManager()
 
+    execution = data_manager.config_manager.config.get("execution", {})
+    if max_workers is None:
+        max_workers = (
+            execution.get("max_workers", 1) if execution.get("parallel_tests") else 1
+        )
+    if timeout_seconds is None:
+        timeout_seconds = execution.get("timeout_seconds")
+    if measure_memory is None:
+        measure_memory = execution.get("measure_memory", False)
+    if save_batch_size is None:
+        save_batch_size = execution.get("cache_batch_size", 50)
+    if save_batch_size < 1:
+        raise ValueError("save_batch_size must be a positive integer")
+
     # Load source file (JSON or gzipped JSON)
     source_path = Path(source_file)
     if not source_path.exists():
@@ -170,101 +375,75 @@ def run_verification_analyses(
     else:
         max_analyses = len(analyses)
 
-    # Process each analysis
-    run_count = 0
+    # Look up all records in the cache at once
+    cache_keys = [
+        data_manager.generate_cache_key(analysis_record, pyslammer_version)
+        for analysis_record in analyses
+    ]
+    cached = {} if force_recompute else data_manager.load_cached_results_bulk(cache_keys)
 
-    for analysis_record in analyses:
-        if run_count >= max_analyses:
+    # Collect records that still need to run
+    pending = []
+    for cache_key, analysis_record in zip(cache_keys, analyses):
+        if len(pending) >= max_analyses:
             break
-        # Generate cache key
-        cache_key = data_manager.generate_cache_key(analysis_record, pyslammer_version)
-
-        # Check if result already cached
-        if not force_recompute:
-            cached_result = data_manager.load_cached_results(cache_key)
-            if cached_result is not None:
-                print(f"  Skipping (cached): {analysis_record.analysis_id}")
-                continue
-
-        # Convert to pySLAMMER inputs
-        try:
-            pyslammer_inputs = analysis_record_to_pyslammer_inputs(analysis_record)
-        except Exception as e:
-            print(f"  Error converting inputs for {analysis_record.analysis_id}: {e}")
+        if cache_key in cached:
+            print(f"  Skipping (cached): {analysis_record.analysis_id}")
             continue
+        pending.append((cache_key, analysis_record))
 
-        # Run pySLAMMER analysis
-        try:
-            method_class = pyslammer_inputs["method_class"]
-            input_dict = pyslammer_inputs["input_dict"]
+    # Results are saved in bulk batches as they complete, and on the way out
+    # if the run is interrupted, so completed analyses are never lost.
+    new_results: Dict[str, Dict[str, Any]] = {}
+    run_count = 0
 
-            # Create and run the analysis (normal and inverse)
-            normal_analysis = method_class(**input_dict)
-            inverse_analysis = method_class(**input_dict, inverse=True)
+    def flush():
+        nonlocal run_count
+        if new_results:
+            # Records come from _build_result_record, so schema validation is
+            # left to collect_and_save_pyslammer_results, which checks the
+            # whole file at once.
+            data_manager.save_cached_results_bulk(new_results, validate=False)
+            run_count += len(new_results)
+            new_results.clear()
+
+    def collect(cache_key, analysis_record, outcome):
+        result_record, error = outcome
+        if error is not None:
+            print(f"  Error running analysis for {analysis_record.analysis_id}: {error}")
+            return
+        new_results[cache_key] = result_record
+        if len(new_results) >= save_batch_size:
+            flush()
 
-            # Extract results from instance attributes
-            results = {
-                "normal_displacement_cm": getattr(
-                    normal_analysis, "max_sliding_disp", 0.0
-                )
-                * 100,  # Convert m to cm
-                "inverse_displacement_cm": getattr(
-                    inverse_analysis, "max_sliding_disp", 0.0
+    try:
+        if max_workers > 1 and len(pending) > 1:
+            print(f"Running {len(pending)} analyses with {max_workers} workers")
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(
+                        _run_analysis_safely,
+                        analysis_record,
+                        timeout_seconds,
+                        measure_memory,
+                    ): (cache_key, analysis_record)
+                    for cache_key, analysis_record in pending
+                }
+                try:
+                    for future in as_completed(futures):
+                        collect(*futures[future], future.result())
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            for cache_key, analysis_record in pending:
+                outcome = _run_analysis_safely(
+                    analysis_record, timeout_seconds, measure_memory
                 )
-                * 100,  # Convert m to cm
-            }
-
-            # Create result record matching schema structure
-            result_record = {
-                "analysis_id": analysis_record.analysis_id,
-                "ground_motion_parameters": {
-                    "earthquake": analysis_record.ground_motion_parameters.earthquake,
-                    "record_station": analysis_record.ground_motion_parameters.record_station,
-                    "target_pga_g": analysis_record.ground_motion_parameters.target_pga_g,
-                    "ground_motion_file": analysis_record.ground_motion_parameters.ground_motion_file,
-                },
-                "analysis": {
-                    "method": analysis_record.analysis.method,
-                },
-                "site_parameters": {
-                    "ky_g": analysis_record.site_parameters.ky_g,
-                },
-                "results": {
-                    "normal_displacement_cm": results.get(
-                        "normal_displacement_cm", 0.0
-                    ),
-                    "inverse_displacement_cm": results.get(
-                        "inverse_displacement_cm", 0.0
-                    ),
-                },
-            }
-
-            # Add optional fields if present
-            if analysis_record.analysis.mode:
-                result_record["analysis"]["mode"] = analysis_record.analysis.mode
-
-            for param in [
-                "height_m",
-                "vs_slope_mps",
-                "vs_base_mps",
-                "damping_ratio",
-                "reference_strain",
-            ]:
-                value = getattr(analysis_record.site_parameters, param)
-                if value is not None:
-                    result_record["site_parameters"][param] = value
-
-            for result_field in ["kmax", "vs_final_mps", "damping_final"]:
-                if result_field in results:
-                    result_record["results"][result_field] = results[result_field]
-
-            # Cache the result
-            data_manager.save_cached_results(cache_key, result_record)
-            run_count += 1
-
-        except Exception as e:
-            print(f"  Error running analysis for {analysis_record.analysis_id}: {e}")
-            continue
+                collect(cache_key, analysis_record, outcome)
+    finally:
+        flush()
 
     print(f"Successfully ran {run_count} new analyses")
     return run_count
@@ -304,16 +483,12 @@ def collect_and_save_pyslammer_results(
         ]
 
     # Collect cached results
-    cached_analyses = []
-    cache_keys_to_delete = []
-
-    for analysis_record in all_analyses:
-        cache_key = data_manager.generate_cache_key(analysis_record, pyslammer_version)
-        cached_result = data_manager.load_cached_results(cache_key)
-
-        if cached_result is not None:
-            cached_analyses.append(cached_result)
-            cache_keys_to_delete.append(cache_key)
+    cache_keys = [
+        data_manager.generate_cache_key(analysis_record, pyslammer_version)
+        for analysis_record in all_analyses
+    ]
+    cached = data_manager.load_cached_results_bulk(cache_keys)
+    cached_analyses = [cached[key] for key in cache_keys if key in cached]
 
     if not cached_analyses:
         raise ValueError("No cached pySLAMMER results found")
@@ -340,18 +515,9 @@ def collect_and_save_pyslammer_results(
 
     print(f"Saved {len(cached_analyses)} pySLAMMER results to {output_path}")
 
-    # Delete cached individual results now that they're collected in the final file
-    cache_dir = data_manager.data_path / "cache"
-    deleted_count = 0
-
-    for cache_key in cache_keys_to_delete:
-        cache_file = cache_dir / f"{cache_key}.json.gz"
-        try:
-            if cache_file.exists():
-                cache_file.unlink()
-                deleted_count += 1
-        except OSError as e:
-            print(f"Warning: Failed to delete cache file {cache_file}: {e}")
-
-    print(f"Cleaned up {deleted_count} cached result files")
+    # Delete cached individual results now that they're collected in the final
+    # file. Code-keyed results are kept so later versions can reuse them.
+    if data_manager.cache_key_strategy == "version":
+        deleted_count = data_manager.delete_cached_results(cached)
+        print(f"Cleaned up {deleted_count} cached results")
     return output_path
@@ -3,9 +3,10 @@ Schema validation and data models for the verification framework.
 """
 
 import json
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import jsonschema
 
@@ -71,6 +72,16 @@ class Results:
         )
 
 
+@dataclass
+class Performance:
+    """Cost of computing a result (pySLAMMER results only)."""
+
+    wall_time_s: float
+    cpu_time_s: float
+    npts: int
+    peak_memory_bytes: Optional[int] = None
+
+
 @dataclass
 class AnalysisRecord:
     """Complete test record."""
@@ -80,6 +91,7 @@ class AnalysisRecord:
     analysis: Analysis
     site_parameters: SiteParameters
     results: Results
+    performance: Optional[Performance] = None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AnalysisRecord":
@@ -92,6 +104,9 @@ class AnalysisRecord:
             analysis=Analysis(**data["analysis"]),
             site_parameters=SiteParameters(**data["site_parameters"]),
             results=Results(**data["results"]),
+            performance=(
+                Performance(**data["performance"]) if "performance" in data else None
+            ),
         )
 
 
@@ -114,12 +129,21 @@ class VerificationData:
 
 
 class SchemaValidator:
-    """Handles JSON schema validation for verification data."""
+    """Handles JSON schema validation for verification data.
+
+    Validators are compiled once per schema and reused. The time spent
+    validating is accumulated in ``validation_time`` (seconds) and the number
+    of analysis records checked in ``validated_records``.
+    """
 
     def __init__(self, schema_path: Path):
         """Initialize with schema file path."""
         self.schema_path = schema_path
         self._schema = None
+        self._validator = None
+        self._records_validator = None
+        self.validation_time = 0.0
+        self.validated_records = 0
 
     @property
     def schema(self) -> Dict[str, Any]:
@@ -129,6 +153,45 @@ class SchemaValidator:
                 self._schema = json.load(f)
         return self._schema
 
+    def _compile(self, schema: Dict[str, Any]) -> jsonschema.protocols.Validator:
+        """Check a schema and build a reusable validator for it."""
+        validator_class = jsonschema.validators.validator_for(self.schema)
+        try:
+            validator_class.check_schema(schema)
+        except jsonschema.SchemaError as e:
+            raise ValidationError(f"Invalid schema: {e.message}") from e
+        return validator_class(schema)
+
+    @property
+    def validator(self) -> jsonschema.protocols.Validator:
+        """Compiled validator for complete results documents."""
+        if self._validator is None:
+            self._validator = self._compile(self.schema)
+        return self._validator
+
+    @property
+    def records_validator(self) -> jsonschema.protocols.Validator:
+        """Compiled validator for arrays of analysis records."""
+        if self._records_validator is None:
+            records_schema = dict(self.schema["properties"]["analyses"])
+            if "$schema" in self.schema:
+                records_schema["$schema"] = self.schema["$schema"]
+            self._records_validator = self._compile(records_schema)
+        return self._records_validator
+
+    def _run(self, validator, data, n_records: int) -> None:
+        """Validate data, recording timing and raising ValidationError."""
+        start = time.perf_counter()
+        try:
+            error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+        finally:
+            self.validation_time += time.perf_counter() - start
+        if error is not None:
+            location = "/".join(str(part) for part in error.absolute_path)
+            where = f" at '{location}'" if location else ""
+            raise ValidationError(f"Schema validation failed{where}: {error.message}")
+        self.validated_records += n_records
+
     def validate(self, data: Dict[str, Any]) -> None:
         """Validate data against the schema.
 
@@ -138,12 +201,8 @@ class SchemaValidator:
         Raises:
             ValidationError: If validation fails
         """
-        try:
-            jsonschema.validate(data, self.schema)
-        except jsonschema.ValidationError as e:
-            raise ValidationError(f"Schema validation failed: {e.message}") from e
-        except jsonschema.SchemaError as e:
-            raise ValidationError(f"Invalid schema: {e.message}") from e
+        n_records = len(data.get("analyses", [])) if isinstance(data, dict) else 0
+        self._run(self.validator, data, n_records)
 
     def validate_analysis_record(self, analysis_data: Dict[str, Any]) -> None:
         """Validate a single analysis record.
@@ -154,10 +213,18 @@ class SchemaValidator:
         Raises:
             ValidationError: If validation fails
         """
-        # Create a minimal document with just the analysis record for validation
-        analysis_document = {
-            "schema_version": "1.0",
-            "metadata": {"source_program": "test", "date_extracted": "2024-01-01"},
-            "analyses": [analysis_data],
-        }
-        self.validate(analysis_document)
+        self.validate_analysis_records([analysis_data])
+
+    def validate_analysis_records(
+        self, analyses: Sequence[Dict[str, Any]]
+    ) -> None:
+        """Validate many analysis records in one call.
+
+        Args:
+            analyses: Analysis record data to validate
+
+        Raises:
+            ValidationError: If any record fails validation; the message gives
+                the index of the offending record
+        """
+        self._run(self.records_validator, list(analyses), len(analyses))